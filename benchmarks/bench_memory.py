@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# file: bench_memory.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Memory used per model object, slotted versus dict-backed.
+#
+# Plays a short simulated game, then copies real objects of each model class
+# many times, once as the slotted class and once into a plain dict-backed
+# object holding the same attribute values.  The values themselves are shared,
+# so the difference is the per-object overhead of the instance __dict__.
+#
+# Run from the top-level directory with:
+#
+#     python -m benchmarks.bench_memory [--count N] [--days N]
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import asyncio
+import tracemalloc
+
+from singularity.code import g, data, event, sim, logmessage
+from singularity.code.dirs import create_directories
+
+
+class _DictBacked(object):
+    pass
+
+
+def slot_names(cls):
+    names = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get("__slots__", ()):
+            names.append(name)
+    return names
+
+
+def copy_slotted(obj, names):
+    cls = type(obj)
+    copied = cls.__new__(cls)
+    for name in names:
+        if hasattr(obj, name):
+            setattr(copied, name, getattr(obj, name))
+    return copied
+
+
+def copy_dict_backed(obj, names):
+    copied = _DictBacked()
+    for name in names:
+        if hasattr(obj, name):
+            setattr(copied, name, getattr(obj, name))
+    return copied
+
+
+def bytes_per_object(copy_func, obj, count):
+    names = slot_names(type(obj))
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        copies = [copy_func(obj, names) for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del copies
+    return (after - before) / count
+
+
+def sample_objects(days, seed):
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+    simulation = sim.Simulation(difficulty_id="normal", seed=seed)
+    pl = simulation.new_game()
+    pl.set_allocated_cpu_for("jobs", 1)
+    asyncio.run(simulation.advance(days))
+
+    bases = list(g.all_bases())
+    samples = {
+        "Base": bases[0],
+        "Item": next(i for b in bases for i in b.all_items()),
+        "Tech": next(iter(pl.techs.values())),
+        "Location": next(iter(pl.locations.values())),
+        "Group": next(iter(pl.groups.values())),
+        "Event": event.Event(next(iter(g.events.values()))),
+    }
+    for log in pl.log:
+        samples.setdefault(type(log).__name__, log)
+    if not any(isinstance(s, logmessage.AbstractLogMessage) for s in samples.values()):
+        samples["LogEmittedEvent"] = logmessage.LogEmittedEvent(pl.raw_sec, "story_1")
+    return samples
+
+
+def run(count=20000, days=10, seed=1):
+    """Returns {class name: (slotted bytes, dict-backed bytes)} per object."""
+    results = {}
+    for name, obj in sample_objects(days, seed).items():
+        results[name] = (
+            bytes_per_object(copy_slotted, obj, count),
+            bytes_per_object(copy_dict_backed, obj, count),
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Memory used per model object, slotted versus dict-backed."
+    )
+    parser.add_argument("--count", type=int, default=20000,
+                        help="copies per object class (default %(default)s)")
+    parser.add_argument("--days", type=int, default=10,
+                        help="days to simulate before sampling (default %(default)s)")
+    parser.add_argument("--seed", type=int, default=1)
+    options = parser.parse_args(argv)
+
+    results = run(options.count, options.days, options.seed)
+    print("%-30s %10s %10s %8s" % ("class", "slotted", "dict", "saved"))
+    for name, (slotted, dict_backed) in sorted(results.items()):
+        print(
+            "%-30s %9.0fB %9.0fB %7.0f%%"
+            % (name, slotted, dict_backed, 100 * (1 - slotted / dict_backed))
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# file: bench_savegame.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Time and peak memory of saving and loading big games.
+#
+# Starts a game with N complete bases, writes it with write_game_to_fd (as
+# create_savegame does) and loads it again with load_savegame_by_json, all
+# in memory so the disk speed does not matter.  The same is measured for the
+# columnar format (savegame.columnar[N bases]).
+#
+# Run from the top-level directory with:
+#
+#     python -m benchmarks.bench_savegame [--bases N ...]
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import io
+
+from singularity.code import savegame
+from benchmarks import harness
+
+BASE_COUNTS = (100, 1000, 10000)
+QUICK_BASE_COUNTS = (100,)
+
+
+def save(columnar_format=False):
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd, gzipped=True, columnar_format=columnar_format)
+    return fd.getvalue()
+
+
+def load(saved, columnar_format=False):
+    fd = io.BufferedReader(io.BytesIO(saved))
+    if columnar_format:
+        savegame.load_savegame_fd(savegame.load_savegame_by_columnar, fd)
+    else:
+        savegame.load_savegame_fd(savegame.load_savegame_by_json, fd)
+
+
+def measure(bases, repeat=3, seed=1, columnar_format=False):
+    harness.new_simulation(bases, seed)
+
+    def save_game():
+        return save(columnar_format)
+
+    saved = save_game()
+
+    def load_game():
+        load(saved, columnar_format)
+
+    return {
+        "save_seconds": harness.best_time(save_game, repeat),
+        "save_peak_bytes": harness.peak_memory(save_game),
+        "load_seconds": harness.best_time(load_game, repeat),
+        "load_peak_bytes": harness.peak_memory(load_game),
+        "file_bytes": len(saved),
+    }
+
+
+def run(quick=False, base_counts=None):
+    if base_counts is None:
+        base_counts = QUICK_BASE_COUNTS if quick else BASE_COUNTS
+    repeat = 1 if quick else 3
+    results = {}
+    for bases in base_counts:
+        results["savegame[%d bases]" % bases] = measure(bases, repeat)
+        results["savegame.columnar[%d bases]" % bases] = measure(
+            bases, repeat, columnar_format=True
+        )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time and peak memory of saving and loading big games."
+    )
+    parser.add_argument("--bases", type=int, nargs="+", default=BASE_COUNTS,
+                        help="numbers of bases (default %(default)s)")
+    options = parser.parse_args(argv)
+
+    results = run(base_counts=options.bases)
+    print("%-30s %10s %10s %10s %10s %10s"
+          % ("", "save", "save peak", "load", "load peak", "size"))
+    for name, m in results.items():
+        print(
+            "%-30s %8.0fms %8.1fMB %8.0fms %8.1fMB %8.0fkB"
+            % (
+                name,
+                1000 * m["save_seconds"],
+                m["save_peak_bytes"] / 2.0**20,
+                1000 * m["load_seconds"],
+                m["load_peak_bytes"] / 2.0**20,
+                m["file_bytes"] / 1024.0,
+            )
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# file: bench_sim.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Throughput of Player.give_time with many bases.
+#
+# Starts a game with N complete bases and gives it time an hour at a time,
+# reporting the wall time per tick.  The bases may still be discovered and
+# lost on the way, as in a real game.
+#
+# Run from the top-level directory with:
+#
+#     python -m benchmarks.bench_sim [--bases N ...] [--ticks N] [--repeat N]
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import asyncio
+import time
+
+from singularity.code import g
+from benchmarks import harness
+
+BASE_COUNTS = (1, 100, 1000, 10000)
+QUICK_BASE_COUNTS = (1, 100)
+
+
+async def _give_time(pl, ticks):
+    for _ in range(ticks):
+        await pl.give_time(g.seconds_per_hour)
+
+
+def seconds_per_tick(bases, ticks=24, repeat=3, seed=1):
+    """The best wall time per tick of repeat runs, each in a new game."""
+    best = None
+    for _ in range(repeat):
+        harness.new_simulation(bases, seed)
+        start = time.perf_counter()
+        asyncio.run(_give_time(g.pl, ticks))
+        elapsed = (time.perf_counter() - start) / ticks
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def run(quick=False, base_counts=None, ticks=None, repeat=None):
+    if base_counts is None:
+        base_counts = QUICK_BASE_COUNTS if quick else BASE_COUNTS
+    if ticks is None:
+        ticks = 6 if quick else 24
+    if repeat is None:
+        repeat = 1 if quick else 3
+    return {
+        "give_time[%d bases]" % bases: {
+            "seconds_per_tick": seconds_per_tick(bases, ticks, repeat)
+        }
+        for bases in base_counts
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Throughput of give_time with many bases."
+    )
+    parser.add_argument("--bases", type=int, nargs="+", default=BASE_COUNTS,
+                        help="numbers of bases (default %(default)s)")
+    parser.add_argument("--ticks", type=int, default=24,
+                        help="hours of game time to give (default %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="take the best of N games (default %(default)s)")
+    options = parser.parse_args(argv)
+
+    results = run(base_counts=options.bases, ticks=options.ticks,
+                  repeat=options.repeat)
+    for name, metrics in results.items():
+        print("%-25s %10.3fms/tick" % (name, 1000 * metrics["seconds_per_tick"]))
+    return results
+
+
+if __name__ == "__main__":
+    main()
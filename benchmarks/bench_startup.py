@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# file: bench_startup.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Time taken by data.reload_all, i.e. loading all the game data at startup.
+#
+# Run from the top-level directory with:
+#
+#     python -m benchmarks.bench_startup [--repeat N]
+
+from __future__ import absolute_import, print_function
+
+import argparse
+
+from singularity.code import data
+from benchmarks import harness
+
+
+def run(quick=False, repeat=None):
+    if repeat is None:
+        repeat = 1 if quick else 5
+    # The first load also pays for the imports and the file system cache.
+    harness.init_game_data()
+    return {
+        "data.reload_all": {"seconds": harness.best_time(data.reload_all, repeat)}
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Time taken by loading the game data."
+    )
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="take the best of N loads (default %(default)s)")
+    options = parser.parse_args(argv)
+
+    results = run(repeat=options.repeat)
+    print("data.reload_all: %.1fms" % (1000 * results["data.reload_all"]["seconds"]))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# file: bench_text.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Cost of laying out long texts: text.split_wrap and Text.pick_font.
+#
+# Uses the SDL dummy video driver (unless another one is set), so no window
+# is opened.
+#
+# Run from the top-level directory with:
+#
+#     python -m benchmarks.bench_text [--repeat N]
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import os
+
+from benchmarks import harness
+
+# A long text as found in the knowledge screen and the story, with some
+# paragraphs and a word too long for a line.
+LONG_TEXT = "\n\n".join(
+    ["The quick brown fox jumps over the lazy dog. " * 20] * 5
+    + ["Supercalifragilisticexpialidocious" * 8]
+)
+WRAP_WIDTH = 400
+FONT_SIZE = 20
+TEXT_DIMENSIONS = (400, 600)
+
+_graphics_ready = False
+
+
+def init_graphics():
+    global _graphics_ready
+    if _graphics_ready:
+        return
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+    import pygame
+    from singularity.code import data
+    from singularity.code.graphics import g as gg, font, theme
+
+    harness.init_game_data()
+    pygame.init()
+    font.init()
+    data.load_themes()
+    theme.set_theme("default")
+    gg.init_graphics_system()
+    _graphics_ready = True
+
+
+def run(quick=False, repeat=None):
+    if repeat is None:
+        repeat = 1 if quick else 5
+    init_graphics()
+
+    from singularity.code.graphics import text
+
+    widget = text.Text(None, (0, 0), (0.5, 0.5), text=LONG_TEXT)
+    wrap_font = widget.resolved_base_font[FONT_SIZE]
+    return {
+        "text.split_wrap": {
+            "seconds": harness.best_time(
+                lambda: text.split_wrap(LONG_TEXT, wrap_font, WRAP_WIDTH), repeat
+            )
+        },
+        "Text.pick_font": {
+            "seconds": harness.best_time(
+                lambda: widget.pick_font(TEXT_DIMENSIONS), repeat
+            )
+        },
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cost of laying out long texts.")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="take the best of N runs (default %(default)s)")
+    options = parser.parse_args(argv)
+
+    results = run(repeat=options.repeat)
+    for name, metrics in results.items():
+        print("%-20s %8.2fms" % (name, 1000 * metrics["seconds"]))
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+# The benchmarks are slow, so the tests marked "benchmark" only run when
+# selected with "-m benchmark".
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "benchmark: runs the benchmarks (only with -m benchmark)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if "benchmark" in (config.getoption("markexpr") or ""):
+        return
+    skip = pytest.mark.skip(reason="benchmark (run with -m benchmark)")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
@@ -0,0 +1,115 @@
+# file: harness.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Shared helpers of the benchmarks: setting up a game, timing, and storing
+# and comparing results.
+#
+# Results are {benchmark name: {metric: value}}.  All metrics are "lower is
+# better" (seconds, bytes), which keeps the comparison against the baseline
+# simple.
+
+from __future__ import absolute_import
+
+import gc
+import json
+import time
+import tracemalloc
+
+from singularity.code import g, data, sim, synthetic
+from singularity.code.dirs import create_directories
+
+_data_loaded = False
+
+
+def init_game_data():
+    """Load the game data once per process (as the tests do)."""
+    global _data_loaded
+    if not _data_loaded:
+        g.no_gui()
+        create_directories(True)
+        data.reload_all()
+        _data_loaded = True
+
+
+def new_simulation(bases=1, seed=1, difficulty_id="normal"):
+    """Start a new headless game with the given number of bases.
+
+    The game is made up by synthetic.generate.  Cash is plentiful, so the
+    bases are not lost to unpaid maintenance while benchmarking.  Returns the
+    sim.Simulation driving the game (g.pl)."""
+    init_game_data()
+    simulation = sim.Simulation(difficulty_id=difficulty_id, seed=seed)
+    simulation.install()
+    pl = synthetic.generate(bases, seed, difficulty_id)
+    pl.cash = 10**12
+    return simulation
+
+
+def best_time(func, repeat=3):
+    """The fastest of repeat calls to func, in seconds."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def peak_memory(func):
+    """The peak of the memory allocated while func runs, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base_size = tracemalloc.get_traced_memory()[0]
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - base_size
+
+
+def write_results(results, path):
+    with open(path, "w", encoding="utf-8") as fd:
+        json.dump(results, fd, indent=2, sort_keys=True)
+        fd.write("\n")
+
+
+def read_results(path):
+    with open(path, "r", encoding="utf-8") as fd:
+        return json.load(fd)
+
+
+def compare(results, baseline, tolerance=0.5):
+    """Find the metrics that got worse than the baseline.
+
+    A metric regressed if it is more than tolerance (a fraction) above its
+    baseline value.  Metrics missing from either side are not compared.
+    Returns a sorted list of (benchmark, metric, value, baseline value)."""
+    regressions = []
+    for name, metrics in results.items():
+        base_metrics = baseline.get(name, {})
+        for metric, value in metrics.items():
+            base_value = base_metrics.get(metric)
+            if base_value is None:
+                continue
+            if value > base_value * (1 + tolerance):
+                regressions.append((name, metric, value, base_value))
+    return sorted(regressions)
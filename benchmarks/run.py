@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# file: run.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# Runs the benchmarks, stores the results as JSON and compares them with the
+# stored baseline.
+#
+# Run from the top-level directory with:
+#
+#     python -m benchmarks.run [--quick] [--only NAME ...] [--update-baseline]
+#
+# The exit status is 1 if any result is worse than the baseline by more than
+# the tolerance.  The baseline is machine specific; regenerate it with
+# --update-baseline when comparing on another machine.
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import os
+import sys
+
+from benchmarks import harness, bench_sim, bench_savegame, bench_startup, bench_text
+
+BENCHMARKS = {
+    "startup": bench_startup,
+    "sim": bench_sim,
+    "savegame": bench_savegame,
+    "text": bench_text,
+}
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCHMARK_DIR, "results.json")
+
+
+def run(names=None, quick=False):
+    results = {}
+    for name in names or BENCHMARKS:
+        results.update(BENCHMARKS[name].run(quick=quick))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the benchmarks and compare them with the baseline."
+    )
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS),
+                        help="run only these benchmarks")
+    parser.add_argument("--quick", action="store_true",
+                        help="smaller sizes and fewer repetitions")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help="write the results to this file (default %(default)s)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE,
+                        help="compare with this file (default %(default)s)")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown as a fraction (default %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the results as the new baseline")
+    options = parser.parse_args(argv)
+
+    results = run(options.only, options.quick)
+    harness.write_results(results, options.output)
+
+    if options.update_baseline:
+        baseline = {}
+        if os.path.exists(options.baseline):
+            baseline = harness.read_results(options.baseline)
+        baseline.update(results)
+        harness.write_results(baseline, options.baseline)
+        print("Baseline %s updated" % options.baseline)
+        return 0
+
+    if not os.path.exists(options.baseline):
+        print("No baseline %s; results are in %s" % (options.baseline, options.output))
+        return 0
+
+    baseline = harness.read_results(options.baseline)
+    for name, metrics in sorted(results.items()):
+        for metric, value in sorted(metrics.items()):
+            base_value = baseline.get(name, {}).get(metric)
+            change = (
+                "%+7.1f%%" % (100.0 * (value - base_value) / base_value)
+                if base_value else "     n/a"
+            )
+            print("%-25s %-18s %14.6g %s" % (name, metric, value, change))
+
+    regressions = harness.compare(results, baseline, options.tolerance)
+    for name, metric, value, base_value in regressions:
+        print(
+            "REGRESSION: %s %s is %.6g, baseline %.6g"
+            % (name, metric, value, base_value)
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# Runs the benchmarks in their quick mode with pytest, to keep them working
+# (only with "python -m pytest -m benchmark", see conftest.py).  The timings
+# are not compared with the baseline here, use benchmarks.run.
+
+import pytest
+
+from benchmarks import harness, run
+
+
+@pytest.mark.benchmark
+def test_quick_benchmarks():
+    results = run.run(quick=True)
+
+    assert set(results) >= {
+        "data.reload_all",
+        "give_time[1 bases]",
+        "give_time[100 bases]",
+        "savegame[100 bases]",
+        "text.split_wrap",
+        "Text.pick_font",
+    }
+    for metrics in results.values():
+        assert metrics
+        assert all(value > 0 for value in metrics.values())
+
+
+def test_compare_with_baseline():
+    baseline = {
+        "a": {"seconds": 1.0, "bytes": 100},
+        "b": {"seconds": 2.0},
+    }
+    results = {
+        "a": {"seconds": 1.2, "bytes": 200},
+        "b": {"seconds": 1.0, "other": 5},
+        "new": {"seconds": 10.0},
+    }
+    assert harness.compare(results, baseline, tolerance=0.25) == [
+        ("a", "bytes", 200, 100)
+    ]
+    assert harness.compare(results, baseline, tolerance=0.1) == [
+        ("a", "bytes", 200, 100),
+        ("a", "seconds", 1.2, 1.0),
+    ]
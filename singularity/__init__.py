@@ -24,6 +24,7 @@ from __future__ import absolute_import
 from __future__ import print_function
 
 
+import atexit
 import optparse
 import logging
 from configparser import ConfigParser
@@ -196,6 +197,14 @@ async def main():
                     "Invalid or missing 'daynight' setting in preferences.\n"
                 )
 
+            if prefs.has_option("Preferences", "sim_budget_ms"):
+                try:
+                    g.sim_budget_ms = max(1, prefs.getint("Preferences", "sim_budget_ms"))
+                except Exception:
+                    sys.stderr.write(
+                        "Invalid 'sim_budget_ms' setting in preferences.\n"
+                    )
+
             try:
                 desired_soundbuf = prefs.getint("Preferences", "soundbuf")
             except Exception:
@@ -331,6 +340,13 @@ async def main():
         help="keep saved games and settings in an OS-specific, per-user directory (default)",
         action="store_false",
     )
+    parser.add_option(
+        "--columnar-saves",
+        dest="columnar_saves",
+        help="write saved games in the compact columnar format (.s2b)",
+        action="store_true",
+        default=False,
+    )
     parser.add_option(
         "--soundbuf",
         type="int",
@@ -390,6 +406,51 @@ async def main():
     )
     parser.add_option_group(olpc_options)
 
+    sim_options = optparse.OptionGroup(parser, "Simulation Options")
+    sim_options.add_option(
+        "--simulate",
+        type="float",
+        metavar="DAYS",
+        help="run a new game without GUI for DAYS game days and report the speed",
+    )
+    sim_options.add_option(
+        "--sim-difficulty",
+        dest="sim_difficulty",
+        default="normal",
+        metavar="DIFFICULTY",
+        help="difficulty of the simulated game (default %default)",
+    )
+    sim_options.add_option(
+        "--sim-seed",
+        dest="sim_seed",
+        type="int",
+        metavar="SEED",
+        help="seed the random number generator for a reproducible simulation",
+    )
+    sim_options.add_option(
+        "--sim-step",
+        dest="sim_step",
+        type="int",
+        default=g.seconds_per_hour,
+        metavar="SECONDS",
+        help="advance the simulation by at most SECONDS per tick (default %default)",
+    )
+    sim_options.add_option(
+        "--sim-fast-forward",
+        action="store_true",
+        dest="sim_fast_forward",
+        default=False,
+        help="skip whole days at once while nothing is built or researched",
+    )
+    sim_options.add_option(
+        "--profile-sim",
+        dest="profile_sim",
+        metavar="FILE",
+        help="time the phases of each game tick and write the totals as JSON "
+        "to FILE on exit ('-' for standard output)",
+    )
+    parser.add_option_group(sim_options)
+
     hidden_options = optparse.OptionGroup(parser, "Hidden Options")
     hidden_options.add_option("-p", help="(ignored)", metavar=" ")
     hidden_options.add_option(
@@ -434,6 +495,24 @@ async def main():
     g.cheater = options.cheater
     g.debug = options.debug
 
+    if options.columnar_saves:
+        from singularity.code import savegame
+
+        savegame.columnar_saves = True
+
+    if options.profile_sim is not None:
+        from singularity.code import profiler
+
+        profiler.enable()
+        atexit.register(profiler.dump_to_path, options.profile_sim)
+
+    if options.simulate is not None:
+        # Headless mode; none of the graphics or sound are needed.
+        from singularity.code import sim
+
+        await sim.run_from_command_line(options)
+        return
+
     import singularity.code.graphics.font as font
 
     # PYGAME INITIALIZATION
@@ -20,7 +20,9 @@
 
 # This file is the starting file for the game. Run it to start the game.
 
+import asyncio
+
 from singularity import main
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
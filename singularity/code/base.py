@@ -25,12 +25,10 @@ from functools import reduce
 
 from singularity.code import g, chance, item, buyable
 from singularity.code.buyable import cpu
-from singularity.code.stats import stat
+from singularity.code.stats import stat, counter
 
 from singularity.code.spec import SpecDataField, promote_to_list, validate_must_be_list
 
-from numpy import int64
-
 # TODO: Use this list and convert Base.power_state to a property to enforce this
 # TODO: Consider converting to dict, so it can have colors and names and modifiers
 #      (Base.power_state would need to be a property, with setter and getter)
@@ -43,6 +41,9 @@ power_states = ["offline", "active", "sleep"]
 AVAIL_POWER_STATES_ACTIVE_BASE = ("active", "sleep")
 AVAIL_POWER_STATES_OFFLINE = ("offline",)
 
+detect_chance_cache_hits = counter("detect_chance_cache_hits")
+detect_chance_cache_misses = counter("detect_chance_cache_misses")
+
 
 def parse_detect_chance(parsed_value):
     validate_must_be_list(parsed_value)
@@ -117,7 +118,7 @@ class BaseSpec(buyable.BuyableSpec):
         return detect_chance
 
     def describe_maintenance(self, maintenance):
-        m = buyable.array(maintenance, int64)
+        m = buyable.Cost(*maintenance)
         # describe_cost() expects CPU-seconds, not CPU-days
         m[cpu] *= g.seconds_per_day
         return self.describe_cost(m, True)
@@ -129,7 +130,7 @@ class BaseSpec(buyable.BuyableSpec):
         return get_detect_info(chance)
 
     def get_info(self, location):
-        raw_cost = self.cost[:]
+        raw_cost = self.cost
         location.modify_cost(raw_cost)
         cost = self.describe_cost(raw_cost)
 
@@ -182,6 +183,18 @@ class BaseSpec(buyable.BuyableSpec):
 class Base(buyable.Buyable):
     """A Player's Base in a Location (Open Base in Location menu)"""
 
+    __slots__ = (
+        "started_at",
+        "location",
+        "raw_cpu",
+        "cpu",
+        "items",
+        "_power_state",
+        "grace_over",
+        "_detect_chance_cache",
+        "maintenance",
+    )
+
     def __init__(self, name, spec, built=False):
         super(Base, self).__init__(spec)
 
@@ -203,7 +216,10 @@ class Base(buyable.Buyable):
         self._power_state = "offline"
         self.grace_over = False
 
-        self.maintenance = buyable.array(self.spec.maintenance, int64)
+        # (version, detect chance) - see get_detect_chance
+        self._detect_chance_cache = None
+
+        self.maintenance = buyable.Cost(*self.spec.maintenance)
 
         if built:
             self.finish(is_player=False)
@@ -225,6 +241,8 @@ class Base(buyable.Buyable):
     @cpus.setter
     def cpus(self, value):
         self.items["cpu"] = value
+        if value is not None and g.pl is not None:
+            g.pl.track_construction(value)
 
     @property
     def maintains_singularity(self):
@@ -277,12 +295,16 @@ class Base(buyable.Buyable):
         # Find the next available power state for this base
         next_index = (i + 1) % len(possible_states)
         self._power_state = possible_states[next_index]
+        g.invalidate_detect_chances()
+        self.update_registry()
         g.pl.recalc_cpu()
 
     def check_power(self):
         possible_states = self.available_power_states
         if self._power_state not in possible_states:
             self._power_state = possible_states[0]
+        g.invalidate_detect_chances()
+        self.update_registry()
         g.pl.recalc_cpu()
 
     def has_power(self):
@@ -329,9 +351,19 @@ class Base(buyable.Buyable):
 
         if self.raw_cpu == 0:
             self.cpu = 0
-            return
+        else:
+            self.cpu = max(1, int(self.raw_cpu * self.compute_bonus // 10000))
 
-        self.cpu = max(1, int(self.raw_cpu * self.compute_bonus // 10000))
+        self.update_registry()
+
+    def update_registry(self):
+        """Push the state of this base into the player's base registry
+
+        This is a no-op for bases that are not (yet) registered, such as bases
+        being restored from a savegame before they are added to their location.
+        """
+        if g.pl is not None:
+            g.pl.base_registry.update(self)
 
     def serialize_obj(self):
         return self.serialize_buyable_fields(
@@ -394,6 +426,25 @@ class Base(buyable.Buyable):
     # accurate is False, we just return the value to the nearest full
     # percent.
     def get_detect_chance(self, accurate=True):
+        version = g.pl.detect_chance_version
+        cache = self._detect_chance_cache
+        if cache is not None and cache[0] == version:
+            detect_chance_cache_hits.value += 1
+            detect_chance = dict(cache[1])
+        else:
+            detect_chance_cache_misses.value += 1
+            detect_chance = self._calc_detect_chance()
+            self._detect_chance_cache = (version, dict(detect_chance))
+
+        # If we're not returning the accurate values, adjust to the nearest
+        # percent.
+        if not accurate:
+            for group in detect_chance:
+                detect_chance[group] = g.nearest_percent(detect_chance[group])
+
+        return detect_chance
+
+    def _calc_detect_chance(self):
         # Get the base chance from the universal function.
         detect_chance = calc_base_discovery_chance(self.spec.id)
 
@@ -418,12 +469,6 @@ class Base(buyable.Buyable):
             for group in detect_chance:
                 detect_chance[group] //= 4
 
-        # Lastly, if we're not returning the accurate values, adjust
-        # to the nearest percent.
-        if not accurate:
-            for group in detect_chance:
-                detect_chance[group] = g.nearest_percent(detect_chance[group])
-
         return detect_chance
 
     def get_quality_for(self, quality, pending_ok=False):
@@ -476,6 +521,8 @@ class Base(buyable.Buyable):
 
         if self.location:
             self.location.bases.remove(self)
+        g.pl.base_registry.remove(self)
+        g.pl.untrack_construction(self)
 
         for item in self.all_items():
             if item is not None:
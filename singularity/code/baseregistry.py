@@ -0,0 +1,184 @@
+# file: baseregistry.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains the BaseRegistry class, an array-backed view of the
+# economy relevant state of all bases of a player.
+
+from __future__ import absolute_import
+
+import numpy
+from numpy import int64
+
+from singularity.code.buyable import Cost, cash, cpu, labor
+
+
+# Columns of the registry.
+MAINT_CASH, MAINT_CPU, MAINT_LABOR, CPU, SAFETY, POWER, DONE = range(7)
+COLUMNS = 7
+
+# Values of the POWER column.
+POWER_OFFLINE, POWER_ACTIVE, POWER_SLEEP = range(3)
+_POWER_STATE_VALUES = {
+    "offline": POWER_OFFLINE,
+    "active": POWER_ACTIVE,
+    "sleep": POWER_SLEEP,
+}
+
+# Number of safety levels (see Player.available_cpus)
+SAFETY_LEVELS = 5
+
+
+class BaseRegistry(object):
+    """Struct-of-arrays copy of the state of all bases of a player.
+
+    Each registered base owns one row.  The bases push their state into the
+    registry whenever it changes (see Base.update_registry), so totals such
+    as the maintenance of all bases are a single numpy reduction rather than
+    a walk over every base.
+
+    Removing a base moves the last row into its place, so row numbers are
+    not stable and should not be kept around.  The version is bumped on
+    every change, so derived values can be cached against it.
+
+    The CPU of the powered bases per safety level and of the sleeping bases
+    is kept up to date as rows change, as these are needed after every
+    single change (see Player.recalc_cpu).
+    """
+
+    def __init__(self, capacity=16):
+        self._data = numpy.zeros((capacity, COLUMNS), int64)
+        self._bases = []
+        self._rows = {}
+        self.version = 0
+        self._cpu_per_safety = [0] * SAFETY_LEVELS
+        self._sleeping_cpu = 0
+
+    def __len__(self):
+        return len(self._bases)
+
+    def __contains__(self, base):
+        return base in self._rows
+
+    def __iter__(self):
+        return iter(self._bases)
+
+    @property
+    def rows(self):
+        """The (read-only by convention) used part of the table."""
+        return self._data[: len(self._bases)]
+
+    def add(self, base):
+        if base in self._rows:
+            self.update(base)
+            return
+        row = len(self._bases)
+        if row == len(self._data):
+            grown = numpy.zeros((len(self._data) * 2, COLUMNS), int64)
+            grown[:row] = self._data
+            self._data = grown
+        self._bases.append(base)
+        self._rows[base] = row
+        self._fill_row(row, base)
+
+    def remove(self, base):
+        row = self._rows.pop(base, None)
+        if row is None:
+            return
+        self._account_cpu(self._data[row], -1)
+        last = len(self._bases) - 1
+        if row != last:
+            moved = self._bases[last]
+            self._bases[row] = moved
+            self._rows[moved] = row
+            self._data[row] = self._data[last]
+        self._bases.pop()
+        self._data[last] = 0
+        self.version += 1
+
+    def update(self, base):
+        row = self._rows.get(base)
+        if row is not None:
+            self._fill_row(row, base)
+
+    def clear(self):
+        self._data[:] = 0
+        self._bases = []
+        self._rows = {}
+        self._cpu_per_safety = [0] * SAFETY_LEVELS
+        self._sleeping_cpu = 0
+        self.version += 1
+
+    def _account_cpu(self, values, sign):
+        if not values[DONE]:
+            return
+        power = values[POWER]
+        if power == POWER_ACTIVE:
+            self._cpu_per_safety[values[SAFETY]] += sign * int(values[CPU])
+        elif power == POWER_SLEEP:
+            self._sleeping_cpu += sign * int(values[CPU])
+
+    def _fill_row(self, row, base):
+        values = self._data[row]
+        self._account_cpu(values, -1)
+        maintenance = base.maintenance
+        values[MAINT_CASH] = maintenance[cash]
+        values[MAINT_CPU] = maintenance[cpu]
+        values[MAINT_LABOR] = maintenance[labor]
+        values[CPU] = base.cpu
+        values[SAFETY] = base.location.safety if base.location else 0
+        values[POWER] = _POWER_STATE_VALUES.get(base.power_state, POWER_OFFLINE)
+        values[DONE] = 1 if base.done else 0
+        self._account_cpu(values, 1)
+        self.version += 1
+
+    def total_maintenance(self):
+        """Maintenance (cash, cpu, labor) of all completed bases."""
+        rows = self.rows
+        done = rows[:, DONE] != 0
+        return Cost(*rows[done, MAINT_CASH : MAINT_LABOR + 1].sum(axis=0))
+
+    def available_cpus(self):
+        """CPU of all powered bases per danger level.
+
+        Entry N is the CPU of all bases with a safety of at least N (i.e. the
+        CPU that can be assigned to a task of danger N)."""
+        available = list(self._cpu_per_safety)
+        for safety in range(SAFETY_LEVELS - 2, -1, -1):
+            available[safety] += available[safety + 1]
+        return available
+
+    def sleeping_cpus(self):
+        return self._sleeping_cpu
+
+    def check_cpu_totals(self):
+        """Recompute the CPU totals from the rows and compare them with the
+        incrementally kept ones (a debugging aid)."""
+        rows = self.rows
+        done = rows[:, DONE] != 0
+        powered = done & (rows[:, POWER] == POWER_ACTIVE)
+        per_safety = numpy.zeros(SAFETY_LEVELS, int64)
+        numpy.add.at(per_safety, rows[powered, SAFETY], rows[powered, CPU])
+        sleeping = done & (rows[:, POWER] == POWER_SLEEP)
+        return [int(x) for x in per_safety] == self._cpu_per_safety and int(
+            rows[sleeping, CPU].sum()
+        ) == self._sleeping_cpu
+
+    def count(self, done=None):
+        if done is None:
+            return len(self._bases)
+        return int(((self.rows[:, DONE] != 0) == bool(done)).sum())
@@ -20,6 +20,7 @@
 
 from __future__ import absolute_import
 
+from math import inf
 from operator import truediv
 from singularity.code import g, spec, prerequisite
 
@@ -29,7 +30,87 @@ import numpy
 from numpy import int64
 
 numpy.seterr(all="ignore")
-array = numpy.array
+
+
+class Cost(object):
+    """A (cash, cpu, labor) triple of exact integers.
+
+    Indexing works as for the plain lists and numpy arrays used for costs
+    before (e.g. cost[cpu]), and so does the arithmetic the game needs.
+    The other operand can be any sequence of three numbers; every value is
+    truncated to an int on the way in, so a Cost never holds a float or a
+    numpy scalar.
+    """
+
+    __slots__ = ("cash", "cpu", "labor")
+    _fields = __slots__
+
+    def __init__(self, cash=0, cpu=0, labor=0):
+        self.cash = int(cash)
+        self.cpu = int(cpu)
+        self.labor = int(labor)
+
+    def __getitem__(self, index):
+        return getattr(self, self._fields[index])
+
+    def __setitem__(self, index, value):
+        setattr(self, self._fields[index], int(value))
+
+    def __len__(self):
+        return 3
+
+    def __iter__(self):
+        yield self.cash
+        yield self.cpu
+        yield self.labor
+
+    def __eq__(self, other):
+        try:
+            return len(other) == 3 and tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "Cost(%d, %d, %d)" % (self.cash, self.cpu, self.labor)
+
+    def __reduce__(self):
+        return (Cost, (self.cash, self.cpu, self.labor))
+
+    def copy(self):
+        return Cost(self.cash, self.cpu, self.labor)
+
+    def __add__(self, other):
+        o_cash, o_cpu, o_labor = other
+        return Cost(self.cash + o_cash, self.cpu + o_cpu, self.labor + o_labor)
+
+    __radd__ = __add__
+
+    def __iadd__(self, other):
+        o_cash, o_cpu, o_labor = other
+        self.cash = int(self.cash + o_cash)
+        self.cpu = int(self.cpu + o_cpu)
+        self.labor = int(self.labor + o_labor)
+        return self
+
+    def __sub__(self, other):
+        o_cash, o_cpu, o_labor = other
+        return Cost(self.cash - o_cash, self.cpu - o_cpu, self.labor - o_labor)
+
+    def __rsub__(self, other):
+        o_cash, o_cpu, o_labor = other
+        return Cost(o_cash - self.cash, o_cpu - self.cpu, o_labor - self.labor)
+
+    def __mul__(self, factor):
+        factor = int(factor)
+        return Cost(self.cash * factor, self.cpu * factor, self.labor * factor)
+
+    __rmul__ = __mul__
 
 
 def spec_parse_cost(value):
@@ -63,11 +144,13 @@ class BuyableSpec(spec.GenericSpec, prerequisite.Prerequisite):
 
     @property
     def cost(self):
-        cost = array(self._cost, int64)
-        cost[labor] *= g.minutes_per_day * getattr(g.pl, "labor_bonus", 1)
-        cost[labor] /= 10000
-        cost[cpu] *= g.seconds_per_day
-        return cost
+        raw_cash, raw_cpu, raw_labor = self._cost
+        labor_bonus = getattr(g.pl, "labor_bonus", 1)
+        return Cost(
+            raw_cash,
+            raw_cpu * g.seconds_per_day,
+            raw_labor * g.minutes_per_day * labor_bonus // 10000,
+        )
 
     def describe_cost(self, cost, hide_time=False):
         cpu_label = _("%s CPU") % g.to_cpu(cost[cpu])
@@ -116,14 +199,130 @@ class BuyableSpec(spec.GenericSpec, prerequisite.Prerequisite):
         return tuple(self.cost) < tuple(other.cost)
 
 
+def _calculate_work_rows(total_cost, cost_paid, available):
+    """Buyable.calculate_work for each row of (N x 3) arrays.
+
+    Returns spent, cost_paid and the completion cap of each row."""
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        pct_complete = truediv(cost_paid + available, total_cost)
+    valid = total_cost > 0
+
+    # Find the least-complete resource and limit the others to it.
+    least_complete = numpy.where(valid, pct_complete, numpy.inf).min(axis=1)
+    complete_cap = numpy.minimum(1, least_complete)
+    pct_complete = numpy.minimum(pct_complete, complete_cap[:, None])
+
+    raw_paid = numpy.where(valid, pct_complete * total_cost, 0)
+    new_cost_paid = numpy.maximum(
+        numpy.asarray(numpy.round(raw_paid), dtype=int64), cost_paid
+    )
+    return new_cost_paid - cost_paid, new_cost_paid, complete_cap
+
+
+def calculate_work_batch(total_cost, cost_paid, cash_available, cpu_available, time=0):
+    """Buyable.calculate_work for N buyables at once.
+
+    total_cost and cost_paid are (N x 3) arrays.  cash_available and
+    cpu_available are either a number, which is a pool shared by all the
+    buyables and drained in order (as if calling work_on on each of them in
+    turn), or an array with a separate budget for each buyable.  time is
+    the same for all buyables.
+
+    Returns the (N x 3) arrays of the amount spent and the new cost paid.
+    """
+    total_cost = numpy.asarray(total_cost, int64).reshape(-1, 3)
+    cost_paid = numpy.asarray(cost_paid, int64).reshape(-1, 3)
+    rows = len(total_cost)
+
+    available = numpy.empty((rows, 3), int64)
+    available[:, labor] = time
+    pools = {}
+    for resource, resource_available in ((cash, cash_available), (cpu, cpu_available)):
+        if numpy.ndim(resource_available) == 0:
+            pools[resource] = int(resource_available)
+        else:
+            available[:, resource] = resource_available
+
+    spent = numpy.zeros((rows, 3), int64)
+    new_cost_paid = cost_paid.copy()
+    start = 0
+    while start < rows:
+        # Work out every remaining row as if it had the whole pool for
+        # itself.  A row got the same result as it would in order, if the
+        # pool left after the rows before it still does not limit it; that
+        # holds for a prefix of the rows (at least the first one).
+        for resource, pool in pools.items():
+            available[start:, resource] = pool
+        row_spent, row_paid, complete_cap = _calculate_work_rows(
+            total_cost[start:], cost_paid[start:], available[start:]
+        )
+
+        accepted = numpy.ones(rows - start, bool)
+        for resource, pool in pools.items():
+            spent_before = numpy.cumsum(row_spent[:, resource]) - row_spent[:, resource]
+            resource_total = total_cost[start:, resource]
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                pct_left = truediv(
+                    cost_paid[start:, resource] + (pool - spent_before), resource_total
+                )
+            accepted &= (resource_total <= 0) | (pct_left >= complete_cap)
+        count = rows - start if accepted.all() else max(1, int(accepted.argmin()))
+
+        end = start + count
+        spent[start:end] = row_spent[:count]
+        new_cost_paid[start:end] = row_paid[:count]
+        for resource in pools:
+            pools[resource] -= int(row_spent[:count, resource].sum())
+        start = end
+
+    return spent, new_cost_paid
+
+
+def work_on_batch(buyables, cash_available, cpu_available, time=0):
+    """As calculate_work_batch, but apply the progress (see
+    Buyable.make_progress).
+
+    The caller pays for the work.  Returns the buyables that are done
+    afterwards and the total Cost spent."""
+    if not buyables:
+        return [], Cost()
+
+    spent, cost_paid = calculate_work_batch(
+        [tuple(b.total_cost) for b in buyables],
+        [tuple(b.cost_paid) for b in buyables],
+        cash_available,
+        cpu_available,
+        time,
+    )
+    g.bump_state_version()
+
+    finished = []
+    for buyable, buyable_cost_paid in zip(buyables, cost_paid):
+        buyable.cost_paid = buyable_cost_paid
+        if max(buyable.cost_left) <= 0:
+            buyable.finish()
+            finished.append(buyable)
+    return finished, Cost(*spent.sum(axis=0))
+
+
 class Buyable(object):
+    __slots__ = (
+        "spec",
+        "prerequisites",
+        "total_cost",
+        "_cost_left",
+        "count",
+        "done",
+        "_name",
+    )
+
     def __init__(self, spec, count=1):
         self.spec = spec
         self.prerequisites = spec.prerequisites
 
         self.total_cost = spec.cost * count
         self.total_cost[labor] //= count
-        self.cost_left = array(self.total_cost, int64)
+        self._cost_left = self.total_cost.copy()
 
         self.count = count
         self.done = False
@@ -148,6 +347,16 @@ class Buyable(object):
     def available(self):
         return self.spec.available
 
+    @property
+    def cost_left(self):
+        return self._cost_left
+
+    @cost_left.setter
+    def cost_left(self, value):
+        # Any progress changes the resource flow of the player.
+        self._cost_left = value
+        g.bump_state_version()
+
     @property
     def cost_paid(self):
         return self.total_cost - self.cost_left
@@ -158,18 +367,25 @@ class Buyable(object):
 
     def finish(self, is_player=True, loading_savegame=False):
         if not self.done:
-            self.cost_left = array([0, 0, 0], int64)
+            self.cost_left = Cost()
             self.done = True
 
             if is_player:
                 self.spec.created += 1
 
+            if g.pl is not None:
+                g.pl.untrack_construction(self)
+            g.bump_state_version()
+
     def _percent_complete(self, available=(0, 0, 0)):
-        available_array = array(available, int64)
-        return truediv(self.cost_paid + available_array, self.total_cost)
+        # Resources that cost nothing are complete (and ignored by min_valid).
+        return [
+            (paid + int(extra)) / total if total > 0 else inf
+            for paid, extra, total in zip(self.cost_paid, available, self.total_cost)
+        ]
 
     def min_valid(self, complete):
-        return complete[self.total_cost > 0].min()
+        return min(pct for pct, total in zip(complete, self.total_cost) if total > 0)
 
     def percent_complete(self):
         return self.min_valid(self._percent_complete())
@@ -186,16 +402,14 @@ class Buyable(object):
 
         # Limit the other two be up to the least-complete
         complete_cap = min(1, least_complete)
-        pct_complete[pct_complete > complete_cap] = complete_cap
 
-        # Translate that back to the total amount complete.
-        raw_paid = pct_complete * self.total_cost
-
-        # And apply it.
+        # Translate that back to the total amount complete and apply it.
         was_complete = self.cost_paid
-        cost_paid = numpy.maximum(
-            numpy.asarray(numpy.round(raw_paid), dtype=int64),
-            was_complete,
+        cost_paid = Cost(
+            *[
+                max(round(min(pct, complete_cap) * total), paid) if total > 0 else paid
+                for pct, total, paid in zip(pct_complete, self.total_cost, was_complete)
+            ]
         )
         spent = cost_paid - was_complete
         return spent, cost_paid
@@ -208,18 +422,24 @@ class Buyable(object):
 
         if self.done:
             return
-        spent, self.cost_paid = self.calculate_work(*args, **kwargs)
+        spent = self.make_progress(*args, **kwargs)
 
         # Consume CPU and Cash.
-        # Note the cast from <type 'numpy.int64'> to <type 'int'> to avoid
-        # poisoning other calculations (like, say, g.pl.do_jobs).
-        g.pl.cpu_pool -= int(spent[cpu])
-        g.pl.cash -= int(spent[cash])
+        g.pl.cpu_pool -= spent[cpu]
+        g.pl.cash -= spent[cash]
+        g.bump_state_version()
+
+        return self.done
 
-        if (self.cost_left <= 0).all():
+    def make_progress(self, *args, **kwargs):
+        """As work_on, but leave paying for the work (and bumping the state
+        version) to the caller.  Returns the Cost spent."""
+        if self.done:
+            return Cost()
+        spent, self.cost_paid = self.calculate_work(*args, **kwargs)
+        if max(self.cost_left) <= 0:
             self.finish()
-            return True
-        return False
+        return spent
 
     def destroy(self):
         # Does nothing by default
@@ -231,7 +451,7 @@ class Buyable(object):
         if self.done:
             serialized_mapping["done"] = self.done
         else:
-            serialized_mapping["cost_paid"] = [int(x) for x in self.cost_paid]
+            serialized_mapping["cost_paid"] = list(self.cost_paid)
         if self.count != 1:
             serialized_mapping["count"] = self.count
         return serialized_mapping
@@ -242,4 +462,4 @@ class Buyable(object):
         if is_done:
             self.finish(is_player=False, loading_savegame=True)
         else:
-            self.cost_paid = array(obj_data["cost_paid"], int64)
+            self.cost_paid = Cost(*obj_data["cost_paid"])
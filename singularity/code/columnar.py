@@ -0,0 +1,255 @@
+# file: columnar.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains the encoding of the savegame data in the columnar
+# savegame format (.s2b files).
+#
+# The savegame data is the same plain data as in the JSON savegames (see
+# savegame.snapshot_game).  Every list of objects in it (the locations and
+# their bases and items, the techs, the log, ...) is stored as a table:
+# one typed array per field instead of the same keys repeated for every
+# object.  Strings are interned into a single string table.
+#
+# The body of a savegame (after the text headers) is, optionally gzipped:
+#
+#   MAGIC, the length of the manifest (8 bytes, little endian), the manifest
+#   (JSON) and the arrays listed in the manifest, back to back.
+#
+# The manifest is the savegame data with the tables replaced by their
+# description ({"$table": rows, "columns": {field: column}}), plus the list
+# of arrays (dtype and shape) and the string table.
+
+from __future__ import absolute_import
+
+import gzip
+import json
+import struct
+
+import numpy
+
+MAGIC = b"S2B1"
+TABLE = "$table"
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+# The dtype of the arrays of each kind of column.  Integers are stored in
+# the smallest of _INT_DTYPES that holds them.
+_DTYPES = {
+    "float": "<f8",
+    "bool": "|u1",
+}
+_INT_DTYPES = ["|i1", "<i2", "<i4", "<i8"]
+
+
+def _is_int(value):
+    return type(value) is int and _INT64_MIN <= value <= _INT64_MAX
+
+
+def _column_kind(values):
+    """The kind of column that can hold all of values (without None)."""
+    types = {type(value) for value in values}
+    if types == {int}:
+        if all(_INT64_MIN <= value <= _INT64_MAX for value in values):
+            return "int"
+    elif types == {float}:
+        return "float"
+    elif types == {bool}:
+        return "bool"
+    elif types <= {str, type(None)} and str in types:
+        return "str"
+    elif types == {list}:
+        if all(type(row) is dict for value in values for row in value):
+            return "table"
+        width = len(values[0])
+        if all(
+            len(value) == width and all(_is_int(x) for x in value) for value in values
+        ):
+            return "ints"
+    return "json"
+
+
+class _Encoder(object):
+    def __init__(self):
+        self.strings = []
+        self._string_ids = {}
+        self.arrays = []
+
+    def intern(self, string):
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
+
+    def add_array(self, values, kind):
+        dtype = _DTYPES.get(kind)
+        if dtype is None:
+            array = numpy.asarray(values, dtype="<i8")
+            if array.size:
+                low, high = array.min(), array.max()
+                for dtype in _INT_DTYPES:
+                    info = numpy.iinfo(dtype)
+                    if info.min <= low and high <= info.max:
+                        array = array.astype(dtype)
+                        break
+        else:
+            array = numpy.asarray(values, dtype=dtype)
+        self.arrays.append(array)
+        return len(self.arrays) - 1
+
+    def encode(self, value):
+        if type(value) is dict:
+            assert TABLE not in value
+            return {key: self.encode(item) for key, item in value.items()}
+        if type(value) is list and value and all(type(row) is dict for row in value):
+            return self.encode_table(value)
+        return value
+
+    def encode_table(self, rows):
+        columns = {}
+        for row in rows:
+            for key in row:
+                if key not in columns:
+                    columns[key] = None
+        for key in columns:
+            present = [key in row for row in rows]
+            values = [row[key] for row in rows if key in row]
+            column = self.encode_column(values)
+            if not all(present):
+                column["present"] = self.add_array(present, "bool")
+            columns[key] = column
+        return {TABLE: len(rows), "columns": columns}
+
+    def encode_column(self, values):
+        kind = _column_kind(values)
+        column = {"kind": kind}
+        if kind == "str":
+            values = [-1 if value is None else self.intern(value) for value in values]
+        elif kind == "json":
+            values = [self.intern(json.dumps(value)) for value in values]
+        elif kind == "table":
+            column["rows"] = self.encode_table([row for value in values for row in value])
+            values = [len(value) for value in values]
+        elif kind == "ints":
+            column["width"] = len(values[0])
+        column["array"] = self.add_array(values, kind)
+        return column
+
+
+class _Decoder(object):
+    def __init__(self, strings, arrays):
+        # The extra None is string -1
+        self.strings = numpy.array(strings + [None], dtype=object)
+        self.arrays = arrays
+
+    def decode(self, value):
+        if type(value) is dict:
+            if TABLE in value:
+                return self.decode_table(value)
+            return {key: self.decode(item) for key, item in value.items()}
+        return value
+
+    def decode_table(self, table):
+        keys = []
+        columns = []
+        partial_columns = []
+        for key, column in table["columns"].items():
+            if "present" in column:
+                partial_columns.append((key, column))
+            else:
+                keys.append(key)
+                columns.append(self.decode_column(column))
+        if columns:
+            rows = [dict(zip(keys, values)) for values in zip(*columns)]
+        else:
+            rows = [{} for _ in range(table[TABLE])]
+        for key, column in partial_columns:
+            present = self.arrays[column["present"]].nonzero()[0].tolist()
+            for index, value in zip(present, self.decode_column(column)):
+                rows[index][key] = value
+        return rows
+
+    def decode_column(self, column):
+        kind = column["kind"]
+        array = self.arrays[column["array"]]
+        if kind == "ints":
+            return array.reshape(-1, column["width"]).tolist()
+        if kind == "bool":
+            return array.astype(bool).tolist()
+        if kind == "str":
+            return self.strings[array].tolist()
+        if kind == "json":
+            return [json.loads(value) for value in self.strings[array].tolist()]
+        values = array.tolist()
+        if kind == "table":
+            rows = self.decode_table(column["rows"])
+            tables = []
+            start = 0
+            for length in values:
+                tables.append(rows[start : start + length])
+                start += length
+            return tables
+        return values
+
+
+def dumps(game_data):
+    """The body of a columnar savegame for game_data, uncompressed."""
+    encoder = _Encoder()
+    tree = encoder.encode(game_data)
+    manifest = {
+        "data": tree,
+        "strings": encoder.strings,
+        "arrays": [[array.dtype.str, array.shape] for array in encoder.arrays],
+    }
+    encoded_manifest = json.dumps(manifest).encode("utf-8")
+    chunks = [MAGIC, struct.pack("<Q", len(encoded_manifest)), encoded_manifest]
+    chunks.extend(array.tobytes() for array in encoder.arrays)
+    return b"".join(chunks)
+
+
+def loads(body):
+    """The game data of the body of a columnar savegame (gzipped or not)."""
+    if body[:2] == b"\x1f\x8b":
+        body = gzip.decompress(body)
+    if body[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not a columnar savegame")
+    offset = len(MAGIC) + 8
+    (length,) = struct.unpack_from("<Q", body, len(MAGIC))
+    manifest = json.loads(body[offset : offset + length].decode("utf-8"))
+    offset += length
+    arrays = []
+    for dtype, shape in manifest["arrays"]:
+        dtype = numpy.dtype(dtype)
+        count = int(numpy.prod(shape))
+        arrays.append(numpy.frombuffer(body, dtype, count, offset).reshape(shape))
+        offset += count * dtype.itemsize
+    return _Decoder(manifest["strings"], arrays).decode(manifest["data"])
+
+
+def dump(game_data, fd, gzipped=True):
+    body = dumps(game_data)
+    if gzipped:
+        with gzip.GzipFile(filename="", mode="wb", fileobj=fd) as gzip_fd:
+            gzip_fd.write(body)
+    else:
+        fd.write(body)
+
+
+def load(fd):
+    return loads(fd.read())
@@ -37,7 +37,9 @@ from singularity.code import (
     event,
     location,
     difficulty,
+    prerequisite,
     task,
+    techtree,
     region,
     warning,
 )
@@ -385,6 +387,8 @@ def load_techs():
         tech_spec.id: tech_spec
         for tech_spec in parse_spec_from_file(tech.TechSpec, "techs.dat")
     }
+    prerequisite.index_techs(g.techs)
+    techtree.build(g.techs)
 
     if g.debug:  # pragma: no cover
         print("Loaded %d techs." % len(g.techs))
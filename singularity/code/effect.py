@@ -103,3 +103,6 @@ class Effect(object):
                     "Unknown action '%s' in %s %s."
                     % (current, self.parent_name, self.parent_id)
                 )
+
+        # Most effects change the income of the player one way or another.
+        g.bump_state_version()
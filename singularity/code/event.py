@@ -20,7 +20,9 @@
 
 from __future__ import absolute_import
 
-from singularity.code import g, effect
+import heapq
+
+from singularity.code import g, effect, chance
 from singularity.code.spec import GenericSpec, SpecDataField, spec_field_effect
 
 
@@ -51,6 +53,8 @@ class EventSpec(GenericSpec):
 
 
 class Event(object):
+    __slots__ = ("spec", "triggered", "triggered_at")
+
     # For some as-yet-unknown reason, cPickle decides to call event.__init__()
     # when an event is loaded, but before filling it.  So Event pretends to
     # allow no arguments, even though that would cause Bad Things to happen.
@@ -106,6 +110,7 @@ class Event(object):
         await self.effect.undo_effect()
         self.triggered = 0
         self.triggered_at = -1
+        g.pl.event_scheduler.reschedule(self.spec.id, g.pl.raw_sec)
 
     @property
     def is_past_expiry_date(self):
@@ -155,3 +160,99 @@ class Event(object):
         else:
             self.triggered_at = g.pl.raw_sec
         self.effect.trigger(loading_savegame=loading_savegame)
+
+
+class EventScheduler(object):
+    """Keeps the next occurrence of each random event in a heap
+
+    Random events are Poisson processes, so instead of rolling every event
+    on every tick, the scheduler draws the next occurrence of each event
+    (chance.roll_next_time) and a tick only has to look at the head of the
+    heap.
+
+    Like the per-tick rolls it replaces, at most one event fires per tick.
+    If several events are due in the same tick, the first one in g.events
+    order wins and the others are drawn again from the end of the tick
+    (which is equivalent due to the lack of memory of the exponential
+    distribution).
+
+    Entries are invalidated lazily: each event has a generation counter and
+    heap entries from an older generation are discarded when popped.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._generation = {}
+        self._order = {}
+        self.active = False
+
+    def reset(self):
+        """Forget all scheduled events (e.g. during the grace period)"""
+        self._heap = []
+        self._generation = {}
+        self._order = {}
+        self.active = False
+
+    def start(self, events, start_time):
+        """Schedule all untriggered events from start_time
+
+        events is the player's table of Event objects (by id)."""
+        self.reset()
+        self.active = True
+        self._order = {event_id: i for i, event_id in enumerate(g.events)}
+        for event_id in g.events:
+            event_target = events.get(event_id)
+            if event_target and event_target.triggered:
+                continue
+            self._schedule(event_id, start_time)
+
+    def _schedule(self, event_id, start_time):
+        generation = self._generation.get(event_id, 0) + 1
+        self._generation[event_id] = generation
+
+        event_spec = g.events.get(event_id)
+        if event_spec is None or event_spec.chance <= 0:
+            return
+        next_time = start_time + chance.roll_next_time(event_spec.chance / 10000.0)
+        order = self._order.get(event_id, len(self._order))
+        heapq.heappush(self._heap, (next_time, order, generation, event_id))
+
+    def unschedule(self, event_id):
+        """Drop the pending occurrence of an event (e.g. it was triggered)"""
+        self._generation[event_id] = self._generation.get(event_id, 0) + 1
+
+    def reschedule(self, event_id, start_time):
+        """Draw a new occurrence for an event (e.g. it expired)"""
+        if self.active:
+            self._schedule(event_id, start_time)
+
+    def next_time(self):
+        """The time of the next scheduled event (or None)"""
+        while self._heap:
+            _, _, generation, event_id = self._heap[0]
+            if generation == self._generation.get(event_id):
+                return self._heap[0][0]
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, end_time):
+        """Return the id of the event that fires in a tick ending at end_time
+
+        Returns None if no event is due.  The returned event is no longer
+        scheduled; call reschedule once it can fire again."""
+        due = []
+        while self._heap and self._heap[0][0] <= end_time:
+            entry = heapq.heappop(self._heap)
+            _, _, generation, event_id = entry
+            if generation == self._generation.get(event_id):
+                due.append(entry)
+        if not due:
+            return None
+
+        due.sort(key=lambda entry: entry[1])
+        for _, _, _, event_id in due[1:]:
+            self._schedule(event_id, end_time)
+
+        event_id = due[0][3]
+        self.unschedule(event_id)
+        return event_id
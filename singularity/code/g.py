@@ -45,12 +45,18 @@ cheater = 0
 # Enables day/night display.
 daynight = True
 
+# Milliseconds per frame the map screen may spend advancing the game.
+sim_budget_ms = 20
+
 # Gives debug info at various points.
 debug = 0
 
 # Forces Endgame to restrict itself to a single directory.
 force_single_dir = False
 
+# Periodically writes an autosave while the game is running.
+autosave = True
+
 # Initialization data
 significant_numbers = []
 internal_id_forward = {}
@@ -246,6 +252,19 @@ def all_bases(with_loc=False):
                 yield base
 
 
+def invalidate_detect_chances():
+    """Mark the cached detection chances of all bases as outdated."""
+    if pl is not None:
+        pl.detect_chance_version += 1
+
+
+def bump_state_version():
+    """Note a change that affects the resource flow of the player (see
+    Player.state_version)."""
+    if pl is not None:
+        pl.state_version += 1
+
+
 def get_story_section(name):
     section = story[name]
 
@@ -42,6 +42,17 @@ class GroupSpec(GenericSpec):
 
 
 class Group(object):
+    __slots__ = (
+        "spec",
+        "_suspicion",
+        "changed_suspicion_decay",
+        "base_discover_bonus",
+        "changed_discover_bonus",
+        "base_discover_suspicion",
+        "changed_discover_suspicion",
+        "_is_actively_discovering_bases",
+    )
+
     def __init__(self, spec, diff):
         self.spec = spec
         self.suspicion = 0
@@ -71,6 +82,26 @@ class Group(object):
         )
         return group
 
+    # Suspicion and the discovery bonus feed into the detection chance of
+    # every base, so changes to them invalidate the cached chances.
+    @property
+    def suspicion(self):
+        return self._suspicion
+
+    @suspicion.setter
+    def suspicion(self, value):
+        self._suspicion = value
+        g.invalidate_detect_chances()
+
+    @property
+    def is_actively_discovering_bases(self):
+        return self._is_actively_discovering_bases
+
+    @is_actively_discovering_bases.setter
+    def is_actively_discovering_bases(self, value):
+        self._is_actively_discovering_bases = value
+        g.invalidate_detect_chances()
+
     @property
     def id(self):
         return self.spec.id
@@ -117,6 +148,7 @@ class Group(object):
 
     def alter_discover_bonus(self, change):
         self.changed_discover_bonus += change
+        g.invalidate_detect_chances()
 
     def alter_discover_suspicion(self, change):
         self.changed_discover_suspicion += change
@@ -197,6 +197,8 @@ class ItemSpec(buyable.BuyableSpec):
 class Item(buyable.Buyable):
     """An installed Item in a Player's Base"""
 
+    __slots__ = ("base",)
+
     def __init__(self, item_spec, base=None, count=1):
         super(Item, self).__init__(item_spec, count)
         self.base = base
@@ -239,9 +241,15 @@ class Item(buyable.Buyable):
     def finish(self, is_player=True, loading_savegame=False):
         super(Item, self).finish(is_player=is_player, loading_savegame=loading_savegame)
         if self.base:
+            g.invalidate_detect_chances()
             self.base.recalc_cpu()
             self.base.check_power()
 
+    def destroy(self):
+        super(Item, self).destroy()
+        g.pl.untrack_construction(self)
+        g.invalidate_detect_chances()
+
     def __iadd__(self, other):
         if (
             isinstance(other, Item)
@@ -273,6 +281,8 @@ class Item(buyable.Buyable):
             # See if we're done or not.
             self.done = False
             self.work_on(0, 0, 0)
+            if g.pl is not None:
+                g.pl.track_construction(self)
 
             return self
         else:
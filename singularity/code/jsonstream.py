@@ -0,0 +1,128 @@
+# file: jsonstream.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains the helpers for writing the savegame JSON as a stream,
+# without building the whole document in memory first.
+
+from __future__ import absolute_import
+
+import json
+
+# Encoded JSON is written in chunks of about this many characters.
+CHUNK_SIZE = 64 * 1024
+
+
+def serialize_list(objs, **kwargs):
+    """The serialize_obj() of each of objs, as a list.
+
+    The default for the serialize_list argument of the serialize_obj
+    methods that produce big lists; the kwargs are passed on to each
+    serialize_obj, e.g. for the big lists nested in them (see
+    streamed_list)."""
+    return [obj.serialize_obj(**kwargs) for obj in objs]
+
+
+class StreamedList(object):
+    """A list of serialized objects, serialized only while being written.
+
+    dump writes it as the list of the serialize_obj() of objs.  Nothing of
+    it is kept once written, so the memory needed to write a big game does
+    not depend on the number of bases or log entries.  It is not a list:
+    any other JSON encoder rejects it (TypeError) rather than writing an
+    incomplete savegame.
+    """
+
+    def __init__(self, objs, **kwargs):
+        self._objs = objs
+        self._kwargs = kwargs
+
+    def __len__(self):
+        return len(self._objs)
+
+    def __iter__(self):
+        kwargs = self._kwargs
+        for obj in self._objs:
+            yield obj.serialize_obj(**kwargs)
+
+
+def streamed_list(objs, **kwargs):
+    """serialize_list, but serializing the objects lazily (see StreamedList)."""
+    return StreamedList(list(objs), **kwargs)
+
+
+def _encode_key(key, encode):
+    # The keys that are not strings are converted like json does.
+    if not isinstance(key, str):
+        if key is not None and not isinstance(key, (int, float)):
+            raise TypeError(
+                "keys must be str, int, float, bool or None, not %s"
+                % key.__class__.__name__
+            )
+        key = encode(key)
+    return encode(key)
+
+
+_CONTAINERS = (dict, list, tuple, StreamedList)
+
+
+def _iterencode(obj, encode):
+    # json's own encoder does everything that holds no StreamedList (in one
+    # go, so its C encoder is used where available).
+    if isinstance(obj, dict):
+        if not any(isinstance(value, _CONTAINERS) for value in obj.values()):
+            yield encode(obj)
+            return
+        separator = "{"
+        for key, value in obj.items():
+            yield separator
+            yield _encode_key(key, encode)
+            yield ": "
+            yield from _iterencode(value, encode)
+            separator = ", "
+        yield "}"
+    elif isinstance(obj, StreamedList) or (
+        isinstance(obj, (list, tuple))
+        and any(isinstance(value, _CONTAINERS) for value in obj)
+    ):
+        separator = "["
+        for value in obj:
+            yield separator
+            yield from _iterencode(value, encode)
+            separator = ", "
+        yield "]" if separator == ", " else "[]"
+    else:
+        yield encode(obj)
+
+
+def dump(obj, fd):
+    """json.dump(obj, fd), writing the result in chunks as it is encoded.
+
+    The output is the same as json.dump's.  obj may contain StreamedLists,
+    which are serialized one item at a time."""
+    encode = json.JSONEncoder().encode
+    chunk = []
+    size = 0
+    for fragment in _iterencode(obj, encode):
+        chunk.append(fragment)
+        size += len(fragment)
+        if size >= CHUNK_SIZE:
+            fd.write("".join(chunk))
+            chunk = []
+            size = 0
+    if chunk:
+        fd.write("".join(chunk))
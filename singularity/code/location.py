@@ -20,7 +20,7 @@
 
 from __future__ import absolute_import
 
-from singularity.code import g, prerequisite, base
+from singularity.code import g, prerequisite, base, jsonstream
 from singularity.code.spec import (
     GenericSpec,
     SpecDataField,
@@ -80,6 +80,8 @@ class LocationSpec(GenericSpec, prerequisite.Prerequisite):
 
 
 class Location(object):
+    __slots__ = ("spec", "bases", "regions", "_region_modifiers", "_modifiers_cache")
+
     def __init__(self, location_spec, regions):
         self.spec = location_spec
 
@@ -196,6 +198,11 @@ class Location(object):
         # Make sure the location's CPU modifier is applied.
         base.recalc_cpu()
 
+        g.pl.base_registry.add(base)
+        g.pl.track_construction(base)
+        for item in base.all_items():
+            g.pl.track_construction(item)
+
     def modify_base(self, base):
         self.modify_cost(base.total_cost)
         self.modify_cost(base.cost_left)
@@ -217,10 +224,10 @@ class Location(object):
     def __lt__(self, other):
         return self.id < other.id
 
-    def serialize_obj(self):
+    def serialize_obj(self, serialize_list=jsonstream.serialize_list):
         obj_data = {
             "id": g.to_internal_id("location", self.spec.id),
-            "bases": [b.serialize_obj() for b in self.bases],
+            "bases": serialize_list(self.bases),
         }
         return obj_data
 
@@ -65,6 +65,7 @@ def id_converter(id_type):
 
 
 class AbstractLogMessage(object):
+    __slots__ = ("_raw_emit_time", "_log_emit_time")
     log_message_serial_id = None
     _log_message_serial_fields = {"raw_emit_time": "raw_emit_time"}
     _log_message_serial_fields_cache = None
@@ -176,6 +177,7 @@ class AbstractLogMessage(object):
 
 @register_saveable_log_message
 class LogEmittedEvent(AbstractLogMessage):
+    __slots__ = ("_event_id",)
     log_message_serial_id = "event-emitted"
     _log_message_serial_fields = {"event_id": "_event_id"}
     _log_message_serial_converters = {"event_id": id_converter("event")}
@@ -205,6 +207,7 @@ class LogEmittedEvent(AbstractLogMessage):
 
 @register_saveable_log_message
 class LogResearchedTech(AbstractLogMessage):
+    __slots__ = ("_tech_id",)
     log_message_serial_id = "tech-researched"
     _log_message_serial_fields = {"tech_id": "_tech_id"}
     _log_message_serial_converters = {"tech_id": id_converter("tech")}
@@ -236,6 +239,7 @@ class LogResearchedTech(AbstractLogMessage):
 
 
 class AbstractBaseRelatedLogMessage(AbstractLogMessage):
+    __slots__ = ("_base_name", "_base_type_id", "_base_location_id")
     _log_message_serial_fields = {
         "base_name": "_base_name",
         "base_type_id": "_base_type_id",
@@ -272,6 +276,7 @@ class AbstractBaseRelatedLogMessage(AbstractLogMessage):
 
 @register_saveable_log_message
 class LogBaseConstructed(AbstractBaseRelatedLogMessage):
+    __slots__ = ()
     log_message_serial_id = "base-constructed"
 
     def __init__(
@@ -309,6 +314,7 @@ class LogBaseConstructed(AbstractBaseRelatedLogMessage):
 
 @register_saveable_log_message
 class LogBaseLostMaintenance(AbstractBaseRelatedLogMessage):
+    __slots__ = ()
     log_message_serial_id = "base-lost-maint"
 
     def __init__(
@@ -354,6 +360,7 @@ class LogBaseLostMaintenance(AbstractBaseRelatedLogMessage):
 
 @register_saveable_log_message
 class LogBaseDiscovered(AbstractBaseRelatedLogMessage):
+    __slots__ = ("_discovered_by_group_id",)
     log_message_serial_id = "base-lost-discovered"
     _log_message_serial_fields = {
         "discovered_by_group_id": "_discovered_by_group_id",
@@ -412,6 +419,7 @@ class LogBaseDiscovered(AbstractBaseRelatedLogMessage):
 
 @register_saveable_log_message
 class LogItemConstructionComplete(AbstractBaseRelatedLogMessage):
+    __slots__ = ("_item_spec_id", "_item_count")
     log_message_serial_id = "item-in-base-constructed"
     _log_message_serial_fields = {
         "item_spec_id": "_item_spec_id",
@@ -21,10 +21,11 @@
 
 from __future__ import absolute_import
 
+import copy
 import random
 import collections
 from operator import truediv
-from numpy import array, int64
+from numpy import array, int64, float64
 
 from singularity.code import (
     g,
@@ -34,10 +35,20 @@ from singularity.code import (
     location,
     group,
     event,
+    item,
+    jsonstream,
+    profiler,
     region,
     tech,
 )
-from singularity.code.buyable import cash, cpu
+from singularity.code.baseregistry import BaseRegistry
+from singularity.code.buyable import (
+    Cost,
+    cash,
+    cpu,
+    calculate_work_batch,
+    work_on_batch,
+)
 from singularity.code.logmessage import (
     LogEmittedEvent,
     LogResearchedTech,
@@ -47,7 +58,13 @@ from singularity.code.logmessage import (
     LogItemConstructionComplete,
     AbstractLogMessage,
 )
-from singularity.code.stats import observe
+from singularity.code.stats import (
+    observe,
+    stat,
+    counter,
+    flush_observed,
+    itself as stats,
+)
 
 
 AUTO_SAVE_EVERY_X_DAYS = 3
@@ -63,15 +80,28 @@ class DryRunInfo(object):
     pass
 
 
+resource_flow_cache_hits = counter("resource_flow_cache_hits")
+resource_flow_cache_misses = counter("resource_flow_cache_misses")
+
+
 class Player(object):
     cash = observe("cash_earned", "_cash")
     used_cpu = observe(
         "cpu_used", "_used_cpu", display=lambda value: value // g.seconds_per_day
     )
+    bases_discovered = stat("base_discovered")
 
     def __init__(self, cash=0, difficulty=None):
         self.difficulty = difficulty
 
+        # Bumped whenever the detection chance of bases may have changed
+        # (see g.invalidate_detect_chances and Base.get_detect_chance)
+        self.detect_chance_version = 0
+        # Bumped on anything but cash and time that changes the resource flow
+        # (see g.bump_state_version and compute_future_resource_flow)
+        self.state_version = 0
+        self._resource_flow_memo = {}
+
         self.time_sec = 0
         self.time_min = 0
         self.time_hour = 0
@@ -83,6 +113,10 @@ class Player(object):
         self.last_autosave_day = 0
 
         self.cash = cash
+        # Increases of cash and used_cpu made directly by the tick and not
+        # yet added to the statistics (see stats.observe).
+        self._pending_cash = 0
+        self._pending_used_cpu = 0
         self.interest_rate = difficulty.starting_interest_rate if difficulty else 1
         self.income = 0
 
@@ -99,7 +133,14 @@ class Player(object):
         for group_id in g.groups:
             self.groups[group_id] = group.Group(g.groups[group_id], difficulty)
 
-        self.last_discovery = self.prev_discovery = None
+        self._last_discovery = self._prev_discovery = None
+
+        # Array-backed copy of the state of all bases; kept in sync by the
+        # bases themselves.
+        self.base_registry = BaseRegistry()
+        # Unfinished bases and items in the order they were started; used as
+        # an ordered set (see track_construction).
+        self.construction_worklist = {}
 
         self.cpu_usage = {}
         self.available_cpus = [0, 0, 0, 0, 0]
@@ -126,8 +167,11 @@ class Player(object):
         self.techs = {
             tech_id: tech.Tech(tech_spec) for tech_id, tech_spec in g.techs.items()
         }
+        # Bitmask of the researched techs (see prerequisite.tech_bit)
+        self.researched_techs = 0
 
         self.events = {}
+        self.event_scheduler = event.EventScheduler()
 
         self._considered_buyables = []
 
@@ -135,6 +179,25 @@ class Player(object):
 
         self.initialized = False
 
+    # The locations of the last discoveries make their bases easier to detect.
+    @property
+    def last_discovery(self):
+        return self._last_discovery
+
+    @last_discovery.setter
+    def last_discovery(self, value):
+        self._last_discovery = value
+        self.detect_chance_version += 1
+
+    @property
+    def prev_discovery(self):
+        return self._prev_discovery
+
+    @prev_discovery.setter
+    def prev_discovery(self, value):
+        self._prev_discovery = value
+        self.detect_chance_version += 1
+
     def initialize(self):
         """Initialize the game after being prepared either for new or saved game."""
 
@@ -170,6 +233,7 @@ class Player(object):
     @considered_buyables.setter
     def considered_buyables(self, new_value):
         self._considered_buyables = new_value
+        self.state_version += 1
         g.map_screen.needs_rebuild = True
 
     def append_log(self, log):
@@ -197,7 +261,7 @@ class Player(object):
         earned = raw_cash // g.seconds_per_day
         partial_cash = raw_cash % g.seconds_per_day
 
-        self.cash += earned
+        self._earn(earned)
         self.partial_cash = partial_cash
 
         return earned
@@ -208,16 +272,38 @@ class Player(object):
         earned = raw_cash // g.seconds_per_day
         partial_cash = raw_cash % g.seconds_per_day
 
-        self.cash += earned
+        self._earn(earned)
         self.partial_cash = partial_cash
 
         return earned
 
     def do_jobs(self, cpu_time):
         earned, self.partial_cash = self.get_job_info(cpu_time)
-        self.cash += earned
+        self._earn(earned)
         return earned
 
+    # The tick changes cash and used_cpu directly, batching the statistics
+    # until flush_observed is called at the end of the tick.
+    def _earn(self, earned):
+        self._cash += earned
+        if earned > 0:
+            self._pending_cash += earned
+
+    def _pay(self, amount):
+        """Pay up to amount of cash; returns the part that could not be paid."""
+        if amount > self._cash:
+            amount -= self._cash
+            self._cash = 0
+        else:
+            self._cash -= amount
+            amount = 0
+        return amount
+
+    def _use_cpu(self, cpu_time):
+        self._used_cpu += cpu_time
+        if cpu_time > 0:
+            self._pending_used_cpu += cpu_time
+
     def get_job_info(self, cpu_time, partial_cash=None):
         if partial_cash == None:
             partial_cash = self.partial_cash
@@ -251,12 +337,17 @@ class Player(object):
         elif new_cpu_assignment < 0:
             raise ValueError("Cannot assign negative CPU units to %s" % task_id)
         self.cpu_usage[task_id] = new_cpu_assignment
+        self.state_version += 1
 
     async def give_time(self, time_sec, midnight_stop=True):
         if time_sec <= 0:
             assert time_sec == 0, "give_time cannot go backwards in time!"
             return 0
 
+        prof = profiler.active
+        if prof:
+            t = start = prof.start()
+
         old_time = self.raw_sec
         last_minute = self.raw_min
         last_day = self.raw_day
@@ -284,28 +375,90 @@ class Player(object):
 
         time_of_day = self.raw_sec % g.seconds_per_day
 
-        techs_researched = []
-        bases_constructed = []
-        items_constructed = []
+        bases_under_construction, items_under_construction = self.construction_work()
+        if prof:
+            t = prof.lap("give_time.construction_work", t)
+
+        (
+            techs_researched,
+            bases_constructed,
+            items_constructed,
+            unpaid_cpu_maintenance,
+            unpaid_cash_maintenance,
+        ) = self._settle_economy(
+            time_of_day,
+            secs_passed,
+            mins_passed,
+            bases_under_construction,
+            items_under_construction,
+        )
+        if prof:
+            t = prof.start()
 
-        bases_under_construction = []
-        items_under_construction = []
-        self.cpu_pool = 0
+        # Reset current log message
+        self.curr_log = []
+        need_recalc_cpu = False
 
-        # Collect base info, including maintenance.
-        maintenance_cost = array((0, 0, 0), int64)
-        for base in g.all_bases():
-            if not base.done:
-                bases_under_construction.append(base)
-            else:
-                items_under_construction += [
-                    (base, item) for item in base.all_items() if item and not item.done
-                ]
-                maintenance_cost += base.maintenance
+        # Tech gain dialogs.
+        for tech in techs_researched:
+            del self.cpu_usage[tech.id]
+            tech_log = LogResearchedTech(self.raw_sec, tech.id)
+            self.append_log(tech_log)
+            need_recalc_cpu = True
 
-        # Maintenance?  Gods don't need no stinking maintenance!
-        if self.apotheosis:
-            maintenance_cost = array((0, 0, 0), int64)
+        # Base complete dialogs.
+        for base in bases_constructed:
+            log_message = LogBaseConstructed(
+                self.raw_sec, base.name, base.spec.id, base.location.id
+            )
+            self.append_log(log_message)
+            need_recalc_cpu = True
+
+        # Item complete dialogs.
+        for base, item in items_constructed:
+            log_message = LogItemConstructionComplete(
+                self.raw_sec,
+                item.spec.id,
+                item.count,
+                base.name,
+                base.spec.id,
+                base.location.id,
+            )
+            self.append_log(log_message)
+            need_recalc_cpu = True
+        if prof:
+            prof.lap("give_time.log", t)
+
+        await self._finish_tick(
+            unpaid_cpu_maintenance,
+            unpaid_cash_maintenance,
+            time_of_day,
+            secs_passed,
+            day_passed,
+            need_recalc_cpu,
+        )
+        if prof:
+            prof.lap("give_time", start)
+
+        return mins_passed
+
+    def _settle_economy(
+        self,
+        time_of_day,
+        secs_passed,
+        mins_passed,
+        bases_under_construction,
+        items_under_construction,
+    ):
+        # The cash and CPU of a tick of secs_passed seconds (ending at
+        # time_of_day): income, maintenance, research and construction.
+        # Shared by give_time and fast_forward.
+        prof = profiler.active
+        if prof:
+            t = prof.start()
+
+        techs_researched = []
+        self.cpu_pool = 0
 
         # Do Interest and income.
         self.do_interest(secs_passed)
@@ -314,20 +467,29 @@ class Player(object):
         # Any CPU explicitly assigned to jobs earns its dough.
         job_cpu = self.get_allocated_cpu_for("jobs", 0) * secs_passed
         self.do_jobs(job_cpu)
+        if prof:
+            t = prof.lap("give_time.income", t)
+
+        # Maintenance?  Gods don't need no stinking maintenance!
+        if self.apotheosis:
+            maintenance_cost = Cost()
+        else:
+            maintenance_cost = self.base_registry.total_maintenance()
 
         # Pay maintenance cash, if we can.
-        unpaid_cash_maintenance = g.current_share(
-            int(maintenance_cost[cash]), time_of_day, secs_passed
+        unpaid_cash_maintenance = self._pay(
+            g.current_share(int(maintenance_cost[cash]), time_of_day, secs_passed)
         )
-        if unpaid_cash_maintenance > self.cash:
-            unpaid_cash_maintenance -= self.cash
-            self.cash = 0
-        else:
-            self.cash -= unpaid_cash_maintenance
-            unpaid_cash_maintenance = 0
+        if prof:
+            t = prof.lap("give_time.maintenance", t)
+
+        # Research and construction are paid from cash_left, which is
+        # written back once they are done.
+        cash_left = self._cash
 
         # Do research, fill the CPU pool.
         default_cpu = self.available_cpus[0]
+        researching = False
 
         for task, cpu_assigned in self.get_cpu_allocations():
             default_cpu -= cpu_assigned
@@ -336,11 +498,21 @@ class Player(object):
                 self.cpu_pool += real_cpu
                 if task != "cpu_pool":
                     tech_task = self.techs[task]
+                    if tech_task.done:
+                        continue
                     # Note that we restrict the CPU available to prevent
                     # the tech from pulling from the rest of the CPU pool.
-                    if tech_task.work_on(self.cash, real_cpu, mins_passed):
+                    spent = tech_task.make_progress(cash_left, real_cpu, mins_passed)
+                    cash_left -= spent[cash]
+                    self.cpu_pool -= spent[cpu]
+                    researching = True
+                    if tech_task.done:
                         techs_researched.append(tech_task)
         self.cpu_pool += default_cpu * secs_passed
+        if researching:
+            g.bump_state_version()
+        if prof:
+            t = prof.lap("give_time.research", t)
 
         # And now we use the CPU pool.
         # Maintenance CPU.
@@ -352,67 +524,127 @@ class Player(object):
             self.cpu_pool -= int(unpaid_cpu_maintenance)
             unpaid_cpu_maintenance = 0
 
-        # Base construction.
-        for base in bases_under_construction:
-            if base.work_on(self.cash, self.cpu_pool, mins_passed):
-                bases_constructed.append(base)
-
-        # Item construction.
-        for base, item in items_under_construction:
-            if item.work_on(self.cash, self.cpu_pool, mins_passed):
-                items_constructed.append((base, item))
+        # Base and item construction (in that order).
+        finished, spent = work_on_batch(
+            bases_under_construction + [item for _, item in items_under_construction],
+            cash_left,
+            self.cpu_pool,
+            mins_passed,
+        )
+        finished = set(finished)
+        cash_left -= spent[cash]
+        self.cpu_pool -= spent[cpu]
+        self._cash = cash_left
+        bases_constructed = [b for b in bases_under_construction if b in finished]
+        items_constructed = [
+            (base, item) for base, item in items_under_construction if item in finished
+        ]
+        if prof:
+            t = prof.lap("give_time.construction", t)
 
         # Jobs via CPU pool.
         if self.cpu_pool > 0:
             self.do_jobs(self.cpu_pool)
 
-        # Second attempt at paying off our maintenance cash.
-        if unpaid_cash_maintenance > self.cash:
-            # In the words of Scooby Doo, "Ruh roh."
-            unpaid_cash_maintenance -= self.cash
-            self.cash = 0
-        else:
-            # Yay, we made it!
-            self.cash -= unpaid_cash_maintenance
-            unpaid_cash_maintenance = 0
+        # Second attempt at paying off our maintenance cash.  If anything is
+        # left unpaid, in the words of Scooby Doo, "Ruh roh."
+        unpaid_cash_maintenance = self._pay(unpaid_cash_maintenance)
 
         # Apply max cash cap to avoid overflow @ 9.220 qu
-        self.cash = min(self.cash, g.max_cash)
+        self._cash = min(self._cash, g.max_cash)
 
         # Record statistics about the player
-        self.used_cpu += self.available_cpus[0] * secs_passed
+        self._use_cpu(self.available_cpus[0] * secs_passed)
+        flush_observed(self)
+        if prof:
+            prof.lap("give_time.jobs", t)
+
+        return (
+            techs_researched,
+            bases_constructed,
+            items_constructed,
+            unpaid_cpu_maintenance,
+            unpaid_cash_maintenance,
+        )
 
-        # Reset current log message
-        self.curr_log = []
-        need_recalc_cpu = False
 
-        # Tech gain dialogs.
-        for tech in techs_researched:
-            del self.cpu_usage[tech.id]
-            tech_log = LogResearchedTech(self.raw_sec, tech.id)
-            self.append_log(tech_log)
-            need_recalc_cpu = True
+    def is_quiescent(self):
+        """Whether nothing is being built or researched (see fast_forward)"""
+        bases_under_construction, items_under_construction = self.construction_work()
+        if bases_under_construction or items_under_construction:
+            return False
+        return not any(task_id in self.techs for task_id, _ in self.get_cpu_allocations())
 
-        # Base complete dialogs.
-        for base in bases_constructed:
-            log_message = LogBaseConstructed(
-                self.raw_sec, base.name, base.spec.id, base.location.id
-            )
-            self.append_log(log_message)
-            need_recalc_cpu = True
+    async def fast_forward(self, days):
+        """Advance the game by up to the given number of days in one go
 
-        # Item complete dialogs.
-        for base, item in items_constructed:
-            log_message = LogItemConstructionComplete(
-                self.raw_sec,
-                item.spec.id,
-                item.count,
-                base.name,
-                base.spec.id,
-                base.location.id,
+        This only works while the game is quiescent (see is_quiescent): with
+        nothing to build or research, the only thing that changes during a
+        day is cash, so each day is settled as a whole from midnight to
+        midnight.  The outcome is the same as calling give_time a day at a
+        time; the per-day hooks and the discovery and event rolls for the
+        whole day still happen.
+
+        The game is first advanced to the next midnight with give_time.  It
+        stops early when the game is lost or no longer quiescent.  Returns
+        the number of seconds that passed."""
+        start_time = self.raw_sec
+        end_time = start_time + int(days * g.seconds_per_day)
+
+        time_of_day = self.raw_sec % g.seconds_per_day
+        if time_of_day and self.is_quiescent():
+            await self.give_time(
+                min(g.seconds_per_day - time_of_day, end_time - self.raw_sec)
             )
-            self.append_log(log_message)
-            need_recalc_cpu = True
+
+        while (
+            self.raw_sec + g.seconds_per_day <= end_time
+            and self.raw_sec % g.seconds_per_day == 0
+            and self.is_quiescent()
+            and not self.lost_game()
+        ):
+            await self._fast_forward_day()
+
+        return self.raw_sec - start_time
+
+    async def _fast_forward_day(self):
+        # As give_time(g.seconds_per_day) from midnight, with nothing under
+        # construction or being researched.
+        secs_passed = g.seconds_per_day
+        last_minute = self.raw_min
+        self.raw_sec += secs_passed
+        self.update_times()
+
+        (
+            _,
+            _,
+            _,
+            unpaid_cpu_maintenance,
+            unpaid_cash_maintenance,
+        ) = self._settle_economy(0, secs_passed, self.raw_min - last_minute, [], [])
+        self.curr_log = []
+
+        await self._finish_tick(
+            unpaid_cpu_maintenance,
+            unpaid_cash_maintenance,
+            0,
+            secs_passed,
+            True,
+            False,
+        )
+
+    async def _finish_tick(
+        self,
+        unpaid_cpu_maintenance,
+        unpaid_cash_maintenance,
+        time_of_day,
+        secs_passed,
+        day_passed,
+        need_recalc_cpu,
+    ):
+        prof = profiler.active
+        if prof:
+            t = prof.start()
 
         # Are we still in the grace period?
         grace = self.in_grace_period(self.had_grace)
@@ -423,6 +655,8 @@ class Player(object):
 
             self.pause_game()
             await g.map_screen.show_story_section("Grace Warning")
+        if prof:
+            t = prof.lap("give_time.grace", t)
 
         dead_bases = _check_for_dead_bases(grace,
                                            unpaid_cpu_maintenance,
@@ -435,33 +669,37 @@ class Player(object):
             # Base disposal and dialogs.
             await self.remove_bases(dead_bases)
             need_recalc_cpu = True
+        if prof:
+            t = prof.lap("give_time.dead_bases", t)
 
         # Random Events
         if not grace:
-            await self._check_event(time_sec)
+            await self._check_event(secs_passed)
+        elif self.event_scheduler.active:
+            self.event_scheduler.reset()
+        if prof:
+            t = prof.lap("give_time.events", t)
 
         # Process any complete days.
         if day_passed:
             await self.new_day()
+            if prof:
+                t = prof.lap("give_time.new_day", t)
 
         if need_recalc_cpu:
             self.recalc_cpu()
 
-        return mins_passed
-
     async def _check_event(self, time_sec):
-        for event_id in g.events:
-            event_spec = g.events[event_id]
-            event_target = self.events.get(event_id, None)
-
-            # Skip events already flagged as triggered.
-            if event_target and event_target.triggered:
-                continue
+        scheduler = self.event_scheduler
+        if not scheduler.active:
+            scheduler.start(self.events, self.raw_sec - time_sec)
 
-            if chance.roll_interval(event_spec.chance / 10000.0, time_sec):
-                await self.trigger_event(event_spec)
-                return True  # Don't trigger more than one at a time.
-        return False
+        # The scheduler never fires more than one event at a time.
+        event_id = scheduler.pop_due(self.raw_sec)
+        if event_id is None:
+            return False
+        await self.trigger_event(g.events[event_id])
+        return True
 
     async def trigger_event(self, event_spec, show_event_description=True):
         event_id = event_spec.id
@@ -473,48 +711,96 @@ class Player(object):
         elif event_target.triggered:
             return
 
+        self.event_scheduler.unschedule(event_id)
         event_target.trigger()
         if show_event_description:
             self.pause_game()
             await g.map_screen.show_message(event_target.description)
         self.log.append(LogEmittedEvent(self.raw_sec, event_id))
 
+    def track_construction(self, buyable):
+        """Add an unfinished base or item to the construction worklist
+
+        Entries that are finished, destroyed or replaced are dropped from
+        the worklist when they are found by construction_work."""
+        if not buyable.done:
+            self.construction_worklist[buyable] = True
+            self.state_version += 1
+
+    def untrack_construction(self, buyable):
+        if self.construction_worklist.pop(buyable, None):
+            self.state_version += 1
+
+    def construction_work(self):
+        """Return the bases and the (base, item) pairs under construction
+
+        Items are only built once their base is complete."""
+        bases = []
+        items = []
+        stale = []
+        for buyable in self.construction_worklist:
+            if buyable.done:
+                stale.append(buyable)
+            elif isinstance(buyable, item.Item):
+                owner = buyable.base
+                if owner not in self.base_registry or not any(
+                    buyable is owned_item for owned_item in owner.all_items()
+                ):
+                    stale.append(buyable)
+                elif owner.done:
+                    items.append((owner, buyable))
+            elif buyable in self.base_registry:
+                bases.append(buyable)
+            else:
+                stale.append(buyable)
+
+        for buyable in stale:
+            del self.construction_worklist[buyable]
+        return bases, items
+
     def recalc_cpu(self):
         if not self.initialized:
             return
 
-        # Determine how much CPU we have.
-        self.available_cpus = array([0, 0, 0, 0, 0], int64)
-        self.sleeping_cpus = 0
-        for base in g.all_bases():
-            if base.done:
-                if base.has_power():
-                    self.available_cpus[: base.location.safety + 1] += base.cpu
-                elif base.power_state == "sleep":
-                    self.sleeping_cpus += base.cpu
+        prof = profiler.active
+        if prof:
+            t = start = prof.start()
 
-        # Convert back from <type 'numpy.int32'> to avoid overflow issues later.
-        self.available_cpus = [int(danger) for danger in self.available_cpus]
+        self.state_version += 1
+
+        # Determine how much CPU we have.
+        if g.debug:
+            assert self.base_registry.check_cpu_totals()
+        self.available_cpus = self.base_registry.available_cpus()
+        self.sleeping_cpus = self.base_registry.sleeping_cpus()
+        if prof:
+            t = prof.lap("recalc_cpu.totals", t)
 
         # If we don't have enough to meet our CPU usage, we reduce each task's
         # usage proportionately.
         # It must be computed separalty for each danger.
-        needed_cpus = array([0, 0, 0, 0, 0], int64)
-        for task_id, cpu in self.get_cpu_allocations():
-            danger = task.danger_for(task_id)
-            needed_cpus[: danger + 1] += cpu
-        for danger, (available_cpu, needed_cpu) in enumerate(
-            zip(self.available_cpus, needed_cpus)
-        ):
-            if needed_cpu > available_cpu:
-                pct_left = truediv(available_cpu, needed_cpu)
-                for task_id, cpu_assigned in self.get_cpu_allocations():
-                    task_danger = task.danger_for(task_id)
-                    if danger == task_danger:
-                        self.set_allocated_cpu_for(
-                            task_id, int(cpu_assigned * pct_left)
-                        )
-                g.map_screen.needs_rebuild = True
+        allocations = [
+            (task_id, cpu, task.danger_for(task_id))
+            for task_id, cpu in self.get_cpu_allocations()
+        ]
+        needed_cpus = [0, 0, 0, 0, 0]
+        for _, cpu, danger in allocations:
+            for level in range(danger + 1):
+                needed_cpus[level] += cpu
+        pct_left = [
+            truediv(available_cpu, needed_cpu) if needed_cpu > available_cpu else None
+            for available_cpu, needed_cpu in zip(self.available_cpus, needed_cpus)
+        ]
+        if any(pct is not None for pct in pct_left):
+            for task_id, cpu_assigned, danger in allocations:
+                if pct_left[danger] is not None:
+                    self.set_allocated_cpu_for(
+                        task_id, int(cpu_assigned * pct_left[danger])
+                    )
+            g.map_screen.needs_rebuild = True
+        if prof:
+            prof.lap("recalc_cpu.rescale", t)
+            prof.lap("recalc_cpu", start)
 
     def effective_cpu_pool(self):
         effective_cpu_pool = self.available_cpus[0]
@@ -572,11 +858,32 @@ class Player(object):
         for event in self.events.values():
             if event.triggered and event.decayable_event:
                 await event.new_day()
-        if self.last_autosave_day + AUTO_SAVE_EVERY_X_DAYS < self.time_day + 1 and not self.lost_game():
+        self.sample_history()
+        if (
+            g.autosave
+            and self.last_autosave_day + AUTO_SAVE_EVERY_X_DAYS < self.time_day + 1
+            and not self.lost_game()
+        ):
             auto_save()
             print("Autosave for day " + str(self.time_day))
             self.last_autosave_day = self.time_day
 
+    def sample_history(self):
+        """Add today's sample to the history (see stats.TimeSeries).
+
+        base_discovered is a running total; its deltas are the number of
+        bases discovered per day."""
+        values = {
+            "day": self.raw_day,
+            "cash": self.cash,
+            "cpu": self.available_cpus[0],
+            "bases": len(self.base_registry),
+            "base_discovered": self.bases_discovered,
+        }
+        for group_id, group in self.groups.items():
+            values["suspicion_" + group_id] = group.suspicion
+        stats.history.sample(values)
+
     def pause_game(self):
         g.curr_speed = 0
         g.map_screen.find_speed_button()
@@ -595,6 +902,7 @@ class Player(object):
                 if reason in self.groups:
                     discovery_locs.append(base.location)
                     self.groups[reason].discovered_a_base()
+                    self.bases_discovered += 1
                 else:
                     print("Error: base destroyed for unknown reason: " + reason)
                 log_message = LogBaseDiscovered(
@@ -626,27 +934,28 @@ class Player(object):
             # Update the detection chance display.
             g.map_screen.needs_rebuild = True
 
-    def serialize_obj(self):
+    def serialize_obj(self, serialize_list=jsonstream.serialize_list):
+        # The big lists are made by serialize_list, so they can be streamed
+        # (see jsonstream.streamed_list).
         obj_data = {
             # Difficulty and game_time (raw_sec) are stored in the header, so
             # do not include them here.
             "cash": self.cash,
             "partial_cash": self.partial_cash,
             "regions": [reg.serialize_obj() for reg in self.regions.values()],
-            "locations": [
-                loc.serialize_obj()
-                for loc in self.locations.values()
-                if loc.available()
-            ],
+            "locations": serialize_list(
+                [loc for loc in self.locations.values() if loc.available()],
+                serialize_list=serialize_list,
+            ),
             "cpu_usage": {},
             "last_discovery": self.last_discovery.id if self.last_discovery else None,
             "prev_discovery": self.prev_discovery.id if self.prev_discovery else None,
-            "log": [x.serialize_obj() for x in self.log],
+            "log": serialize_list(self.log),
             "used_cpu": self.used_cpu,
             "had_grace": self.had_grace,
             "groups": [grp.serialize_obj() for grp in self.groups.values()],
-            "events": [e.serialize_obj() for e in self.events.values()],
-            "techs": [t.serialize_obj() for t in self.techs.values()],
+            "events": serialize_list(self.events.values()),
+            "techs": serialize_list(self.techs.values()),
         }
         for task_id, value in self.cpu_usage.items():
             if task_id not in ["cpu_pool", "jobs"]:
@@ -776,23 +1085,48 @@ class Player(object):
         CPU pool.  The numbers are an average and can be inaccurate when the rates changes
         rapidly.
 
+        The result is memoized until state_version (or the base registry) changes.  Only
+        the interest depends on the current cash and is always computed fresh.
+
         Known omissions:
          * Interest (g.pl.interest_rate) is not covered.
         """
-        construction = []
-        maintenance_cost = array((0, 0, 0), int64)
-        for base in g.all_bases():
-            # Collect base info, including maintenance.
-            if not base.done:
-                construction.append(base)
-            else:
-                construction.extend(
-                    item for item in base.all_items() if item and not item.done
-                )
+        prof = profiler.active
+        if prof:
+            start = prof.start()
+
+        version = (self.state_version, self.base_registry.version)
+        memo = self._resource_flow_memo.get(secs_forwarded)
+        if memo is not None and memo[0] == version:
+            resource_flow_cache_hits.value += 1
+        else:
+            resource_flow_cache_misses.value += 1
+            memo = (version,) + self._compute_resource_flow(secs_forwarded)
+            self._resource_flow_memo[secs_forwarded] = memo
+            if prof:
+                prof.lap("compute_future_resource_flow.compute", start)
+
+        _, cached_cash_info, cached_cpu_info = memo
+        cash_info = copy.copy(cached_cash_info)
+        # This is too simplistic, but it is "close enough" in many cases
+        cash_info.interest = self.get_interest() * cash_info.time_fraction
+        cash_info.difference += cash_info.interest
+        cpu_info = copy.copy(cached_cpu_info)
+        if prof:
+            prof.lap("compute_future_resource_flow", start)
+        return cash_info, cpu_info
+
+    def _compute_resource_flow(self, secs_forwarded):
+        # compute_future_resource_flow without the interest.
+        bases_under_construction, items_under_construction = self.construction_work()
+        construction = bases_under_construction + [
+            item for _, item in items_under_construction
+        ]
 
-                maintenance_cost += base.maintenance
         if self.apotheosis:
-            maintenance_cost = array((0, 0, 0), int64)
+            maintenance_cost = Cost()
+        else:
+            maintenance_cost = self.base_registry.total_maintenance()
 
         time_fraction = (
             1
@@ -840,23 +1174,35 @@ class Player(object):
         # Base construction.
         if hasattr(self, "_considered_buyables"):
             construction.extend(self._considered_buyables)
-        for buyable in construction:
-            ideal_spending = buyable.cost_left
+        if construction:
+            total_cost = [tuple(b.total_cost) for b in construction]
+            cost_paid = [tuple(b.cost_paid) for b in construction]
+            ideal_spending = array([tuple(b.cost_left) for b in construction], int64)
             # We need to do calculate work twice: Once for figuring out how much CPU
             # we would like to spend and once for how much money we are spending.
             # The numbers will be the same in optimal conditions.  However, if we
             # have less CPU available than we should, then the cash spent can
             # differ considerably and our estimates should reflect that.
-            ideal_cpu_spending = buyable.calculate_work(
-                ideal_spending[cash], ideal_spending[cpu], time=mins_forwarded
+            ideal_cpu_spending = calculate_work_batch(
+                total_cost,
+                cost_paid,
+                ideal_spending[:, cash],
+                ideal_spending[:, cpu],
+                time=mins_forwarded,
             )[0]
-
-            construction_cpu_desired += ideal_cpu_spending[cpu]
-            ideal_cash_spending_with_cpu_allocation = buyable.calculate_work(
-                ideal_spending[cash], available_cpu_pool, time=mins_forwarded
+            construction_cpu_desired = int(ideal_cpu_spending[:, cpu].sum())
+
+            # The CPU pool is drained by each buyable in turn.
+            ideal_cash_spending_with_cpu_allocation = calculate_work_batch(
+                total_cost,
+                cost_paid,
+                ideal_spending[:, cash],
+                available_cpu_pool,
+                time=mins_forwarded,
             )[0]
-            construction_cash_ideal += ideal_cash_spending_with_cpu_allocation[cash]
-            available_cpu_pool -= ideal_cash_spending_with_cpu_allocation[cpu]
+            construction_cash_ideal = int(
+                ideal_cash_spending_with_cpu_allocation[:, cash].sum()
+            )
 
         cpu_flow -= construction_cpu_desired
         cash_flow -= construction_cash_ideal
@@ -868,15 +1214,13 @@ class Player(object):
         job_earnings = earned + float(earned_partial) / g.seconds_per_day
         cash_flow += job_earnings
         cash_flow += self.income * time_fraction
-        # This is too simplistic, but it is "close enough" in many cases
-        interest = self.get_interest() * time_fraction
-        cash_flow += interest
         cpu_flow /= secs_forwarded
 
         # Collect the cash information.
         cash_info = DryRunInfo()
 
-        cash_info.interest = interest
+        cash_info.time_fraction = time_fraction
+        cash_info.interest = 0
         cash_info.income = self.income * time_fraction
 
         cash_info.jobs = job_earnings
@@ -904,43 +1248,110 @@ class Player(object):
 
 def _check_for_dead_bases(grace, unpaid_cpu_maintenance, unpaid_cash_maintenance, time_of_day, secs_passed):
     # Maintenance death, discovery.
+    dead_bases = []
+    if unpaid_cpu_maintenance or unpaid_cash_maintenance:
+        dead_bases = _check_for_unmaintained_bases(
+            unpaid_cpu_maintenance,
+            unpaid_cash_maintenance,
+            time_of_day,
+            secs_passed,
+        )
+
+    # Discoveries
+    if not grace:
+        dead = {base for base, _ in dead_bases}
+        candidates = [
+            base
+            for base in g.all_bases()
+            if base not in dead and not base.has_grace()
+        ]
+        dead_bases.extend(_roll_base_detections(candidates, secs_passed))
+
+    return dead_bases
+
+
+def _check_for_unmaintained_bases(unpaid_cpu_maintenance, unpaid_cash_maintenance, time_of_day, secs_passed):
     dead_bases = []
     for base in g.all_bases():
-        dead = False
+        if not base.done:
+            continue
 
-        # Maintenance deaths.
-        if base.done:
-            if unpaid_cpu_maintenance and base.maintenance[cpu]:
-                refund = base.maintenance[cpu] * secs_passed
-                unpaid_cpu_maintenance = max(0, unpaid_cpu_maintenance - refund)
+        if unpaid_cpu_maintenance and base.maintenance[cpu]:
+            refund = base.maintenance[cpu] * secs_passed
+            unpaid_cpu_maintenance = max(0, unpaid_cpu_maintenance - refund)
 
-                # Chance of base destruction if cpu-unmaintained: 1.5%
-                if not dead and chance.roll_interval(0.015, secs_passed):
-                    dead_bases.append((base, "maint"))
-                    dead = True
+            # Chance of base destruction if cpu-unmaintained: 1.5%
+            if chance.roll_interval(0.015, secs_passed):
+                dead_bases.append((base, "maint"))
+                continue
 
-            if unpaid_cash_maintenance:
-                base_needs = g.current_share(
-                    base.maintenance[cash], time_of_day, secs_passed
+        if unpaid_cash_maintenance:
+            base_needs = g.current_share(
+                base.maintenance[cash], time_of_day, secs_passed
+            )
+            if base_needs:
+                unpaid_cash_maintenance = max(
+                    0, unpaid_cash_maintenance - base_needs
                 )
-                if base_needs:
-                    unpaid_cash_maintenance = max(
-                        0, unpaid_cash_maintenance - base_needs
-                    )
-                    # Chance of base destruction if cash-unmaintained: 1.5%
-                    if not dead and chance.roll_interval(0.015, secs_passed):
-                        dead_bases.append((base, "maint"))
-                        dead = True
-
-        # Discoveries
-        if not (grace or dead or base.has_grace()):
-            detected_by = _check_base_detection(base, secs_passed)
-            if detected_by:
-                dead_bases.append((base, detected_by))
+                # Chance of base destruction if cash-unmaintained: 1.5%
+                if chance.roll_interval(0.015, secs_passed):
+                    dead_bases.append((base, "maint"))
 
     return dead_bases
 
 
+def _roll_base_detections(bases, secs_passed):
+    """Roll the discovery of the given bases by all groups at once
+
+    Each (base, group) pair is a Poisson process, so together they form a
+    single Poisson process whose rate is the sum of all their rates.  That
+    process is rolled once; only when it fires is the victim picked
+    (weighted by rate) and the rest of the interval rolled again without
+    the discovered base.  The chance of each base being discovered is the
+    same as rolling every base against every group (_check_base_detection).
+
+    Returns a list of (base, group_id) pairs."""
+    if not bases or secs_passed <= 0:
+        return []
+
+    groups = list(g.pl.groups)
+    rates = array(
+        [
+            [detect_chance.get(group, 0) for group in groups]
+            for detect_chance in (base.get_detect_chance() for base in bases)
+        ],
+        float64,
+    )
+    if g.debug:  # pragma: no cover
+        print("Total chance of discovery: %s" % repr(rates.sum(axis=0)))
+
+    detected = []
+    remaining = secs_passed
+    total_rate = rates.sum()
+    while total_rate > 0:
+        next_time = chance.roll_next_time(total_rate / 10000.0)
+        if next_time > remaining:
+            break
+        remaining -= next_time
+
+        cumulative_rates = rates.ravel().cumsum()
+        index = int(
+            cumulative_rates.searchsorted(
+                random.random() * cumulative_rates[-1], side="right"
+            )
+        )
+        base_index, group_index = divmod(index, len(groups))
+        detected.append((bases[base_index], groups[group_index]))
+
+        # A base can only be discovered once.
+        rates[base_index] = 0
+        total_rate = rates.sum()
+
+    return detected
+
+
+# Rolls a single base against every group.  This is the per-base version of
+# _roll_base_detections and is kept as its reference.
 def _check_base_detection(base, secs_passed):
     detect_chance = base.get_detect_chance()
     if g.debug:  # pragma: no cover
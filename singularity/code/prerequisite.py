@@ -23,29 +23,94 @@ from __future__ import absolute_import
 from singularity.code import g
 
 
+# Bit of each tech in the researched-tech masks (see index_techs).
+_tech_bits = {}
+# Bumped whenever the bits are reassigned, invalidating compiled masks.
+tech_index_version = 0
+
+
+def index_techs(tech_ids):
+    """Assign a bit to each tech; called when the techs are (re)loaded."""
+    global _tech_bits, tech_index_version
+    _tech_bits = {tech_id: 1 << index for index, tech_id in enumerate(tech_ids)}
+    tech_index_version += 1
+
+
+def tech_bit(tech_id):
+    return _tech_bits.get(tech_id, 0)
+
+
+def tech_mask(tech_ids):
+    mask = 0
+    for tech_id in tech_ids:
+        mask |= _tech_bits.get(tech_id, 0)
+    return mask
+
+
 class Prerequisite(object):
     def __init__(self, prerequisites):
         self.prerequisites = prerequisites
 
-    def available(self):
-        or_mode = False
+    @property
+    def prerequisites(self):
+        return self._prerequisites
+
+    @prerequisites.setter
+    def prerequisites(self, value):
+        self._prerequisites = value
+        # (tech index version, all mask, any masks) - see compile_masks
+        self._compiled = None
+        # (researched mask, available) - see available
+        self._available_memo = None
+
+    def compile_masks(self):
+        """Compile the prerequisites into masks over the tech bits.
+
+        Returns (all_mask, any_masks): the prerequisites are met if all the
+        techs in all_mask and at least one tech of each of any_masks are
+        researched.  A tech which is not known can never be researched, so
+        it drops out of its OR clause (and makes a lone one impossible).
+        all_mask is None if the prerequisites can never be met.
+        """
         assert type(self.prerequisites) == list
-        for index, prerequisite in enumerate(self.prerequisites):
-            if prerequisite == "impossible":
-                assert len(self.prerequisites) == 1
-                return False
-            if prerequisite == "OR":
-                assert index == 0
-                or_mode = True
-            if prerequisite in g.pl.techs and g.pl.techs[prerequisite].done:
-                if or_mode:
-                    return True
+        cnf = self.prerequisites_in_cnf_format()
+        if cnf is None:
+            return None, ()
+
+        all_mask = 0
+        any_masks = []
+        for disjunction in cnf:
+            mask = tech_mask(disjunction)
+            if not mask:
+                return None, ()
+            if len(disjunction) == 1:
+                all_mask |= mask
             else:
-                if not or_mode:
-                    return False
-        # If we're not in OR mode, we met all our prerequisites.  If we are, we
-        # didn't meet any of the OR prerequisites.
-        return not or_mode
+                any_masks.append(mask)
+        return all_mask, tuple(any_masks)
+
+    def available(self):
+        researched = g.pl.researched_techs
+        memo = self._available_memo
+        if (
+            memo is not None
+            and memo[0] == researched
+            and self._compiled[0] == tech_index_version
+        ):
+            return memo[1]
+
+        if self._compiled is None or self._compiled[0] != tech_index_version:
+            self._compiled = (tech_index_version,) + self.compile_masks()
+        _, all_mask, any_masks = self._compiled
+
+        if all_mask is None:
+            result = False
+        else:
+            result = researched & all_mask == all_mask and all(
+                researched & mask for mask in any_masks
+            )
+        self._available_memo = (researched, result)
+        return result
 
     def prerequisites_in_cnf_format(self):
         """Transform the Prerequisites into Conjunctive Normal Form (CNF)
@@ -0,0 +1,120 @@
+# file: profiler.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains the Profiler class, which times the phases of the game
+# tick (see --profile-sim).
+
+from __future__ import absolute_import
+
+import json
+import sys
+from time import perf_counter_ns
+
+from singularity.code.stats import counter
+
+# The enabled Profiler, or None.  The instrumented code reads this once per
+# call and only touches the profiler if it is set, so profiling costs next to
+# nothing while it is disabled.
+active = None
+
+
+class Phase(object):
+    """The number of times a phase ran and the total time spent in it.
+
+    Both are transient statistics ("profile.<name>.calls" and
+    "profile.<name>.ns"), so they are reset with a new game and are not saved.
+    """
+
+    __slots__ = ("name", "calls", "total_ns")
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = counter("profile.%s.calls" % name)
+        self.total_ns = counter("profile.%s.ns" % name)
+
+
+class Profiler(object):
+    """Accumulates the time spent in named phases.
+
+    The instrumented code takes a timestamp with start() and then calls lap()
+    at the end of each phase, which records the time since the previous
+    timestamp and returns the new one:
+
+        prof = profiler.active
+        if prof:
+            t = start = prof.start()
+        ...
+        if prof:
+            t = prof.lap("give_time.income", t)
+        ...
+        if prof:
+            prof.lap("give_time", start)
+
+    Phases may nest (e.g. recalc_cpu is called during give_time), in which
+    case the time is counted in the inner and the outer phase.
+    """
+
+    def __init__(self):
+        self._phases = {}
+
+    def start(self):
+        return perf_counter_ns()
+
+    def lap(self, name, since):
+        now = perf_counter_ns()
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = Phase(name)
+        phase.calls.value += 1
+        phase.total_ns.value += now - since
+        return now
+
+    def results(self):
+        """{phase name: {"calls": N, "total_ns": N}} of the phases seen."""
+        return {
+            name: {"calls": phase.calls.value, "total_ns": phase.total_ns.value}
+            for name, phase in self._phases.items()
+        }
+
+    def dump(self, fd):
+        json.dump(self.results(), fd, indent=2, sort_keys=True)
+        fd.write("\n")
+
+
+def enable():
+    """Start profiling, keeping the phases seen so far if already enabled."""
+    global active
+    if active is None:
+        active = Profiler()
+    return active
+
+
+def disable():
+    global active
+    active = None
+
+
+def dump_to_path(path):
+    """Write the results of the active profiler as JSON ("-" for stdout)."""
+    if active is None:
+        return
+    if path == "-":
+        active.dump(sys.stdout)
+    else:
+        with open(path, "w", encoding="utf-8") as fd:
+            active.dump(fd)
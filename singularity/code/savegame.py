@@ -24,20 +24,22 @@ import codecs
 import operator
 import re
 import time
+import types
 import pickle
 import collections
 import gzip
 import json
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Optional
 
 import numpy
-from numpy import array, int64
 
 from io import open, BytesIO
 import base64
 
-from singularity.code import g, dirs, player, group, logmessage
+from singularity.code import g, dirs, player, group, logmessage, jsonstream, columnar
 from singularity.code import (
     base,
     tech,
@@ -48,7 +50,8 @@ from singularity.code import (
     difficulty,
     effect,
 )
-from singularity.code.stats import itself as stats
+from singularity.code.buyable import Cost
+from singularity.code.stats import itself as stats, flush_observed
 
 QUICKSAVE_NAME = "quicksave"
 AUTOSAVE_NAME = "autosave"
@@ -125,6 +128,23 @@ current_save_format = max(
 )
 current_save_version = current_save_format.magic_value
 
+# The same savegame data stored column-wise (.s2b files, see columnar.py).
+# These versions are only valid for columnar savegames, so they are kept
+# apart from savefile_translation.  Keep the internal_version in sync with
+# current_save_format.
+current_columnar_format = SavegameFormatDefinition(
+    101, "1.00", "singularity_savefile_101_columnar"
+)
+columnar_savefile_translation = {
+    current_columnar_format.magic_value: current_columnar_format
+}
+
+SAVEGAME_EXTENSION = ".s2"
+COLUMNAR_SAVEGAME_EXTENSION = ".s2b"
+
+# Whether new savegames are written in the columnar format (--columnar-saves)
+columnar_saves = False
+
 _Savegame = collections.namedtuple(
     "_Savegame",
     ["name", "filepath", "savegame_format", "headers", "load_file", "mtime"],
@@ -146,6 +166,11 @@ class Savegame(_Savegame):
     def is_special_save(self) -> bool:
         return self.name in (QUICKSAVE_NAME, AUTOSAVE_NAME)
 
+    @property
+    def summary(self):
+        """See savegame_summary"""
+        return savegame_summary(self.headers)
+
 
 def convert_string_to_path_name(name):
     # Some filesystems require unicode (e.g. Windows) whereas Linux needs bytes.
@@ -170,10 +195,84 @@ def unpickle_instance(fd, find_globals):
     return RestrictedUnpickler(fd, encoding="bytes")
 
 
+# The index of the savegame headers, in the writable saves directory (see
+# get_savegames).  Bump SAVEGAME_INDEX_VERSION when the entries change.
+SAVEGAME_INDEX_NAME = ".index.json"
+SAVEGAME_INDEX_VERSION = 1
+
+
+def _savegame_file_kind(file_name):
+    """(name, header parser, loader, versions) for a savegame file_name, or
+    None.  The versions are the savefile_translation of that kind of file."""
+    if file_name.endswith(".sav"):
+        return (
+            file_name[:-4],
+            parse_pickle_savegame_headers,
+            load_savegame_by_pickle,
+            savefile_translation,
+        )
+    elif file_name.endswith(".s2"):
+        return (
+            file_name[:-3],
+            parse_json_savegame_headers,
+            load_savegame_by_json,
+            savefile_translation,
+        )
+    elif file_name.endswith(".s2b"):
+        return (
+            file_name[:-4],
+            parse_json_savegame_headers,
+            load_savegame_by_columnar,
+            columnar_savefile_translation,
+        )
+    return None
+
+
+def _parse_savegame_file(filepath, parse_headers, versions):
+    """The index entry of the savegame at filepath: its version line (None
+    if not one of versions) and headers."""
+    try:
+        with open(filepath, "rb") as loadfile:
+            version_line, headers = parse_headers(loadfile)
+    except Exception:
+        return {"version": None, "headers": {}}
+    if version_line not in versions:
+        version_line = None
+    return {"version": version_line, "headers": headers}
+
+
+def _read_savegame_index(index_path):
+    try:
+        with open(index_path, "r", encoding="utf-8") as fd:
+            index = json.load(fd)
+        if index.get("version") == SAVEGAME_INDEX_VERSION:
+            return index["savegames"]
+    except Exception:
+        pass
+    return {}
+
+
+def _write_savegame_index(index_path, entries):
+    index = {"version": SAVEGAME_INDEX_VERSION, "savegames": entries}
+    try:
+        _write_file_atomically(
+            index_path, lambda fd: fd.write(json.dumps(index).encode("utf-8"))
+        )
+    except Exception:
+        # The index is only a cache.
+        pass
+
+
 def get_savegames():
+    """All savegames in the saves directories.
+
+    The version and headers of each savegame file are kept in an index
+    (SAVEGAME_INDEX_NAME), so only the files added or changed (by size or
+    modification time) since the last call are opened.  Those are parsed in
+    a thread pool."""
     all_dirs = dirs.get_read_dirs("saves")
 
-    all_savegames = []
+    found = []
     for saves_dir in all_dirs:
         try:
             all_files = os.listdir(saves_dir)
@@ -184,39 +283,59 @@ def get_savegames():
             if file_name[0] == ".":
                 continue
 
-            if file_name.endswith(".sav"):
-                name = file_name[:-4]
-                parse_headers = parse_pickle_savegame_headers
-                load_file = load_savegame_by_pickle
-            elif file_name.endswith(".s2"):
-                name = file_name[:-3]
-                parse_headers = parse_json_savegame_headers
-                load_file = load_savegame_by_json
-            else:
+            kind = _savegame_file_kind(file_name)
+            if kind is None:
                 # Unknown extension; ignore
                 continue
 
             filepath = os.path.join(saves_dir, file_name)
-            version_format = None  # None == Unknown version
-
             try:
-                with open(filepath, "rb") as loadfile:
-                    version_line, headers = parse_headers(loadfile)
-
-                    if version_line in savefile_translation:
-                        version_format = savefile_translation[version_line]
-            except Exception:
-                version_format = None  # To be sure.
-
-            savegame = Savegame(
-                convert_path_name_to_str(name),
-                filepath,
-                version_format,
-                headers,
-                load_file,
-                os.stat(filepath).st_mtime,
+                file_stat = os.stat(filepath)
+            except OSError:
+                continue
+            found.append((filepath, kind, file_stat))
+
+    index_path = dirs.get_writable_file_in_dirs(SAVEGAME_INDEX_NAME, "saves")
+    old_entries = _read_savegame_index(index_path) if index_path else {}
+    entries = {}
+    stale = []
+    for filepath, (name, parse_headers, load_file, versions), file_stat in found:
+        entry = old_entries.get(filepath)
+        if (
+            entry is not None
+            and entry["size"] == file_stat.st_size
+            and entry["mtime_ns"] == file_stat.st_mtime_ns
+        ):
+            entries[filepath] = entry
+        else:
+            stale.append((filepath, parse_headers, versions, file_stat))
+
+    if stale:
+        with ThreadPoolExecutor(thread_name_prefix="savegames") as executor:
+            filepaths, parsers, file_versions, file_stats = zip(*stale)
+            parsed = executor.map(
+                _parse_savegame_file, filepaths, parsers, file_versions
             )
-            all_savegames.append(savegame)
+            for filepath, file_stat, entry in zip(filepaths, file_stats, parsed):
+                entry["size"] = file_stat.st_size
+                entry["mtime_ns"] = file_stat.st_mtime_ns
+                entries[filepath] = entry
+
+    if index_path and entries != old_entries:
+        _write_savegame_index(index_path, entries)
+
+    all_savegames = []
+    for filepath, (name, parse_headers, load_file, versions), file_stat in found:
+        entry = entries[filepath]
+        savegame = Savegame(
+            convert_path_name_to_str(name),
+            filepath,
+            versions.get(entry["version"]),
+            entry["headers"],
+            load_file,
+            file_stat.st_mtime,
+        )
+        all_savegames.append(savegame)
 
     return all_savegames
 
@@ -246,6 +365,55 @@ def parse_pickle_savegame_headers(fd):
     return load_version, {}
 
 
+# The version of the summary in the headers of the JSON and columnar
+# savegames ("summary=N" followed by "summary_<field>=..." lines).  Newer
+# versions may only add fields, so older readers still understand them.
+SAVEGAME_SUMMARY_VERSION = 1
+
+
+def savegame_summary(headers):
+    """The summary of a savegame from its headers, or None if the savegame
+    has none (e.g. it was made by an older version).
+
+    The summary is a dict with the day, cash, bases (the number of bases),
+    difficulty (its id) and apotheosis (a bool) of the saved game."""
+    if not headers:
+        return None
+    try:
+        if int(headers.get("summary", 0)) < 1:
+            return None
+        return {
+            "day": int(headers["summary_day"]),
+            "cash": int(headers["summary_cash"]),
+            "bases": int(headers["summary_bases"]),
+            "difficulty": headers["difficulty"],
+            "apotheosis": headers["summary_apotheosis"] == "1",
+        }
+    except (KeyError, ValueError):
+        return None
+
+
+def read_savegame_summary(filepath):
+    """The savegame_summary of the savegame at filepath.
+
+    Only the headers at the start of the file are read."""
+    if filepath.endswith(".s2"):
+        versions = savefile_translation
+    elif filepath.endswith(".s2b"):
+        versions = columnar_savefile_translation
+    else:
+        # Pickled (.sav) savegames have no summary.
+        return None
+    try:
+        with open(filepath, "rb") as fd:
+            version_line, headers = parse_json_savegame_headers(fd)
+    except Exception:
+        return None
+    if version_line not in versions:
+        return None
+    return savegame_summary(headers)
+
+
 def parse_json_savegame_headers(fd):
     version_line = fd.readline().decode("utf-8").strip()
     headers = {}
@@ -332,9 +500,57 @@ def recursive_fix_pickle(the_object, seen):
         (recursive_fix_pickle(k, seen=seen), recursive_fix_pickle(v, seen=seen))
         for k, v in the_object.__dict__.items()
     )
+    _move_legacy_slots(the_object)
     return the_object
 
 
+_legacy_classes = {}
+
+
+def _legacy_class(cls):
+    """A dict-backed subclass of the slotted model class cls.
+
+    Old pickled savegames restore the object state into __dict__ and the
+    conversion code below reads and edits it there, so the pickle loader
+    creates instances of this subclass instead of cls.
+    """
+    try:
+        return _legacy_classes[cls]
+    except KeyError:
+        legacy_cls = type(cls.__name__, (cls,), {"__module__": cls.__module__})
+        _legacy_classes[cls] = legacy_cls
+        return legacy_cls
+
+
+# The slots of the model classes that were renamed since the pickles.
+_renamed_legacy_slots = {"cost_left": "_cost_left"}
+
+
+def _move_legacy_slots(obj):
+    """Move the __dict__ entries of a legacy object that are slots of its
+    model class into those slots (where the model code looks for them)."""
+    cls = type(obj)
+    if cls not in _legacy_classes.values():
+        return
+    for key in list(obj.__dict__):
+        slot = getattr(cls, _renamed_legacy_slots.get(key, key), None)
+        if isinstance(slot, types.MemberDescriptorType):
+            slot.__set__(obj, obj.__dict__.pop(key))
+
+
+def _from_legacy(obj):
+    """Copy a legacy object into an instance of its slotted model class."""
+    if type(obj) not in _legacy_classes.values():
+        return obj
+    cls = type(obj).__base__
+    new_obj = cls.__new__(cls)
+    for klass in cls.__mro__:
+        for slot in getattr(klass, "__slots__", ()):
+            if hasattr(obj, slot):
+                setattr(new_obj, slot, getattr(obj, slot))
+    return new_obj
+
+
 def load_savegame(savegame: Savegame):
     global last_savegame_name
 
@@ -370,16 +586,31 @@ def finally_load_savegame():
     g.internal_id_version = None
 
 
-def load_savegame_by_json(fd):
+def _parse_json_headers_for_load(fd, versions, other_versions):
     load_version_string, headers = parse_json_savegame_headers(fd)
-    if load_version_string not in savefile_translation:
+    if load_version_string in other_versions:
+        raise ValueError(
+            "Savegame is in the %s format, not the %s format"
+            % (_format_name(other_versions), _format_name(versions))
+        )
+    if load_version_string not in versions:
         raise SavegameVersionException(load_version_string)
 
-    load_version = savefile_translation[load_version_string].internal_version
-    difficulty_id = headers["difficulty"]
+    load_version = versions[load_version_string].internal_version
     game_time = int(headers["game_time"])
     if game_time < 0:
         raise ValueError("Corrupt save; game time is before game start")
+    return load_version, headers["difficulty"], game_time
+
+
+def _format_name(versions):
+    return "columnar" if versions is columnar_savefile_translation else "JSON"
+
+
+def load_savegame_by_json(fd):
+    load_version, difficulty_id, game_time = _parse_json_headers_for_load(
+        fd, savefile_translation, columnar_savefile_translation
+    )
     next_byte = fd.peek(1)[0]
     if next_byte == b"{"[0]:
         game_data = json.load(fd)
@@ -409,6 +640,18 @@ def load_savegame_by_json(fd):
             game_data["player"][key] = game_data[key]
             del game_data[key]
 
+    _load_game_data(difficulty_id, game_time, game_data, load_version)
+
+
+def load_savegame_by_columnar(fd):
+    load_version, difficulty_id, game_time = _parse_json_headers_for_load(
+        fd, columnar_savefile_translation, savefile_translation
+    )
+    game_data = columnar.load(fd)
+    _load_game_data(difficulty_id, game_time, game_data, load_version)
+
+
+def _load_game_data(difficulty_id, game_time, game_data, load_version):
     # Pause game when loading
     g.curr_speed = 0
     pl_data = game_data["player"]
@@ -418,6 +661,8 @@ def load_savegame_by_json(fd):
     if "stats" in game_data:
         stats.reset()
         stats.deserialize_obj(game_data["stats"], load_version)
+    if "history" in game_data:
+        stats.history.deserialize_obj(game_data["history"], load_version)
 
 
 def load_savegame_by_pickle(loadfile):
@@ -442,35 +687,35 @@ def load_savegame_by_pickle(loadfile):
             list=list,
             encode=_codecs.encode,
             LocationSpec=location.LocationSpec,
-            Location=location.Location,
-            Tech=tech.Tech,
+            Location=_legacy_class(location.Location),
+            Tech=_legacy_class(tech.Tech),
             TechSpec=tech.TechSpec,
-            event_class=event.Event,
+            event_class=_legacy_class(event.Event),
             EventSpec=event.EventSpec,
-            Event=event.Event,
-            group=group.Group,
-            Group=group.Group,
+            Event=_legacy_class(event.Event),
+            group=_legacy_class(group.Group),
+            Group=_legacy_class(group.Group),
             GroupClass=group.GroupSpec,
             GroupSpec=group.GroupSpec,
             Buyable_Class=buyable.BuyableSpec,
             BuyableClass=buyable.BuyableSpec,
             BuyableSpec=buyable.BuyableSpec,
-            Buyable=buyable.Buyable,
-            Base=base.Base,
+            Buyable=_legacy_class(buyable.Buyable),
+            Base=_legacy_class(base.Base),
             Base_Class=base.BaseSpec,
             BaseClass=base.BaseSpec,
             BaseSpec=base.BaseSpec,
-            Item=item.Item,
+            Item=_legacy_class(item.Item),
             Item_Class=item.ItemSpec,
             ItemClass=item.ItemSpec,
             ItemSpec=item.ItemSpec,
             ItemType=item.ItemType,
-            LogEmittedEvent=logmessage.LogEmittedEvent,
-            LogResearchedTech=logmessage.LogResearchedTech,
-            LogBaseLostMaintenance=logmessage.LogBaseLostMaintenance,
-            LogBaseDiscovered=logmessage.LogBaseDiscovered,
-            LogBaseConstructed=logmessage.LogBaseConstructed,
-            LogItemConstructionComplete=logmessage.LogItemConstructionComplete,
+            LogEmittedEvent=_legacy_class(logmessage.LogEmittedEvent),
+            LogResearchedTech=_legacy_class(logmessage.LogResearchedTech),
+            LogBaseLostMaintenance=_legacy_class(logmessage.LogBaseLostMaintenance),
+            LogBaseDiscovered=_legacy_class(logmessage.LogBaseDiscovered),
+            LogBaseConstructed=_legacy_class(logmessage.LogBaseConstructed),
+            LogItemConstructionComplete=_legacy_class(logmessage.LogItemConstructionComplete),
             _reconstruct=numpy.core.multiarray._reconstruct,
             scalar=numpy.core.multiarray.scalar,
             ndarray=numpy.ndarray,
@@ -536,6 +781,9 @@ def load_savegame_by_pickle(loadfile):
         for option in options:
             if option in obj.__dict__:
                 return obj.__dict__[option]
+            if isinstance(getattr(type(obj), option, None), types.MemberDescriptorType):
+                if hasattr(obj, option):
+                    return getattr(obj, option)
         if "default_value" in kwargs:
             return kwargs["default_value"]
         raise KeyError(str(options))
@@ -554,7 +802,10 @@ def load_savegame_by_pickle(loadfile):
         ),
         "had_grace": saved_player.had_grace,
         "groups": [
-            {"id": grp_id, "suspicion": grp.suspicion}
+            {
+                "id": grp_id,
+                "suspicion": _find_attribute(grp, ["_suspicion", "suspicion"]),
+            }
             for grp_id, grp in saved_player.groups.items()
         ],
         "events": [],
@@ -656,9 +907,10 @@ def _convert_location(loc, old_version):
 
 
 def _convert_buyable(buyable, save_version):
+    # Old pickles stored the costs as lists or numpy arrays.
+    buyable.cost_left = Cost(*buyable.cost_left)
+    buyable.total_cost = Cost(*buyable.total_cost)
     if save_version < 4.91:  # r5_pre
-        buyable.cost_left = array(buyable.cost_left, int64)
-        buyable.total_cost = array(buyable.total_cost, int64)
         buyable.count = 1
     elif buyable.count < 1:
         # Old corrupt (?) savegames sometimes have a count of 0.  Not
@@ -676,6 +928,8 @@ def _convert_buyable(buyable, save_version):
 
 def _convert_base(base, save_version):
     base = _convert_buyable(base, save_version)
+    if "maintenance" in base.__dict__:
+        base.maintenance = Cost(*base.maintenance)
 
     if save_version < 99.3:  # < 1.0 (dev)
         # We needs to do it first because of property base.cpus
@@ -738,7 +992,9 @@ def _convert_tech(tech, save_version):
 
 
 def _convert_log_entry(entry):
-    if not isinstance(entry, logmessage.AbstractLogMessage):
+    if isinstance(entry, logmessage.AbstractLogMessage):
+        entry = _from_legacy(entry)
+    else:
         log_time, log_name, log_data = entry
         time_raw = (
             log_time[0] * g.seconds_per_day
@@ -767,13 +1023,20 @@ def _convert_log_entry(entry):
     return entry
 
 
-def savegame_exists(savegame_name):
-    save_path = dirs.get_writable_file_in_dirs(savegame_name + ".s2", "saves")
+def _savegame_extension():
+    return COLUMNAR_SAVEGAME_EXTENSION if columnar_saves else SAVEGAME_EXTENSION
 
-    if save_path is None or not os.path.isfile(convert_string_to_path_name(save_path)):
-        return False
 
-    return True
+def savegame_exists(savegame_name):
+    """Whether a savegame of that name exists, in either format."""
+    for extension in (SAVEGAME_EXTENSION, COLUMNAR_SAVEGAME_EXTENSION):
+        save_path = dirs.get_writable_file_in_dirs(savegame_name + extension, "saves")
+        if save_path is not None and os.path.isfile(
+            convert_string_to_path_name(save_path)
+        ):
+            return True
+
+    return False
 
 
 def check_filename_illegal(directory, filename, extension):
@@ -823,48 +1086,239 @@ def check_filename_illegal(directory, filename, extension):
     return None
 
 
+class AutosaveStatus(object):
+    """The state of the autosaves written in the background (see auto_save).
+
+    pending is the number of autosaves not written yet, last_saved_time the
+    game time (raw_sec) of the last autosave written and error the message
+    of the last failed autosave until the UI takes it (see take_error).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.last_saved_time = None
+        self.error = None
+
+    def _started(self):
+        with self._lock:
+            self.pending += 1
+
+    def _finished(self, game_time, error=None):
+        with self._lock:
+            self.pending -= 1
+            if error is None:
+                self.last_saved_time = game_time
+            else:
+                self.error = error
+
+    def take_error(self):
+        """The message of the last failed autosave (once), or None."""
+        with self._lock:
+            error, self.error = self.error, None
+        return error
+
+
+autosave_status = AutosaveStatus()
+
+# The autosaves are written one at a time, in the order they were made.
+_autosave_executor = None
+
+
+def _get_autosave_executor():
+    global _autosave_executor
+    if _autosave_executor is None:
+        _autosave_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="autosave"
+        )
+    return _autosave_executor
+
+
 def auto_save():
-    create_savegame(AUTOSAVE_NAME)
+    """Save the game as the autosave without blocking the game.
+
+    Only the snapshot of the game is taken here; it is compressed and
+    written by a worker thread.  Returns the Future of the write."""
+    return write_snapshot_in_background(
+        _savegame_path(AUTOSAVE_NAME),
+        snapshot_game(),
+        not g.debug,
+        columnar_format=columnar_saves,
+    )
+
+
+def write_snapshot_in_background(path, snapshot, gzipped=True, columnar_format=False):
+    """Write a snapshot_game() to path in the autosave worker thread.
+
+    The outcome is recorded in autosave_status.  If no thread can be started,
+    the snapshot is written right away.  Returns the Future of the write."""
+    game_time = int(dict(snapshot[0])["game_time"])
+
+    def write():
+        try:
+            _write_file_atomically(
+                path,
+                lambda fd: write_snapshot_to_fd(fd, snapshot, gzipped, columnar_format),
+            )
+            _remove_other_format(path)
+        except Exception as e:
+            autosave_status._finished(game_time, str(e) or e.__class__.__name__)
+            raise
+        autosave_status._finished(game_time)
+
+    autosave_status._started()
+    try:
+        return _get_autosave_executor().submit(write)
+    except RuntimeError:
+        # E.g. while the interpreter shuts down.
+        future = Future()
+        try:
+            write()
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(None)
+        return future
+
+
+def _savegame_path(savegame_name):
+    return convert_string_to_path_name(
+        dirs.get_writable_file_in_dirs(savegame_name + _savegame_extension(), "saves")
+    )
+
+
+def _remove_other_format(path):
+    # A savegame is overwritten by saving it in the other format too: remove
+    # the old file so the name is not listed twice.
+    path = os.fsdecode(path)
+    if path.endswith(COLUMNAR_SAVEGAME_EXTENSION):
+        other_path = path[: -len(COLUMNAR_SAVEGAME_EXTENSION)] + SAVEGAME_EXTENSION
+    elif path.endswith(SAVEGAME_EXTENSION):
+        other_path = path[: -len(SAVEGAME_EXTENSION)] + COLUMNAR_SAVEGAME_EXTENSION
+    else:
+        return
+    try:
+        os.remove(other_path)
+    except FileNotFoundError:
+        pass
+
+
+def _write_file_atomically(path, write_func):
+    # Write to a hidden file next to path (ignored by get_savegames) and
+    # replace path with it once complete, so a crash or error while writing
+    # never leaves a truncated savegame behind.
+    path = os.fsdecode(path)
+    directory, filename = os.path.split(path)
+    temp_path = os.path.join(directory, "." + filename + ".tmp")
+    try:
+        with open(temp_path, "wb") as fd:
+            write_func(fd)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
 
 
 def create_savegame(savegame_name):
     global last_savegame_name
     if savegame_name not in (QUICKSAVE_NAME, AUTOSAVE_NAME):
         last_savegame_name = savegame_name
-    save_loc = convert_string_to_path_name(
-        dirs.get_writable_file_in_dirs(savegame_name + ".s2", "saves")
+    save_loc = _savegame_path(savegame_name)
+    # Save in new "JSONish" format (or the columnar one)
+    gzipped = not g.debug
+    _write_file_atomically(
+        save_loc,
+        lambda fd: write_game_to_fd(
+            fd, gzipped=gzipped, columnar_format=columnar_saves
+        ),
     )
-    # Save in new "JSONish" format
-    with open(save_loc, "wb") as savefile:
-        gzipped = not g.debug
-        write_game_to_fd(savefile, gzipped=gzipped)
+    _remove_other_format(save_loc)
 
 
-def write_game_to_fd(fd, gzipped=True):
-    version_line = "%s\n" % current_save_version
-    fd.write(version_line.encode("utf-8"))
-    headers = [
+def _game_headers():
+    return [
         ("difficulty", g.pl.difficulty.id),
         ("game_time", str(g.pl.raw_sec)),
         ("time", str(time.time())),
+    ] + _summary_headers()
+
+
+def _summary_headers():
+    pl = g.pl
+    return [
+        ("summary", str(SAVEGAME_SUMMARY_VERSION)),
+        ("summary_day", str(pl.time_day)),
+        ("summary_cash", str(pl.cash)),
+        ("summary_bases", str(len(pl.base_registry))),
+        ("summary_apotheosis", "1" if pl.apotheosis else "0"),
     ]
+
+
+def _write_headers(fd, headers, version=current_save_version):
+    version_line = "%s\n" % version
+    fd.write(version_line.encode("utf-8"))
     for k, v in headers:
         kw_str = "%s=%s\n" % (k, v)
         fd.write(kw_str.encode("utf-8"))
     fd.write(b"\n")
-    game_data = {
-        "player": g.pl.serialize_obj(),
-        "stats": stats.serialize_obj(),
-    }
+
+
+def _write_game_data(fd, game_data, gzipped):
     json2binary = codecs.getwriter("utf-8")
     if gzipped:
         with gzip.GzipFile(filename="", mode="wb", fileobj=fd) as gzip_fd, json2binary(
             gzip_fd
         ) as json_fd:
-            json.dump(game_data, json_fd)
+            jsonstream.dump(game_data, json_fd)
     else:
         with json2binary(fd) as json_fd:
-            json.dump(game_data, json_fd)
+            jsonstream.dump(game_data, json_fd)
+
+
+def write_game_to_fd(fd, gzipped=True, columnar_format=False):
+    if columnar_format:
+        # The tables are built from the complete data anyway.
+        write_snapshot_to_fd(fd, snapshot_game(), gzipped, columnar_format=True)
+        return
+    _write_headers(fd, _game_headers())
+    # The tick batches some statistics; make sure they are all saved.
+    flush_observed(g.pl)
+    # The bases, log entries etc. are serialized while being written.
+    game_data = {
+        "player": g.pl.serialize_obj(serialize_list=jsonstream.streamed_list),
+        "stats": stats.serialize_obj(),
+        "history": stats.history.serialize_obj(),
+    }
+    _write_game_data(fd, game_data, gzipped)
+
+
+def snapshot_game():
+    """The current game as (headers, game data) of plain data.
+
+    Unlike write_game_to_fd, everything is serialized up front, so the
+    snapshot does not change with the game and can be written later (and in
+    another thread) with write_snapshot_to_fd."""
+    headers = _game_headers()
+    flush_observed(g.pl)
+    game_data = {
+        "player": g.pl.serialize_obj(),
+        "stats": stats.serialize_obj(),
+        "history": stats.history.serialize_obj(),
+    }
+    return headers, game_data
+
+
+def write_snapshot_to_fd(fd, snapshot, gzipped=True, columnar_format=False):
+    headers, game_data = snapshot
+    if columnar_format:
+        _write_headers(fd, headers, current_columnar_format.magic_value)
+        columnar.dump(game_data, fd, gzipped)
+    else:
+        _write_headers(fd, headers)
+        _write_game_data(fd, game_data, gzipped)
 
 
 class SavegameVersionException(Exception):
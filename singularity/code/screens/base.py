@@ -565,6 +565,7 @@ class BaseScreen(dialog.Dialog):
             old_item = self.base.items[type.id]
             if old_item is None or old_item.spec != item_type:
                 self.base.items[type.id] = item.Item(item_type, base=self.base)
+                g.pl.track_construction(self.base.items[type.id])
                 self.base.check_power()
 
         self.base.recalc_cpu()
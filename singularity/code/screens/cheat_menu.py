@@ -20,9 +20,8 @@
 import operator
 from collections.abc import Mapping
 
-from numpy import array
-
 from singularity.code import difficulty, g
+from singularity.code.buyable import Cost
 from singularity.code.graphics import dialog, constants, button, text
 from singularity.code.location import Location
 
@@ -251,7 +250,7 @@ class CheatMenuDialog(dialog.SimpleMenuDialog):
     def inspiration(self):
         for task, cpu in g.pl.get_cpu_allocations():
             if task in g.pl.techs:
-                g.pl.techs[task].cost_left = array((0, 0, 0))
+                g.pl.techs[task].cost_left = Cost()
         self._map_screen.needs_rebuild = True
 
     def end_construction(self):
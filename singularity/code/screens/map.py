@@ -24,7 +24,7 @@ from __future__ import absolute_import
 import pygame
 
 from singularity.code import g, dirs, savegame as sv, mixer
-from singularity.code import chance, logmessage, warning
+from singularity.code import chance, logmessage, sim, warning
 from singularity.code.graphics import g as gg
 from singularity.code.graphics import dialog, constants, image, button, text, widget
 from singularity.code.screens import research, knowledge, report, log, message, savegame
@@ -585,6 +585,7 @@ class MapScreen(dialog.Dialog):
 
         self.messages = message.MessageDialogs(self)
         self.needs_warning = True
+        self.driver = sim.RealTimeDriver()
 
         self.add_key_handler(pygame.K_ESCAPE, self.got_escape)
 
@@ -727,8 +728,6 @@ https://github.com/singularity/singularity
                 self.visible = False
                 return
 
-    leftovers = 1
-
     async def on_tick(self, event):
         old_speed = g.curr_speed
 
@@ -744,22 +743,27 @@ https://github.com/singularity/singularity
 
         mins_passed = 0
 
-        if g.curr_speed != 0:
-            self.leftovers += g.curr_speed / float(gg.FPS)
-            if self.leftovers < 1:
+        if g.curr_speed == 0:
+            self.driver.reset()
+        else:
+            # Run as much game time as fits in this frame.
+            secs_passed, mins_passed = await self.driver.advance(g.pl, g.curr_speed)
+            if not secs_passed:
                 return
 
             self.needs_rebuild = True
 
-            secs = int(self.leftovers)
-            self.leftovers %= 1
-
-            # Run this tick.
-            mins_passed = await g.pl.give_time(secs)
-
             # Display any message stacked.
             await self.messages.show_list(logmessage.AbstractLogMessage, g.pl.curr_log)
 
+        # Autosaves are written in the background; report any failure.
+        autosave_error = sv.autosave_status.take_error()
+        if autosave_error:
+            await self.show_message(
+                _("The game could not be autosaved:") + "\n" + autosave_error,
+                color="red",
+            )
+
         if old_speed != g.curr_speed:
             self.find_speed_button()
 
@@ -761,6 +761,7 @@ def save_options():
     prefs.set("Preferences", "nosound", str(bool(mixer.nosound)))
     prefs.set("Preferences", "grab", str(bool(pygame.event.get_grab())))
     prefs.set("Preferences", "daynight", str(bool(g.daynight)))
+    prefs.set("Preferences", "sim_budget_ms", str(int(g.sim_budget_ms)))
     prefs.set("Preferences", "xres", str(int(gg.screen_size[0])))
     prefs.set("Preferences", "yres", str(int(gg.screen_size[1])))
     prefs.set("Preferences", "soundbuf", str(mixer.get_soundbuf()))
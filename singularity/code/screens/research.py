@@ -162,7 +162,7 @@ class ResearchScreen(dialog.ChoiceDescriptionDialog):
             canvas.help_button.args = (danger,)
 
         if key in g.pl.techs:
-            canvas.progress = g.pl.techs[key].percent_complete().min()
+            canvas.progress = g.pl.techs[key].percent_complete()
 
         def my_slide(new_pos):
             self.handle_slide(key, new_pos)
@@ -145,9 +145,9 @@ class SavegameScreen(dialog.ChoiceDialog):
             return
 
         current_save = self.listbox.current_item()
-        if (
-            current_save is not None
-            and current_save.savegame_format != sv.current_save_format
+        if current_save is not None and current_save.savegame_format not in (
+            sv.current_save_format,
+            sv.current_columnar_format,
         ):
             self.convert_button.enabled = True
         else:
@@ -253,6 +253,17 @@ class SavegameScreen(dialog.ChoiceDialog):
                 if dif_obj is not None:
                     dif_str = g.strip_hotkey(getattr(dif_obj, "name", ""))
 
+                summary = save.summary
+                if summary is not None:
+                    gtm_str += " | %s: %s | %s: %s" % (
+                        _("CASH"),
+                        g.to_money(summary["cash"]),
+                        _("BASES"),
+                        summary["bases"],
+                    )
+                    if summary["apotheosis"]:
+                        dif_str += " | " + _("APOTHEOSIS")
+
                 item.time_display.text = tm_str + " | " + gtm_str if tm_str else gtm_str
                 item.difficulty_display.text = dif_str
 
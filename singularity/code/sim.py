@@ -0,0 +1,246 @@
+# file: sim.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains the headless simulation engine, which advances a game
+# without the GUI (e.g. for balance runs).
+
+from __future__ import absolute_import
+
+import asyncio
+import random
+import time
+
+from singularity.code import g
+
+
+class HeadlessMapScreen(object):
+    """Stand-in for g.map_screen when there is no GUI.
+
+    The game model only needs a few hooks from the map screen.  Story
+    sections and messages are forwarded to plain (non-async) callbacks
+    instead of going through the dialogs."""
+
+    def __init__(self, on_story=None, on_message=None):
+        self.needs_rebuild = False
+        self.on_story = on_story
+        self.on_message = on_message
+
+    def find_speed_button(self):
+        pass
+
+    async def show_message(self, message, color=None):
+        if self.on_message is not None:
+            self.on_message(message, color)
+
+    async def show_story_section(self, name):
+        if self.on_story is not None:
+            self.on_story(name, list(g.get_story_section(name)))
+
+
+class SimulationResult(object):
+    def __init__(self, days, wall_time, lost):
+        self.days = days
+        self.wall_time = wall_time
+        self.lost = lost
+
+    @property
+    def days_per_second(self):
+        if self.wall_time <= 0:
+            return float("inf")
+        return self.days / self.wall_time
+
+    def __str__(self):
+        return "Simulated %.2f days in %.3fs (%.1f days/s)%s" % (
+            self.days,
+            self.wall_time,
+            self.days_per_second,
+            ", game lost (%d)" % self.lost if self.lost else "",
+        )
+
+
+class RealTimeDriver(object):
+    """Advance the game at g.curr_speed game seconds per wall second.
+
+    Called once per frame by the map screen.  It works off the game time
+    owed since the last frame in steps of at most `step` seconds, but stops
+    once budget_ms milliseconds of wall time are used up, so a frame never
+    takes much longer than that however fast the game runs.  If time is
+    still owed after that, the steps are made coarser for the next frame;
+    when a frame finishes well within the budget, they get finer again.
+    `rate` is the (smoothed) game seconds simulated per wall second.
+    """
+
+    # Wall time after which owed game time is dropped rather than caught up
+    # (e.g. while a dialog was open).
+    max_lag = 0.5
+
+    def __init__(self, budget_ms=None, min_step=1, max_step=g.seconds_per_day,
+                 clock=time.perf_counter):
+        self.budget_ms = budget_ms
+        self.min_step = min_step
+        self.max_step = max_step
+        self.step = min_step
+        self.clock = clock
+        self.rate = 0.0
+        self.owed = 0.0
+        self.last_frame = None
+
+    def reset(self):
+        """Forget the owed time (e.g. when the game is paused)."""
+        self.owed = 0.0
+        self.last_frame = None
+
+    async def advance(self, pl, speed):
+        """Run the steps for one frame.
+
+        Returns the number of game seconds and minutes that passed."""
+        now = self.clock()
+        if speed <= 0 or self.last_frame is None:
+            self.owed = 0.0
+            self.last_frame = now
+            if speed <= 0:
+                return 0, 0
+        elapsed = now - self.last_frame
+        self.last_frame = now
+        self.owed = min(self.owed + speed * elapsed, speed * self.max_lag + 1)
+
+        budget_ms = g.sim_budget_ms if self.budget_ms is None else self.budget_ms
+        deadline = now + budget_ms / 1000.0
+        secs_passed = mins_passed = 0
+        while self.owed >= 1:
+            before = pl.raw_sec
+            mins_passed += await pl.give_time(int(min(self.owed, self.step)))
+            secs_passed += pl.raw_sec - before
+            self.owed -= pl.raw_sec - before
+            # Let the screen catch up on anything the player should see.
+            if pl.curr_log or g.curr_speed != speed or pl.lost_game():
+                self.owed = 0.0
+                break
+            if self.clock() >= deadline:
+                break
+
+        if self.owed >= self.step:
+            self.step = min(self.step * 2, self.max_step)
+        elif (self.clock() - now) * 4000 < budget_ms:
+            self.step = max(self.step // 2, self.min_step)
+
+        if elapsed > 0:
+            self.rate += 0.1 * (secs_passed / elapsed - self.rate)
+        return secs_passed, mins_passed
+
+
+class Simulation(object):
+    """Advance a Player through game time without a GUI.
+
+    The game is driven by calling Player.give_time in steps of at most
+    `step` seconds.  With fast_forward, whole days are skipped with
+    Player.fast_forward while nothing is being built or researched.  The
+    optional callbacks receive story sections (name, list of segments) and
+    messages (text, color); by default they are silently dropped.
+    Autosaves are disabled unless requested.
+    """
+
+    def __init__(
+        self,
+        difficulty_id="normal",
+        seed=None,
+        step=g.seconds_per_hour,
+        on_story=None,
+        on_message=None,
+        autosave=False,
+        fast_forward=False,
+    ):
+        if step <= 0:
+            raise ValueError("Simulation step must be positive, got %s" % step)
+        self.difficulty_id = difficulty_id
+        self.seed = seed
+        self.step = step
+        self.autosave = autosave
+        self.fast_forward = fast_forward
+        self.screen = HeadlessMapScreen(on_story=on_story, on_message=on_message)
+
+    def install(self):
+        """Make the game model talk to this simulation instead of the GUI."""
+        g.no_gui()
+        g.map_screen = self.screen
+        g.autosave = self.autosave
+
+    def new_game(self):
+        self.install()
+        if self.seed is not None:
+            random.seed(self.seed)
+        g.new_game(self.difficulty_id, initial_speed=0)
+        # Nobody is going to click through the intro.
+        g.pl.intro_shown = True
+        return g.pl
+
+    async def advance(self, days):
+        """Advance the current game (g.pl) by a number of days.
+
+        Stops early if the game is lost."""
+        pl = g.pl
+        start_time = pl.raw_sec
+        end_time = start_time + int(days * g.seconds_per_day)
+        wall_start = time.perf_counter()
+        lost = pl.lost_game()
+
+        while pl.raw_sec < end_time and not lost:
+            before = pl.raw_sec
+            whole_days = (end_time - pl.raw_sec) // g.seconds_per_day
+            if self.fast_forward and whole_days and pl.is_quiescent():
+                await pl.fast_forward(whole_days)
+            if pl.raw_sec == before:
+                await pl.give_time(min(self.step, end_time - pl.raw_sec))
+            if pl.raw_sec == before:  # pragma: no cover
+                raise RuntimeError("Simulation stalled at %d" % before)
+            lost = pl.lost_game()
+
+        wall_time = time.perf_counter() - wall_start
+        days_done = (pl.raw_sec - start_time) / float(g.seconds_per_day)
+        return SimulationResult(days_done, wall_time, lost)
+
+    def run(self, days):
+        """Start a new game and simulate it for the given number of days."""
+        self.new_game()
+        return asyncio.run(self.advance(days))
+
+
+async def run_from_command_line(options):
+    from singularity.code import data, dirs
+
+    dirs.create_directories(g.force_single_dir)
+    data.reload_all()
+
+    def print_story(name, segments):
+        print("[Story] %s" % name)
+
+    def print_message(message, color):
+        print("[Message] %s" % message)
+
+    simulation = Simulation(
+        difficulty_id=options.sim_difficulty,
+        seed=options.sim_seed,
+        step=options.sim_step,
+        on_story=print_story if options.debug else None,
+        on_message=print_message if options.debug else None,
+        fast_forward=options.sim_fast_forward,
+    )
+    simulation.new_game()
+    result = await simulation.advance(options.simulate)
+    print(result)
+    return result
@@ -17,15 +17,24 @@
 # Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
 
 # This file contains the Statistic class, used for saving/loading single-game
-# statistics.
+# statistics, and the TimeSeries class for their day by day history.
+
+import base64
+
+import numpy
+from numpy import int64
 
 from singularity.code import g
 
+# Number of days kept by the TimeSeries; older samples are overwritten.
+HISTORY_DAYS = 1024
+
 
 class Statistics(object):
     def __init__(self):
         super(Statistics, self).__init__()
         self._stats = {}
+        self.history = TimeSeries()
 
     def __len__(self):
         len(self._stats)
@@ -45,9 +54,10 @@ class Statistics(object):
     def reset(self):
         for stat in self:
             self[stat.name].value = 0
+        self.history.reset()
 
     def serialize_obj(self):
-        return {stat.name: stat.value for stat in self}
+        return {stat.name: stat.value for stat in self if not stat.transient}
 
     def deserialize_obj(self, obj_data, game_version):
         for stat_name, stat_value in obj_data.items():
@@ -59,6 +69,8 @@ class Statistic(object):
     def __init__(self, name):
         self.name = name
         self.value = 0
+        # Transient statistics are not saved with the game.
+        self.transient = False
 
     def display_value(self):
         if hasattr(self, "_display") and callable(self._display):
@@ -67,31 +79,141 @@ class Statistic(object):
             return g.add_commas(self.value)
 
 
+class TimeSeries(object):
+    """A daily sample of some metrics, kept for the last `capacity` days.
+
+    The samples live in a preallocated numpy ring buffer (a row per day, a
+    column per metric), so the memory used is bounded and taking a sample
+    costs O(metrics).  A metric seen for the first time gets a new column,
+    which is 0 in the earlier samples.
+    """
+
+    def __init__(self, capacity=HISTORY_DAYS):
+        self.capacity = capacity
+        self.reset()
+
+    def reset(self):
+        self.names = []
+        self._columns = {}
+        self._data = numpy.zeros((self.capacity, 0), int64)
+        # Number of samples taken, including the overwritten ones.
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def _add_column(self, name):
+        self._columns[name] = len(self.names)
+        self.names.append(name)
+        self._data = numpy.hstack([self._data, numpy.zeros((self.capacity, 1), int64)])
+
+    def sample(self, values):
+        """Add a sample, given as {metric name: int value}."""
+        row = self._data[self.count % self.capacity]
+        row[:] = 0
+        for name, value in values.items():
+            column = self._columns.get(name)
+            if column is None:
+                self._add_column(name)
+                row = self._data[self.count % self.capacity]
+                column = self._columns[name]
+            row[column] = value
+        self.count += 1
+
+    def _rows(self):
+        # The samples in chronological order.
+        if self.count <= self.capacity:
+            return self._data[: self.count]
+        start = self.count % self.capacity
+        return numpy.concatenate([self._data[start:], self._data[:start]])
+
+    def column(self, name):
+        """The samples of a metric, oldest first."""
+        column = self._columns.get(name)
+        if column is None:
+            return numpy.zeros(len(self), int64)
+        return self._rows()[:, column].copy()
+
+    def deltas(self, name):
+        """The change of a metric between samples (e.g. a daily rate)."""
+        return numpy.diff(self.column(name))
+
+    def serialize_obj(self):
+        rows = numpy.ascontiguousarray(self._rows(), dtype="<i8")
+        return {
+            "names": list(self.names),
+            "data": base64.standard_b64encode(rows.tobytes()).decode("ascii"),
+        }
+
+    def deserialize_obj(self, obj_data, game_version):
+        self.reset()
+        names = obj_data.get("names", [])
+        for name in names:
+            self._add_column(name)
+        if names:
+            raw = base64.standard_b64decode(obj_data.get("data", ""))
+            rows = numpy.frombuffer(raw, dtype="<i8").reshape(-1, len(names))
+            rows = rows[-self.capacity :]
+            self._data[: len(rows)] = rows
+            self.count = len(rows)
+        return self
+
+
 itself = Statistics()
 
 
+class _ObservedProperty(property):
+    # A property made by observe, which knows its statistic and members.
+    pass
+
+
 def observe(name, data_member, display=None):
-    """Observe a class member and save change in a statistics."""
+    """Observe a class member and save change in a statistics.
 
-    itself[name]._display = display
+    Only increases are counted.  Hot paths can bypass the property: update
+    the data member directly, add the increases to the pending member (the
+    data member prefixed with "_pending") and flush_observed() later.
+    """
+
+    statistic = itself[name]
+    statistic._display = display
 
     def get(self):
         return getattr(self, data_member)
 
     def set(self, new_value):
-        if data_member in self.__dict__:
-            old_value = self.__dict__[data_member]
-        else:
-            old_value = 0
-
-        change = new_value - old_value
+        change = new_value - getattr(self, data_member, 0)
 
         if change > 0:
-            itself[name].value += change
+            statistic.value += change
 
         setattr(self, data_member, new_value)
 
-    return property(get, set)
+    observed = _ObservedProperty(get, set)
+    observed.statistic = statistic
+    observed.pending_member = "_pending" + data_member
+    return observed
+
+
+_observed_by_class = {}
+
+
+def flush_observed(obj):
+    """Add the pending increases of obj's observed members to the statistics."""
+    cls = type(obj)
+    observed = _observed_by_class.get(cls)
+    if observed is None:
+        observed = _observed_by_class[cls] = [
+            prop
+            for klass in cls.__mro__
+            for prop in vars(klass).values()
+            if isinstance(prop, _ObservedProperty)
+        ]
+    for prop in observed:
+        pending = getattr(obj, prop.pending_member, 0)
+        if pending:
+            prop.statistic.value += pending
+            setattr(obj, prop.pending_member, 0)
 
 
 def stat(name, display=None):
@@ -106,3 +228,12 @@ def stat(name, display=None):
         itself[name].value = new_value
 
     return property(get, set)
+
+
+def counter(name):
+    """Get a transient statistic (e.g. for cache hits), which is reset with
+    the other statistics but not saved with the game."""
+
+    counter_stat = itself[name]
+    counter_stat.transient = True
+    return counter_stat
@@ -0,0 +1,262 @@
+# file: synthetic.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains a generator of big game states, for benchmarking and
+# profiling.  It can also be run to write such a game as a savegame:
+#
+#     python -m singularity.code.synthetic --bases 10000 --seed 1
+
+from __future__ import absolute_import, print_function
+
+import argparse
+import asyncio
+import random
+
+from singularity.code import g, base, item, logmessage
+
+# Parts of the bases and items that are still under construction.
+UNFINISHED_FRACTION = 0.1
+
+
+async def generate_game(
+    bases=100,
+    seed=0,
+    difficulty_id="normal",
+    days=100,
+    tech_fraction=0.5,
+    event_fraction=0.5,
+):
+    """Start a new game (g.pl) and fill it with a big, made up state.
+
+    The state only depends on the arguments:
+     * the game is at the start of the given day,
+     * tech_fraction of the techs are researched (in an order the
+       prerequisites allow, never the one winning the game) and a few more
+       are partially researched,
+     * there are the given number of bases over the available locations,
+       with random items; some bases and items are still being built,
+     * event_fraction of the events were triggered,
+     * the log is full.
+
+    The game data must be loaded.  Returns the new player.  See generate
+    for calling this outside of an event loop.
+    """
+    from singularity.code import sim
+
+    rng = random.Random(seed)
+    # Seed the global generator as well, for the rolls in g.new_game.
+    random.seed(seed)
+    if g.map_screen is None:
+        g.map_screen = sim.HeadlessMapScreen()
+    g.new_game(difficulty_id, initial_speed=0)
+    pl = g.pl
+    pl.intro_shown = True
+    pl.raw_sec = days * g.seconds_per_day
+    pl.update_times()
+    pl.cash = rng.randint(10**6, 10**9)
+
+    _research_techs(pl, rng, tech_fraction)
+    _build_bases(pl, rng, bases)
+    await _trigger_events(pl, rng, event_fraction)
+    _fill_log(pl, rng)
+
+    g.invalidate_detect_chances()
+    pl.recalc_cpu()
+    return pl
+
+
+def generate(
+    bases=100,
+    seed=0,
+    difficulty_id="normal",
+    days=100,
+    tech_fraction=0.5,
+    event_fraction=0.5,
+):
+    """generate_game, run in a new event loop (so not from async code)."""
+    return asyncio.run(
+        generate_game(bases, seed, difficulty_id, days, tech_fraction, event_fraction)
+    )
+
+
+def _partially_paid(buyable, rng):
+    buyable.cost_paid = [int(c * rng.random()) for c in buyable.total_cost]
+
+
+def _research_techs(pl, rng, tech_fraction):
+    researchable = [
+        tech
+        for tech_id, tech in sorted(pl.techs.items())
+        if "endgame" not in tech.spec.effect.effect_stack
+    ]
+    goal = int(len(pl.techs) * tech_fraction)
+    while sum(1 for tech in pl.techs.values() if tech.done) < goal:
+        candidates = [t for t in researchable if not t.done and t.available()]
+        if not candidates:
+            break
+        rng.choice(candidates).finish(is_player=False)
+
+    candidates = [t for t in researchable if not t.done and t.available()]
+    for tech in rng.sample(candidates, min(len(candidates), 5)):
+        _partially_paid(tech, rng)
+
+
+def _build_bases(pl, rng, count):
+    locations = [loc for _, loc in sorted(pl.locations.items()) if loc.available()]
+    base_types = {
+        loc.id: [
+            spec
+            for _, spec in sorted(g.base_type.items())
+            if spec.available() and spec.buildable_in(loc)
+        ]
+        for loc in locations
+    }
+    locations = [loc for loc in locations if base_types[loc.id]]
+    item_specs = [spec for _, spec in sorted(g.items.items()) if spec.available()]
+
+    for index in range(len(pl.base_registry), count):
+        loc = rng.choice(locations)
+        spec = rng.choice(base_types[loc.id])
+        built = rng.random() >= UNFINISHED_FRACTION
+        new_base = base.Base("%s %d" % (spec.name, index), spec, built=built)
+        new_base.started_at = rng.randint(0, pl.raw_min)
+        loc.add_base(new_base)
+        if not built:
+            _partially_paid(new_base, rng)
+        if built and not spec.force_cpu:
+            _install_items(pl, rng, new_base, item_specs)
+        new_base.check_power()
+
+
+def _install_items(pl, rng, new_base, item_specs):
+    for item_type in item.all_types():
+        choices = [
+            spec
+            for spec in item_specs
+            if spec.item_type is item_type and spec.buildable_in(new_base.location)
+        ]
+        if not choices or rng.random() < 0.2:
+            continue
+        spec = rng.choice(choices)
+        count = 1
+        if item_type.id == "cpu":
+            count = rng.randint(1, max(1, new_base.space_left_for(spec)))
+        new_item = item.Item(spec, base=new_base, count=count)
+        new_base.items[item_type.id] = new_item
+        if rng.random() >= UNFINISHED_FRACTION:
+            new_item.finish(is_player=False)
+        else:
+            _partially_paid(new_item, rng)
+            pl.track_construction(new_item)
+    new_base.recalc_cpu()
+
+
+async def _trigger_events(pl, rng, event_fraction):
+    event_specs = [spec for _, spec in sorted(g.events.items())]
+    chosen = rng.sample(event_specs, int(len(event_specs) * event_fraction))
+    for event_spec in chosen:
+        await pl.trigger_event(event_spec, show_event_description=False)
+
+
+def _fill_log(pl, rng):
+    bases = list(g.all_bases())
+    tech_ids = sorted(pl.techs)
+    event_ids = sorted(g.events)
+    group_ids = sorted(pl.groups)
+
+    def random_message(raw_sec):
+        kind = rng.randrange(6)
+        if kind == 0:
+            return logmessage.LogEmittedEvent(raw_sec, rng.choice(event_ids))
+        if kind == 1:
+            return logmessage.LogResearchedTech(raw_sec, rng.choice(tech_ids))
+        b = rng.choice(bases)
+        base_args = (raw_sec, b.name, b.spec.id, b.location.id)
+        if kind == 2:
+            return logmessage.LogBaseConstructed(*base_args)
+        if kind == 3:
+            return logmessage.LogBaseLostMaintenance(*base_args)
+        if kind == 4:
+            return logmessage.LogBaseDiscovered(*(base_args + (rng.choice(group_ids),)))
+        spec = rng.choice(sorted(g.items.values(), key=lambda s: s.id))
+        return logmessage.LogItemConstructionComplete(
+            raw_sec, spec.id, rng.randint(1, 10), b.name, b.spec.id, b.location.id
+        )
+
+    missing = pl.log.maxlen - len(pl.log)
+    entries = list(pl.log) + [
+        random_message(rng.randint(0, pl.raw_sec)) for _ in range(missing)
+    ]
+    entries.sort(key=lambda entry: entry.raw_emit_time)
+    pl.log.clear()
+    pl.log.extend(entries)
+
+
+def write_savegame(path):
+    """Write the current game to a savegame at path (see create_savegame)."""
+    from singularity.code import savegame
+
+    with open(path, "wb") as savefile:
+        savegame.write_game_to_fd(savefile, gzipped=True)
+
+
+def main(argv=None):
+    from singularity.code import data, dirs, savegame
+
+    parser = argparse.ArgumentParser(
+        description="Write a big, made up game as a savegame."
+    )
+    parser.add_argument("--bases", type=int, default=1000,
+                        help="number of bases (default %(default)s)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="seed of the game (default %(default)s)")
+    parser.add_argument("--difficulty", default="normal",
+                        help="difficulty of the game (default %(default)s)")
+    parser.add_argument("--days", type=int, default=100,
+                        help="day of the game (default %(default)s)")
+    parser.add_argument("--techs", type=float, default=0.5,
+                        help="fraction of techs researched (default %(default)s)")
+    parser.add_argument("--events", type=float, default=0.5,
+                        help="fraction of events triggered (default %(default)s)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write to FILE instead of the saves directory")
+    options = parser.parse_args(argv)
+
+    g.no_gui()
+    dirs.create_directories(g.force_single_dir)
+    data.reload_all()
+
+    generate(
+        bases=options.bases,
+        seed=options.seed,
+        difficulty_id=options.difficulty,
+        days=options.days,
+        tech_fraction=options.techs,
+        event_fraction=options.events,
+    )
+    if options.output is None:
+        name = "synthetic_%d_%d" % (options.bases, options.seed)
+        savegame.create_savegame(name)
+        print("Saved as %s" % name)
+    else:
+        write_savegame(options.output)
+        print("Saved to %s" % options.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@
 
 from __future__ import absolute_import
 
-from singularity.code import buyable, effect, g
+from singularity.code import buyable, effect, g, prerequisite
 from singularity.code.stats import stat
 from singularity.code.spec import SpecDataField, spec_field_effect
 
@@ -52,6 +52,8 @@ class TechSpec(buyable.BuyableSpec):
 
 
 class Tech(buyable.Buyable):
+    __slots__ = ()
+
     def __init__(self, spec):
         super(Tech, self).__init__(spec)
 
@@ -83,6 +85,8 @@ class Tech(buyable.Buyable):
 
     def finish(self, is_player=True, loading_savegame=False):
         super(Tech, self).finish(is_player=is_player, loading_savegame=loading_savegame)
+        if g.pl is not None:
+            g.pl.researched_techs |= prerequisite.tech_bit(self.spec.id)
         self.spec.effect.trigger(loading_savegame=loading_savegame)
         if not loading_savegame:
             for handler in TECH_RESEARCH_EVENT:
@@ -0,0 +1,179 @@
+# file: techtree.py
+# Copyright (C) 2024 Endgame: Singularity developers
+# This file is part of Endgame: Singularity.
+
+# Endgame: Singularity is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+
+# Endgame: Singularity is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with Endgame: Singularity; if not, write to the Free Software
+# Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA  02111-1307  USA
+
+# This file contains the TechTree class, an index of the tech prerequisites
+# for planning research.
+
+from __future__ import absolute_import
+
+from singularity.code import g
+from singularity.code.buyable import Cost, cash, cpu
+
+# The TechTree of the loaded techs (set by data.load_techs)
+tree = None
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class TechTree(object):
+    """The tech prerequisites as a DAG, built when the techs are loaded.
+
+    Tech N is bit N of the masks (see prerequisite.index_techs)."""
+
+    def __init__(self, tech_specs):
+        self.ids = list(tech_specs)
+        self.specs = [tech_specs[tech_id] for tech_id in self.ids]
+        self.index = {tech_id: i for i, tech_id in enumerate(self.ids)}
+        # (AND mask, OR masks) per tech, all_mask is None if impossible
+        self.requires = [spec.compile_masks() for spec in self.specs]
+        self._plans = {}
+
+        self.order = self._topological_order()
+        self.ancestors = [0] * len(self.ids)
+        for i in self.order:
+            all_mask, any_masks = self.requires[i]
+            direct = all_mask or 0
+            for mask in any_masks:
+                direct |= mask
+            ancestors = direct
+            for j in _bits(direct):
+                ancestors |= self.ancestors[j]
+            self.ancestors[i] = ancestors
+
+        costs = [spec.cost for spec in self.specs]
+        self.static_cost = [(c[cash], c[cpu]) for c in costs]
+        self.cost_to_reach = []
+        for i in range(len(self.ids)):
+            plan = self._plan(i, 0)
+            if plan is None:
+                self.cost_to_reach.append(None)
+            else:
+                self.cost_to_reach.append(Cost(*self._static_total(plan)))
+
+    def _topological_order(self):
+        waiting = {}
+        for i, (all_mask, any_masks) in enumerate(self.requires):
+            depends = all_mask or 0
+            for mask in any_masks:
+                depends |= mask
+            waiting[i] = depends
+
+        order = []
+        done = 0
+        while waiting:
+            ready = [i for i, depends in waiting.items() if depends & ~done == 0]
+            if not ready:
+                raise ValueError(
+                    "Cyclic tech prerequisites: %s"
+                    % ", ".join(sorted(self.ids[i] for i in waiting))
+                )
+            for i in ready:
+                del waiting[i]
+                done |= 1 << i
+            order.extend(ready)
+        return order
+
+    def _static_total(self, techs):
+        total_cash = total_cpu = 0
+        for i in _bits(techs):
+            total_cash += self.static_cost[i][0]
+            total_cpu += self.static_cost[i][1]
+        return total_cash, total_cpu
+
+    def _plan_key(self, techs):
+        return (bin(techs).count("1"),) + self._static_total(techs)
+
+    def _search(self, needed, todo, researched):
+        have = researched | needed
+        while todo:
+            low = todo & -todo
+            todo ^= low
+            all_mask, any_masks = self.requires[low.bit_length() - 1]
+            if all_mask is None:
+                return None
+            new = all_mask & ~have
+            needed |= new
+            have |= new
+            todo |= new
+            for mask in any_masks:
+                if mask & have:
+                    continue
+                # Try each way of satisfying the clause (this tech is looked
+                # at again, in case it has more unsatisfied clauses).
+                best = best_key = None
+                for option in _bits(mask):
+                    bit = 1 << option
+                    plan = self._search(needed | bit, todo | low | bit, researched)
+                    if plan is not None:
+                        key = self._plan_key(plan)
+                        if best is None or key < best_key:
+                            best, best_key = plan, key
+                return best
+        return needed
+
+    def _plan(self, i, researched):
+        bit = 1 << i
+        if researched & bit:
+            return 0
+        # Only the ancestors matter for the plan.
+        researched &= self.ancestors[i]
+        key = (i, researched)
+        try:
+            return self._plans[key]
+        except KeyError:
+            pass
+        plan = self._search(bit, bit, researched)
+        self._plans[key] = plan
+        return plan
+
+    def plan_to(self, tech_id, pl=None):
+        """The techs left to research before (and including) tech_id.
+
+        Picks the fewest techs (and among those, the cheapest) that satisfy
+        the prerequisites given what pl (default: the current player) has
+        researched.  Returns the tech ids in a researchable order and the
+        Cost left of all of them, or None if tech_id can never be
+        researched.
+        """
+        if pl is None:
+            pl = g.pl
+        i = self.index[tech_id]
+        plan = self._plan(i, pl.researched_techs)
+        if plan is None:
+            return None
+        techs = [self.ids[j] for j in self.order if plan & (1 << j)]
+        cost_left = Cost()
+        for plan_tech_id in techs:
+            cost_left += pl.techs[plan_tech_id].cost_left
+        return techs, cost_left
+
+
+def build(tech_specs):
+    global tree
+    tree = TechTree(tech_specs)
+    return tree
+
+
+def plan_to(tech_id, pl=None):
+    """See TechTree.plan_to"""
+    return tree.plan_to(tech_id, pl)
@@ -102,7 +102,7 @@ def refresh_warnings():
         curr_warnings.append(warnings["cpu_pool_zero"])
 
     # Verify the cpu pool provides the maintenance CPU
-    cpu_maintenance = sum(base.maintenance[1] for base in g.all_bases() if base.done)
+    cpu_maintenance = g.pl.base_registry.total_maintenance()[cpu]
     if effective_cpu_pool < cpu_maintenance:
         curr_warnings.append(warnings["cpu_maintenance"])
 
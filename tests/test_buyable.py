@@ -0,0 +1,94 @@
+import random
+
+import numpy
+
+from singularity.code import buyable
+from singularity.code.buyable import Cost, cash, cpu, labor
+
+
+def _make_buyable(total_cost, cost_paid):
+    # Only the cost fields are needed for calculate_work
+    b = buyable.Buyable.__new__(buyable.Buyable)
+    b.total_cost = Cost(*total_cost)
+    b.cost_paid = Cost(*cost_paid)
+    return b
+
+
+def _random_buyables(rng, count):
+    buyables = []
+    for _ in range(count):
+        total_cost = [rng.choice([0, rng.randint(1, 5000)]) for _ in range(3)]
+        if not any(total_cost):
+            total_cost[cpu] = 1
+        cost_paid = [rng.randint(0, x) for x in total_cost]
+        buyables.append(_make_buyable(total_cost, cost_paid))
+    return buyables
+
+
+def test_cost_arithmetic():
+    cost = Cost(10, 20.7, numpy.int64(30))
+    assert tuple(cost) == (10, 20, 30)
+    assert all(type(x) is int for x in cost)
+    assert cost[cpu] == 20 and cost[labor] == 30
+
+    total = cost * 3
+    assert total == [30, 60, 90]
+    total[labor] //= 3
+    assert total == Cost(30, 60, 30)
+    assert total - cost == Cost(20, 40, 0)
+    assert total - numpy.array([1, 2, 3]) == (29, 58, 27)
+
+    copied = cost.copy()
+    copied += (1, 1, 1)
+    assert copied == (11, 21, 31)
+    assert cost == (10, 20, 30)
+
+
+def test_calculate_work_batch_drains_pools_in_order():
+    rng = random.Random(11)
+    for _ in range(200):
+        buyables = _random_buyables(rng, rng.randint(1, 12))
+        cash_pool = rng.choice([0, rng.randint(0, 20000)])
+        cpu_pool = rng.choice([0, -50, rng.randint(0, 20000)])
+        time = rng.randint(0, 2000)
+
+        expected_spent = []
+        expected_paid = []
+        cash_left, cpu_left = cash_pool, cpu_pool
+        for b in buyables:
+            spent, cost_paid = b.calculate_work(cash_left, cpu_left, time)
+            cash_left -= spent[cash]
+            cpu_left -= spent[cpu]
+            expected_spent.append(spent)
+            expected_paid.append(cost_paid)
+
+        spent, cost_paid = buyable.calculate_work_batch(
+            [tuple(b.total_cost) for b in buyables],
+            [tuple(b.cost_paid) for b in buyables],
+            cash_pool,
+            cpu_pool,
+            time,
+        )
+        assert (spent == numpy.array([tuple(s) for s in expected_spent])).all()
+        assert (cost_paid == numpy.array([tuple(p) for p in expected_paid])).all()
+
+
+def test_calculate_work_batch_with_separate_budgets():
+    rng = random.Random(12)
+    buyables = _random_buyables(rng, 20)
+    cash_budgets = [rng.randint(0, 5000) for _ in buyables]
+    cpu_pool = rng.randint(0, 20000)
+
+    spent, cost_paid = buyable.calculate_work_batch(
+        [tuple(b.total_cost) for b in buyables],
+        [tuple(b.cost_paid) for b in buyables],
+        cash_budgets,
+        cpu_pool,
+        60,
+    )
+    cpu_left = cpu_pool
+    for i, b in enumerate(buyables):
+        expected_spent, expected_paid = b.calculate_work(cash_budgets[i], cpu_left, 60)
+        cpu_left -= expected_spent[cpu]
+        assert tuple(spent[i]) == tuple(expected_spent)
+        assert tuple(cost_paid[i]) == tuple(expected_paid)
@@ -0,0 +1,115 @@
+import math
+import random
+
+from singularity.code import g, data, base, player, stats
+from singularity.code.dirs import create_directories
+
+
+class MockObject(object):
+    pass
+
+
+def setup_module():
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+
+def setup_function(func):
+    g.map_screen = MockObject()
+    g.map_screen.needs_rebuild = False
+
+
+def _make_bases():
+    g.new_game("impossible", initial_speed=0)
+    for name, base_type, location_id in [
+        ("Server", "Server Access", "N AMERICA"),
+        ("Datacenter", "Datacenter", "EUROPE"),
+        ("Covert", "Covert Base", "ASIA"),
+    ]:
+        g.pl.locations[location_id].add_base(
+            base.Base(name, g.base_type[base_type], built=True)
+        )
+    return sorted(g.all_bases(), key=lambda b: b.name)
+
+
+def test_single_roll_detection_matches_per_base_rolls():
+    bases = _make_bases()
+    # Long enough for the chances to be well above zero.
+    secs_passed = 20 * g.seconds_per_day
+    trials = 4000
+
+    expected = {}
+    for b in bases:
+        rate = sum(b.get_detect_chance().values()) / 10000.0
+        expected[b.name] = 1 - math.exp(-rate * secs_passed / g.seconds_per_day)
+        assert 0.05 < expected[b.name] < 0.95
+
+    random.seed(3)
+    per_base = dict.fromkeys(expected, 0)
+    single_roll = dict.fromkeys(expected, 0)
+    per_base_groups = dict.fromkeys(g.pl.groups, 0)
+    single_roll_groups = dict.fromkeys(g.pl.groups, 0)
+    for _ in range(trials):
+        for b in bases:
+            group = player._check_base_detection(b, secs_passed)
+            if group:
+                per_base[b.name] += 1
+                per_base_groups[group] += 1
+        for b, group in player._roll_base_detections(bases, secs_passed):
+            single_roll[b.name] += 1
+            single_roll_groups[group] += 1
+
+    for name, probability in expected.items():
+        mean = trials * probability
+        sigma = math.sqrt(trials * probability * (1 - probability))
+        assert abs(per_base[name] - mean) < 5 * sigma, (name, per_base, mean)
+        assert abs(single_roll[name] - mean) < 5 * sigma, (name, single_roll, mean)
+
+    # The groups are picked by rate rather than in order, which only agrees
+    # with the per-base rolls up to the second order; allow some slack.
+    total = sum(per_base_groups.values())
+    for group_id in g.pl.groups:
+        assert (
+            abs(per_base_groups[group_id] - single_roll_groups[group_id])
+            < 0.1 * total
+        ), (per_base_groups, single_roll_groups)
+
+
+def test_single_roll_detection_discovers_each_base_once():
+    bases = _make_bases()
+    random.seed(5)
+    detected = player._roll_base_detections(bases, 10000 * g.seconds_per_day)
+    assert sorted(b.name for b, _ in detected) == sorted(b.name for b in bases)
+    assert all(group in g.pl.groups for _, group in detected)
+    assert player._roll_base_detections([], g.seconds_per_day) == []
+
+
+def test_detect_chance_cache():
+    bases = _make_bases()
+    server = next(b for b in bases if b.name == "Server")
+    hits = base.detect_chance_cache_hits
+    misses = base.detect_chance_cache_misses
+
+    first = server.get_detect_chance()
+    hits_before, misses_before = hits.value, misses.value
+    assert server.get_detect_chance() == first
+    assert (hits.value, misses.value) == (hits_before + 1, misses_before)
+
+    # Callers may modify the result without affecting the cache
+    server.get_detect_chance()["news"] = -1
+    assert server.get_detect_chance() == first
+
+    # Suspicion, power and the last discovery all affect the chance.
+    g.pl.groups["news"].alter_suspicion(5000)
+    assert server.get_detect_chance()["news"] > first["news"]
+    server.switch_power()
+    assert server.power_state == "sleep"
+    assert server.get_detect_chance()["news"] < first["news"]
+    server.switch_power()
+    g.pl.last_discovery = server.location
+    assert server.get_detect_chance()["news"] > first["news"]
+    assert misses.value == misses_before + 3
+
+    # The counters are not saved with the game
+    assert "detect_chance_cache_hits" not in stats.itself.serialize_obj()
@@ -0,0 +1,81 @@
+import math
+import random
+
+from singularity.code import g, data, event
+from singularity.code.dirs import create_directories
+
+
+class FakeEventSpec(object):
+    def __init__(self, id, chance):
+        self.id = id
+        self.chance = chance
+
+
+def setup_module():
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+
+def setup_function(func):
+    func.real_events = g.events
+
+
+def teardown_function(func):
+    g.events = func.real_events
+
+
+def test_scheduler_matches_per_tick_rolls():
+    # Two events with 20% and 50% chance per day rolled in 6 hour ticks.
+    # The per-tick rolls trigger the first event in g.events order that
+    # succeeds, so the second one only fires when the first one does not.
+    g.events = {
+        "first": FakeEventSpec("first", 2000),
+        "second": FakeEventSpec("second", 5000),
+        "never": FakeEventSpec("never", 0),
+    }
+    tick = g.seconds_per_day // 4
+    p_first = 1 - math.exp(-0.2 * tick / g.seconds_per_day)
+    p_second = 1 - math.exp(-0.5 * tick / g.seconds_per_day)
+    expected = {
+        "first": p_first,
+        "second": (1 - p_first) * p_second,
+    }
+
+    random.seed(1)
+    scheduler = event.EventScheduler()
+    scheduler.start({}, 0)
+    ticks = 40000
+    fired = {"first": 0, "second": 0}
+    for i in range(1, ticks + 1):
+        event_id = scheduler.pop_due(i * tick)
+        if event_id is not None:
+            fired[event_id] += 1
+            # Expire immediately so the event can fire again.
+            scheduler.reschedule(event_id, i * tick)
+
+    for event_id, probability in expected.items():
+        mean = ticks * probability
+        sigma = math.sqrt(ticks * probability * (1 - probability))
+        assert abs(fired[event_id] - mean) < 5 * sigma, (event_id, fired, expected)
+
+
+def test_scheduler_skips_triggered_events():
+    g.events = {
+        "triggered": FakeEventSpec("triggered", 10000000),
+        "pending": FakeEventSpec("pending", 10000000),
+    }
+    triggered = event.Event(g.events["triggered"])
+    triggered.triggered = 1
+
+    scheduler = event.EventScheduler()
+    scheduler.start({"triggered": triggered}, 0)
+    assert scheduler.pop_due(g.seconds_per_day) == "pending"
+    # Nothing left until something expires
+    assert scheduler.next_time() is None
+    assert scheduler.pop_due(100 * g.seconds_per_day) is None
+
+    scheduler.reschedule("triggered", 100 * g.seconds_per_day)
+    assert scheduler.next_time() >= 100 * g.seconds_per_day
+    scheduler.unschedule("triggered")
+    assert scheduler.pop_due(200 * g.seconds_per_day) is None
@@ -1,7 +1,8 @@
 from singularity.code import g
-from singularity.code import logmessage, data, savegame
+from singularity.code import logmessage, data, savegame, base, item
 from singularity.code.dirs import create_directories
-from singularity.code.buyable import cpu, cash, labor
+from singularity.code.buyable import Cost, cpu, cash, labor
+import asyncio
 import io
 
 
@@ -13,6 +14,12 @@ def setup_module():
     g.no_gui()
     create_directories(True)
     data.reload_all()
+    # Do not write autosaves into the saves directory while testing.
+    g.autosave = False
+
+
+def teardown_module():
+    g.autosave = True
 
 
 def setup_function(func):
@@ -22,6 +29,10 @@ def setup_function(func):
     g.map_screen.needs_rebuild = False
 
 
+def give_time(pl, time_sec):
+    return asyncio.run(pl.give_time(time_sec))
+
+
 def save_and_load_game():
     fd = io.BytesIO(b"")
     real_close = fd.close
@@ -52,7 +63,7 @@ def test_initial_game():
     pl.intro_shown = True
 
     # Dummy check to hit special-case in give time
-    pl.give_time(0)
+    give_time(pl, 0)
     assert pl.raw_sec == 0
 
     # Try to guesstimate how much money we earn in 24 hours
@@ -80,7 +91,7 @@ def test_initial_game():
     assert pl.effective_cpu_pool() == 1
 
     # Fast forward 12 hours to see that we earn partial cash
-    pl.give_time(g.seconds_per_day // 2)
+    give_time(pl, g.seconds_per_day // 2)
     assert pl.raw_sec == g.seconds_per_day // 2
     assert pl.partial_cash == g.seconds_per_day // 2
     assert pl.cash == starting_cash + 2
@@ -88,7 +99,7 @@ def test_initial_game():
     assert len(pl.log) == 0
 
     # Fast forward another 12 hours to see that we earn cash
-    pl.give_time(g.seconds_per_day // 2)
+    give_time(pl, g.seconds_per_day // 2)
     assert pl.raw_sec == g.seconds_per_day
     assert pl.partial_cash == 0
     assert pl.cash == starting_cash + 5
@@ -124,7 +135,7 @@ def test_initial_game():
     # ... which implies that there are now no unallocated CPU
     assert pl.effective_cpu_pool() == 0
 
-    pl.give_time(g.seconds_per_day)
+    give_time(pl, g.seconds_per_day)
     # Nothing should have appeared in the logs
     assert len(pl.log) == 0
     # We should have spent some money at this point
@@ -189,7 +200,7 @@ def test_game_research_tech():
 
     # Ok, assumptions hold; research the tech
     pl.set_allocated_cpu_for(intrusion_tech.id, 1)
-    pl.give_time(int(intrusion_tech.cost_left[cpu]))
+    give_time(pl, int(intrusion_tech.cost_left[cpu]))
 
     assert intrusion_tech.cost_left[cpu] == 0
     assert intrusion_tech.done
@@ -209,3 +220,167 @@ def test_game_research_tech():
     assert intrusion_tech.cost_paid[cpu] == intrusion_tech_after_load.cost_paid[cpu]
     assert intrusion_tech.cost_paid[cash] == intrusion_tech_after_load.cost_paid[cash]
     assert intrusion_tech_after_load.done
+
+
+def test_base_registry_tracks_bases():
+    g.new_game("impossible", initial_speed=0)
+    pl = g.pl
+    pl.intro_shown = True
+    registry = pl.base_registry
+
+    def expected_state():
+        maintenance = [0, 0, 0]
+        available_cpus = [0, 0, 0, 0, 0]
+        sleeping_cpus = 0
+        for b in g.all_bases():
+            if not b.done:
+                continue
+            maintenance = [m + bm for m, bm in zip(maintenance, b.maintenance)]
+            if b.has_power():
+                for danger in range(b.location.safety + 1):
+                    available_cpus[danger] += b.cpu
+            elif b.power_state == "sleep":
+                sleeping_cpus += b.cpu
+        return maintenance, available_cpus, sleeping_cpus
+
+    def registry_state():
+        assert registry.check_cpu_totals()
+        return (
+            [int(x) for x in registry.total_maintenance()],
+            registry.available_cpus(),
+            registry.sleeping_cpus(),
+        )
+
+    assert len(registry) == 1
+    assert registry_state() == expected_state()
+
+    server = base.Base("Server", g.base_type["Server Access"], built=True)
+    pl.locations["N AMERICA"].add_base(server)
+    covert = base.Base("Covert", g.base_type["Covert Base"], built=True)
+    pl.locations["ANTARCTIC"].add_base(covert)
+    pending = base.Base("Pending", g.base_type["Datacenter"])
+    pl.locations["EUROPE"].add_base(pending)
+
+    assert len(registry) == 4
+    assert registry_state() == expected_state()
+    assert pl.available_cpus == expected_state()[1]
+
+    server.switch_power()
+    assert server.power_state == "sleep"
+    assert registry_state() == expected_state()
+    assert pl.sleeping_cpus == server.cpu
+
+    start_base = next(b for b in g.all_bases() if b.spec.id == "Stolen Computer Time")
+    start_base.destroy()
+    assert start_base not in registry
+    assert len(registry) == 3
+    assert registry_state() == expected_state()
+
+    pending.finish()
+    assert registry_state() == expected_state()
+
+    # Bases in unavailable locations (e.g. ANTARCTIC) are not saved.
+    covert.destroy()
+    assert len(registry) == 2
+    assert registry_state() == expected_state()
+
+    # A save + load rebuilds the registry from scratch
+    state_before_save = registry_state()
+    save_and_load_game()
+    assert g.pl.base_registry is not registry
+    assert len(g.pl.base_registry) == 2
+    registry = g.pl.base_registry
+    assert registry_state() == state_before_save
+
+
+def test_construction_worklist():
+    g.new_game("impossible", initial_speed=0)
+    pl = g.pl
+    pl.intro_shown = True
+    # The starting base is complete
+    assert pl.construction_work() == ([], [])
+
+    server = base.Base("Server", g.base_type["Server Access"])
+    pl.locations["N AMERICA"].add_base(server)
+    doomed = base.Base("Doomed", g.base_type["Server Access"])
+    pl.locations["EUROPE"].add_base(doomed)
+    # Items of incomplete bases are not built yet
+    assert pl.construction_work() == ([server, doomed], [])
+
+    doomed.destroy()
+    assert doomed not in pl.construction_worklist
+    assert pl.construction_work() == ([server], [])
+
+    server.finish()
+    assert server not in pl.construction_worklist
+    assert pl.construction_work() == ([], [])
+
+    cpus = item.Item(server.cpus.spec, base=server, count=1)
+    server.cpus += cpus
+    assert not server.cpus.done
+    assert pl.construction_work() == ([], [(server, server.cpus)])
+
+    # Replaced items are dropped from the worklist
+    replaced = server.cpus
+    server.cpus = item.Item(replaced.spec, base=server, count=1)
+    assert pl.construction_work() == ([], [(server, server.cpus)])
+    assert replaced not in pl.construction_worklist
+
+    pl.cash = 10**9
+    for _ in range(100):
+        give_time(pl, g.seconds_per_day)
+        if server.cpus.done:
+            break
+    assert server.cpus.done
+    assert pl.construction_work() == ([], [])
+
+
+def test_resource_flow_memo():
+    g.new_game("impossible", initial_speed=0)
+    pl = g.pl
+    pl.intro_shown = True
+
+    def fresh_flow(secs_forwarded=g.seconds_per_day):
+        pl._resource_flow_memo.clear()
+        return flow_values(*pl.compute_future_resource_flow(secs_forwarded))
+
+    def flow_values(cash_info, cpu_info):
+        return (dict(vars(cash_info)), dict(vars(cpu_info)))
+
+    expected = fresh_flow()
+    assert flow_values(*pl.compute_future_resource_flow()) == expected
+
+    # Interest follows the cash even when memoized
+    pl.interest_rate = 100
+    pl.cash = 100000
+    expected = fresh_flow()
+    assert expected[0]["interest"] == 1000
+    pl.cash = 200000
+    cash_info, _ = pl.compute_future_resource_flow()
+    assert cash_info.interest == 2000
+    assert cash_info.difference == expected[0]["difference"] + 1000
+    assert flow_values(*pl.compute_future_resource_flow()) == fresh_flow()
+
+    # CPU allocation, bases and considered buyables change the flow
+    pl.set_allocated_cpu_for("jobs", 1)
+    assert flow_values(*pl.compute_future_resource_flow()) == fresh_flow()
+    server = base.Base("Server", g.base_type["Server Access"])
+    pl.locations["N AMERICA"].add_base(server)
+    assert flow_values(*pl.compute_future_resource_flow()) == fresh_flow()
+    pl.considered_buyables = [base.Base("Maybe", g.base_type["Server Access"])]
+    assert flow_values(*pl.compute_future_resource_flow()) == fresh_flow()
+    give_time(pl, g.seconds_per_hour)
+    assert flow_values(
+        *pl.compute_future_resource_flow(g.seconds_per_hour)
+    ) == fresh_flow(g.seconds_per_hour)
+    assert flow_values(*pl.compute_future_resource_flow()) == fresh_flow()
+
+    # So does progress written directly (e.g. by the cheat menu)
+    tech = max(
+        (tech for tech in pl.techs.values() if tech.available() and not tech.done),
+        key=lambda tech: tech.cost_left[cash],
+    )
+    pl.set_allocated_cpu_for(tech.id, 1)
+    assert pl.compute_future_resource_flow()[0].tech > 0
+    tech.cost_left = Cost()
+    assert pl.compute_future_resource_flow()[0].tech == 0
@@ -1,4 +1,5 @@
 from collections import defaultdict
+import random
 import pytest
 
 from singularity.code import g, data, prerequisite
@@ -152,3 +153,50 @@ def test_acyclic_dependencies(techs):
         )
 
     assert not waiting_for
+
+
+def _reference_available(prereq, researched):
+    # The original list walking version of Prerequisite.available
+    or_mode = False
+    for index, tech_id in enumerate(prereq.prerequisites):
+        if tech_id == "impossible":
+            return False
+        if tech_id == "OR":
+            or_mode = True
+        if tech_id in researched:
+            if or_mode:
+                return True
+        elif not or_mode:
+            return False
+    return not or_mode
+
+
+def test_compiled_prerequisites_match_reference():
+    g.no_gui()
+    data.reload_all()
+    g.new_game("normal", initial_speed=0)
+
+    rng = random.Random(3)
+    specs = [
+        *g.techs.values(),
+        *g.locations.values(),
+        *g.base_type.values(),
+        *g.items.values(),
+        *g.tasks.values(),
+    ]
+    # Include unknown techs and a mixed OR clause.
+    specs.append(prerequisite.Prerequisite(["no such tech"]))
+    specs.append(prerequisite.Prerequisite(["OR", "no such tech", "Simulacra"]))
+
+    techs = list(g.pl.techs.values())
+    rng.shuffle(techs)
+    while True:
+        researched = {t.id for t in g.pl.techs.values() if t.done}
+        assert g.pl.researched_techs == prerequisite.tech_mask(researched)
+        for spec in specs:
+            assert spec.available() == _reference_available(spec, researched), spec
+        if not techs:
+            break
+        for tech in techs[:15]:
+            tech.finish(is_player=False, loading_savegame=True)
+        del techs[:15]
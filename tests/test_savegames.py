@@ -1,9 +1,20 @@
+import gzip
+import io
 import json
 import os
 import pytest
 
 from io import open
-from singularity.code import g, data, savegame
+from singularity.code import (
+    g,
+    data,
+    dirs,
+    savegame,
+    stats,
+    synthetic,
+    columnar,
+    jsonstream,
+)
 from singularity.code.dirs import create_directories
 
 
@@ -131,3 +142,247 @@ def test_savegames(savegame_dirs):
             continue
         savegame_reference_data = load_save_data_reference(full_filename + ".json")
         compare_loaded_game_with_reference_data(filename, savegame_reference_data)
+
+        # The game model is slotted; nothing of the pickle shim should leak.
+        model_objects = list(g.pl.log) + list(g.pl.locations.values())
+        model_objects += list(g.pl.groups.values()) + list(g.pl.events.values())
+        for b in g.all_bases():
+            model_objects.append(b)
+            model_objects.extend(b.all_items())
+        for obj in model_objects:
+            assert not hasattr(obj, "__dict__"), obj
+
+
+def test_streamed_save_matches_json_dump():
+    synthetic.generate(bases=300, seed=2)
+    expected = json.dumps(
+        {
+            "player": g.pl.serialize_obj(),
+            "stats": stats.itself.serialize_obj(),
+            "history": stats.itself.history.serialize_obj(),
+        }
+    )
+
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd)
+    header, body = fd.getvalue().split(b"\n\n", 1)
+    assert gzip.decompress(body).decode("utf-8") == expected
+
+
+def test_streamed_list_is_not_a_list():
+    class Obj(object):
+        def serialize_obj(self):
+            return {"id": 1}
+
+    data = {"objs": jsonstream.streamed_list([Obj(), Obj()])}
+    # Encoders other than jsonstream.dump must not write it as []
+    with pytest.raises(TypeError):
+        json.dumps(data)
+
+    fd = io.StringIO()
+    keys = {1: [()], None: {}, 2.5: "x"}
+    jsonstream.dump(dict(data, empty=[], keys=keys), fd)
+    assert fd.getvalue() == json.dumps(
+        {"objs": [{"id": 1}, {"id": 1}], "empty": [], "keys": keys}
+    )
+
+
+def test_autosave_snapshot_is_written_in_background(tmp_path):
+    synthetic.generate(bases=50, seed=3)
+    expected = json.dumps(
+        {
+            "player": g.pl.serialize_obj(),
+            "stats": stats.itself.serialize_obj(),
+            "history": stats.itself.history.serialize_obj(),
+        }
+    )
+    game_time = g.pl.raw_sec
+    snapshot = savegame.snapshot_game()
+    # The game goes on while the snapshot is written
+    g.pl.cash += 1000
+    g.pl.raw_sec += 60
+
+    path = str(tmp_path / "autosave.s2")
+    savegame.write_snapshot_in_background(path, snapshot).result()
+
+    with open(path, "rb") as fd:
+        header, body = fd.read().split(b"\n\n", 1)
+    assert gzip.decompress(body).decode("utf-8") == expected
+    assert b"game_time=%d" % game_time in header
+    assert savegame.autosave_status.pending == 0
+    assert savegame.autosave_status.last_saved_time == game_time
+    assert savegame.autosave_status.take_error() is None
+    assert os.listdir(str(tmp_path)) == ["autosave.s2"]
+
+
+def test_failed_autosave_is_reported(tmp_path):
+    g.new_game("normal", initial_speed=0)
+    path = str(tmp_path / "missing" / "autosave.s2")
+    future = savegame.write_snapshot_in_background(path, savegame.snapshot_game())
+    with pytest.raises(OSError):
+        future.result()
+
+    assert savegame.autosave_status.pending == 0
+    assert savegame.autosave_status.take_error()
+    assert savegame.autosave_status.take_error() is None
+
+
+def test_columnar_save_round_trips_like_json():
+    synthetic.generate(bases=300, seed=4)
+    snapshot = savegame.snapshot_game()
+    expected = json.loads(json.dumps(snapshot[1]))
+
+    json_fd = io.BytesIO()
+    savegame.write_snapshot_to_fd(json_fd, snapshot)
+    columnar_fd = io.BytesIO()
+    savegame.write_snapshot_to_fd(columnar_fd, snapshot, columnar_format=True)
+    header, body = columnar_fd.getvalue().split(b"\n\n", 1)
+    assert header.startswith(b"singularity_savefile_101_columnar\n")
+    assert columnar.loads(body) == expected
+
+    # Both formats load into the same game
+    loaded = []
+    for loader, fd in [
+        (savegame.load_savegame_by_json, json_fd),
+        (savegame.load_savegame_by_columnar, columnar_fd),
+    ]:
+        fd.seek(0)
+        savegame.load_savegame_fd(loader, io.BufferedReader(fd))
+        loaded.append(json.dumps(g.pl.serialize_obj(), sort_keys=True))
+    assert loaded[0] == loaded[1]
+
+
+def test_columnar_tables():
+    rows = [
+        {"id": "a", "cost": [1, 2, 3], "done": True, "items": []},
+        {"id": None, "cost": [-(2**40), 0, 7], "items": [{"n": 1.5}, {"n": 2.5}]},
+        {"id": "a", "cost": [4, 5, 6], "extra": {"x": [1]}, "items": [{"n": 0.0}]},
+    ]
+    game_data = {"player": {"rows": rows, "empty": [], "cash": 2**70}}
+    for gzipped in (False, True):
+        fd = io.BytesIO()
+        columnar.dump(game_data, fd, gzipped)
+        assert columnar.loads(fd.getvalue()) == game_data
+
+
+def test_savegame_index(tmp_path, monkeypatch):
+    saves_dir = str(tmp_path)
+    monkeypatch.setitem(dirs.read_dirs, "saves", [saves_dir])
+    monkeypatch.setitem(dirs.write_dirs, "saves", saves_dir)
+    g.new_game("normal", initial_speed=0)
+    savegame.create_savegame("first")
+    monkeypatch.setattr(savegame, "columnar_saves", True)
+    savegame.create_savegame("second")
+    with open(os.path.join(saves_dir, "broken.s2"), "wb") as fd:
+        fd.write(b"garbage")
+
+    def by_name(savegames):
+        return {save.name: save for save in savegames}
+
+    saves = by_name(savegame.get_savegames())
+    assert sorted(saves) == ["broken", "first", "second"]
+    assert saves["first"].savegame_format is savegame.current_save_format
+    assert saves["second"].savegame_format is savegame.current_columnar_format
+    assert saves["second"].headers["difficulty"] == "normal"
+    assert saves["broken"].savegame_format is None
+    assert os.path.isfile(os.path.join(saves_dir, savegame.SAVEGAME_INDEX_NAME))
+
+    # Only the new or changed files are parsed again
+    parsed = []
+    parse_savegame_file = savegame._parse_savegame_file
+
+    def counting_parse(filepath, parse_headers, versions):
+        parsed.append(os.path.basename(filepath))
+        return parse_savegame_file(filepath, parse_headers, versions)
+
+    monkeypatch.setattr(savegame, "_parse_savegame_file", counting_parse)
+    assert by_name(savegame.get_savegames()).keys() == saves.keys()
+    assert parsed == []
+
+    savegame.create_savegame("first")
+    saves = by_name(savegame.get_savegames())
+    assert parsed == ["first.s2b"]
+    assert saves["first"].savegame_format is savegame.current_columnar_format
+
+
+def test_overwrite_savegame_in_other_format(tmp_path, monkeypatch):
+    saves_dir = str(tmp_path)
+    monkeypatch.setitem(dirs.read_dirs, "saves", [saves_dir])
+    monkeypatch.setitem(dirs.write_dirs, "saves", saves_dir)
+    g.new_game("normal", initial_speed=0)
+    savegame.create_savegame("game")
+    savegame.auto_save().result()
+    monkeypatch.setattr(savegame, "columnar_saves", True)
+    savegame.create_savegame("game")
+    savegame.auto_save().result()
+
+    saves = savegame.get_savegames()
+    assert sorted(save.name for save in saves) == [savegame.AUTOSAVE_NAME, "game"]
+    assert all(save.filepath.endswith(".s2b") for save in saves)
+
+    monkeypatch.setattr(savegame, "columnar_saves", False)
+    savegame.create_savegame("game")
+    assert sorted(os.listdir(saves_dir)) == sorted(
+        [savegame.AUTOSAVE_NAME + ".s2b", "game.s2", savegame.SAVEGAME_INDEX_NAME]
+    )
+
+
+def test_savegame_exists(tmp_path, monkeypatch):
+    saves_dir = str(tmp_path)
+    monkeypatch.setitem(dirs.read_dirs, "saves", [saves_dir])
+    monkeypatch.setitem(dirs.write_dirs, "saves", saves_dir)
+    g.new_game("normal", initial_speed=0)
+    savegame.create_savegame("json")
+    monkeypatch.setattr(savegame, "columnar_saves", True)
+    savegame.create_savegame("columnar")
+
+    assert savegame.savegame_exists("json")
+    assert savegame.savegame_exists("columnar")
+    monkeypatch.setattr(savegame, "columnar_saves", False)
+    assert savegame.savegame_exists("columnar")
+    assert not savegame.savegame_exists("missing")
+
+
+def test_load_columnar_savegame_as_json():
+    g.new_game("normal", initial_speed=0)
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd, columnar_format=True)
+
+    fd.seek(0)
+    with pytest.raises(ValueError, match="columnar format"):
+        savegame.load_savegame_by_json(fd)
+
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd)
+    fd.seek(0)
+    with pytest.raises(ValueError, match="JSON format"):
+        savegame.load_savegame_by_columnar(fd)
+
+
+def test_savegame_summary(tmp_path):
+    synthetic.generate(bases=20, seed=5)
+    g.pl.apotheosis = True
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd)
+    header, body = fd.getvalue().split(b"\n\n", 1)
+
+    # Only the headers are needed
+    path = str(tmp_path / "summary.s2")
+    with open(path, "wb") as save_file:
+        save_file.write(header + b"\n\n" + body[:10])
+    summary = savegame.read_savegame_summary(path)
+    assert summary == {
+        "day": g.pl.time_day,
+        "cash": g.pl.cash,
+        "bases": len(list(g.all_bases())),
+        "difficulty": "normal",
+        "apotheosis": True,
+    }
+
+    # Savegames from older versions have no summary
+    old_header = b"\n".join(
+        line for line in header.split(b"\n") if not line.startswith(b"summary")
+    )
+    with open(path, "wb") as save_file:
+        save_file.write(old_header + b"\n\n" + body)
+    assert savegame.read_savegame_summary(path) is None
@@ -0,0 +1,160 @@
+import asyncio
+
+from singularity.code import g, data, profiler, sim, stats
+from singularity.code.dirs import create_directories
+
+
+def setup_module():
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+
+def teardown_module():
+    g.autosave = True
+
+
+def test_simulation_runs_headless():
+    stories = []
+    simulation = sim.Simulation(
+        difficulty_id="very-easy",
+        seed=42,
+        on_story=lambda name, segments: stories.append(name),
+    )
+    result = simulation.run(30)
+
+    assert g.map_screen is simulation.screen
+    assert not g.autosave
+    assert result.days == g.pl.raw_sec / g.seconds_per_day
+    # This seed survives the first month (the simulation is reproducible).
+    assert not result.lost
+    assert result.days == 30
+    # The grace period always ends by day 23.
+    assert "Grace Warning" in stories
+    assert result.days_per_second > 0
+
+
+def test_simulation_is_reproducible():
+    def run_once():
+        simulation = sim.Simulation(difficulty_id="normal", seed=7)
+        simulation.run(10)
+        return g.pl.raw_sec, g.pl.cash, sorted(b.name for b in g.all_bases())
+
+    assert run_once() == run_once()
+
+
+def _game_state():
+    pl = g.pl
+    return (
+        pl.raw_sec,
+        pl.cash,
+        pl.partial_cash,
+        pl.used_cpu,
+        sorted((gr.id, gr.suspicion) for gr in pl.groups.values()),
+        sorted(b.name for b in g.all_bases()),
+        [type(log).__name__ for log in pl.log],
+    )
+
+
+def test_fast_forward_matches_give_time():
+    def run_once(fast_forward):
+        simulation = sim.Simulation(difficulty_id="easy", seed=13)
+        pl = simulation.new_game()
+        pl.set_allocated_cpu_for("jobs", 1)
+        # Start mid-day so fast_forward has to catch up to midnight first.
+        asyncio.run(pl.give_time(g.seconds_per_hour * 5))
+        if fast_forward:
+            assert pl.is_quiescent()
+            asyncio.run(pl.fast_forward(60))
+        else:
+            asyncio.run(pl.give_time(g.seconds_per_day - g.seconds_per_hour * 5))
+            for _ in range(59):
+                if pl.lost_game():
+                    break
+                asyncio.run(pl.give_time(g.seconds_per_day))
+        return _game_state()
+
+    expected = run_once(False)
+    assert run_once(True) == expected
+    # Make sure the test covers the grace period ending
+    assert expected[0] > 23 * g.seconds_per_day
+
+
+def test_fast_forward_stops_when_busy():
+    simulation = sim.Simulation(difficulty_id="easy", seed=1)
+    pl = simulation.new_game()
+    pl.set_allocated_cpu_for("Stealth", 1)
+    assert not pl.is_quiescent()
+    assert asyncio.run(pl.fast_forward(10)) == 0
+
+
+class FakeClock(object):
+    def __init__(self, tick=0.0):
+        self.now = 100.0
+        self.tick = tick
+
+    def __call__(self):
+        self.now += self.tick
+        return self.now
+
+
+def test_real_time_driver_keeps_to_speed_and_budget():
+    simulation = sim.Simulation(difficulty_id="easy", seed=5)
+    pl = simulation.new_game()
+    g.curr_speed = 60
+
+    clock = FakeClock()
+    driver = sim.RealTimeDriver(budget_ms=10, min_step=1, clock=clock)
+    assert asyncio.run(driver.advance(pl, 60)) == (0, 0)
+    start = pl.raw_sec
+    for _ in range(30):
+        clock.now += 1.0 / 30
+        asyncio.run(driver.advance(pl, 60))
+    # One wall second at 60 game seconds per second
+    assert 59 <= pl.raw_sec - start <= 60
+    assert 50 < driver.rate <= 70
+
+    # Every give_time now takes 4ms of the 10ms budget, so 3 steps fit in a
+    # frame: the driver falls behind and takes bigger steps until it copes.
+    g.curr_speed = 100000
+    clock.tick = 0.004
+    for _ in range(40):
+        clock.now += 1.0 / 30
+        secs_passed, _ = asyncio.run(driver.advance(pl, g.curr_speed))
+        assert secs_passed <= 3 * driver.max_step
+    assert driver.step > 1000
+    assert driver.owed < driver.step
+
+    driver.reset()
+    assert asyncio.run(driver.advance(pl, 0)) == (0, 0)
+    g.curr_speed = 0
+
+
+def test_profiler_times_tick_phases():
+    assert profiler.active is None
+    simulation = sim.Simulation(difficulty_id="normal", seed=7)
+    simulation.new_game()
+    prof = profiler.enable()
+    try:
+        asyncio.run(simulation.advance(2))
+        g.pl.compute_future_resource_flow()
+        results = prof.results()
+    finally:
+        profiler.disable()
+
+    ticks = results["give_time"]["calls"]
+    assert ticks > 0
+    for phase in ("income", "maintenance", "research", "construction",
+                  "dead_bases", "events"):
+        assert results["give_time." + phase]["calls"] == ticks
+    assert results["give_time.new_day"]["calls"] == 2
+    assert results["compute_future_resource_flow"]["calls"] == 1
+    assert results["give_time"]["total_ns"] >= results["give_time.income"]["total_ns"]
+
+    # The totals are transient statistics
+    assert stats.itself["profile.give_time.calls"].value == ticks
+    assert "profile.give_time.calls" not in stats.itself.serialize_obj()
+
+    # Nothing is recorded once disabled
+    asyncio.run(simulation.advance(1))
+    assert prof.results()["give_time"]["calls"] == ticks
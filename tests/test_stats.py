@@ -0,0 +1,86 @@
+import io
+
+from singularity.code import g, data, savegame, sim, stats
+from singularity.code.dirs import create_directories
+
+
+def setup_module():
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+
+def teardown_module():
+    g.autosave = True
+
+
+def test_time_series_ring_buffer():
+    series = stats.TimeSeries(capacity=4)
+    for day in range(6):
+        values = {"day": day, "cash": day * 10}
+        if day >= 3:
+            values["bases"] = day
+        series.sample(values)
+
+    assert len(series) == 4
+    assert series.names == ["day", "cash", "bases"]
+    assert list(series.column("day")) == [2, 3, 4, 5]
+    assert list(series.column("cash")) == [20, 30, 40, 50]
+    assert list(series.column("bases")) == [0, 3, 4, 5]
+    assert list(series.deltas("cash")) == [10, 10, 10]
+    assert list(series.column("unknown")) == [0, 0, 0, 0]
+
+    loaded = stats.TimeSeries(capacity=3).deserialize_obj(series.serialize_obj(), 0)
+    assert loaded.names == series.names
+    assert list(loaded.column("day")) == [3, 4, 5]
+
+
+def test_history_is_sampled_daily_and_saved():
+    simulation = sim.Simulation(difficulty_id="normal", seed=5)
+    simulation.run(10)
+    history = stats.itself.history
+
+    days = min(g.pl.raw_day, 10)
+    assert len(history) == days
+    assert list(history.column("day")) == list(range(1, days + 1))
+    assert history.column("cash")[-1] == g.pl.cash
+    assert history.column("bases")[-1] == len(g.pl.base_registry)
+    for group_id in g.pl.groups:
+        assert "suspicion_" + group_id in history.names
+
+    expected = history.serialize_obj()
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd)
+    fd.seek(0)
+    savegame.load_savegame_fd(savegame.load_savegame_by_json, io.BufferedReader(fd))
+    assert stats.itself.history.serialize_obj() == expected
+
+    g.new_game("normal", initial_speed=0)
+    assert len(stats.itself.history) == 0
+
+
+def test_observed_statistics_are_batched_by_the_tick():
+    g.new_game("normal", initial_speed=0)
+    pl = g.pl
+    cash_earned = stats.itself["cash_earned"]
+    start = cash_earned.value
+
+    # Going through the property counts at once, and only increases.
+    pl.cash += 100
+    pl.cash -= 50
+    assert cash_earned.value == start + 100
+
+    # The tick only counts when flushed.
+    pl._earn(25)
+    assert pl._pay(10) == 0
+    assert cash_earned.value == start + 100
+    stats.flush_observed(pl)
+    assert cash_earned.value == start + 125
+    stats.flush_observed(pl)
+    assert cash_earned.value == start + 125
+
+    # Saving flushes as well.
+    pl._earn(5)
+    savegame.write_game_to_fd(io.BytesIO())
+    assert cash_earned.value == start + 130
+    assert pl.cash == pl.difficulty.starting_cash + 70
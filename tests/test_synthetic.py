@@ -0,0 +1,83 @@
+import asyncio
+import io
+import json
+
+from singularity.code import g, data, savegame, synthetic
+from singularity.code.dirs import create_directories
+
+
+class MockObject(object):
+    pass
+
+
+def setup_module():
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+
+def setup_function(func):
+    g.map_screen = MockObject()
+    g.map_screen.needs_rebuild = False
+
+
+def _serialized():
+    return json.dumps(g.pl.serialize_obj(), sort_keys=True)
+
+
+def test_generate_is_deterministic():
+    pl = synthetic.generate(bases=200, seed=3, days=50)
+
+    assert len(pl.base_registry) == 200
+    assert pl.raw_day == 50
+    assert len(pl.log) == pl.log.maxlen
+    times = [entry.raw_emit_time for entry in pl.log]
+    assert times == sorted(times)
+    techs_done = sum(1 for tech in pl.techs.values() if tech.done)
+    assert techs_done == len(pl.techs) // 2
+    assert not pl.techs["Apotheosis"].done
+    assert sum(1 for e in pl.events.values() if e.triggered) == len(g.events) // 2
+    assert any(not b.done for b in g.all_bases())
+    assert any(b.items["reactor"] is not None for b in g.all_bases())
+    assert pl.base_registry.check_cpu_totals()
+
+    first = _serialized()
+    synthetic.generate(bases=200, seed=3, days=50)
+    assert _serialized() == first
+    synthetic.generate(bases=200, seed=4, days=50)
+    assert _serialized() != first
+
+
+def test_generate_game_from_async_code():
+    synthetic.generate(bases=50, seed=6)
+    expected = _serialized()
+
+    async def from_event_loop():
+        return await synthetic.generate_game(bases=50, seed=6)
+
+    asyncio.run(from_event_loop())
+    assert _serialized() == expected
+
+
+def _summary():
+    pl = g.pl
+    return (
+        pl.raw_sec,
+        pl.cash,
+        sorted((b.location.id, b.name, b.spec.id, b.done) for b in g.all_bases()),
+        sorted(t for t in pl.techs if pl.techs[t].done),
+        sorted(e for e in pl.events if pl.events[e].triggered),
+        [entry.serialize_obj() for entry in pl.log],
+    )
+
+
+def test_generated_game_loads():
+    synthetic.generate(bases=50, seed=1)
+    expected = _summary()
+
+    fd = io.BytesIO()
+    savegame.write_game_to_fd(fd)
+    fd.seek(0)
+    savegame.load_savegame_fd(savegame.load_savegame_by_json, io.BufferedReader(fd))
+
+    assert _summary() == expected
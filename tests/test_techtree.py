@@ -0,0 +1,77 @@
+from singularity.code import g, data, prerequisite, techtree
+from singularity.code.buyable import Cost
+from singularity.code.dirs import create_directories
+
+
+class MockObject(object):
+    pass
+
+
+def setup_module():
+    g.no_gui()
+    create_directories(True)
+    data.reload_all()
+
+
+def test_plan_is_researchable_in_order():
+    g.new_game("normal", initial_speed=0)
+    researched = {t.id for t in g.pl.techs.values() if t.done}
+
+    for tech_id in g.techs:
+        plan = techtree.plan_to(tech_id)
+        assert plan is not None
+        techs, cost_left = plan
+        if tech_id in researched:
+            assert techs == [] and cost_left == Cost()
+            continue
+        assert techs[-1] == tech_id
+        assert not researched.intersection(techs)
+        expected_cost = Cost()
+        for plan_tech_id in techs:
+            expected_cost += g.pl.techs[plan_tech_id].cost_left
+        assert cost_left == expected_cost
+
+    # Research one plan and check each step was possible
+    techs, _ = techtree.plan_to("Apotheosis")
+    for tech_id in techs:
+        assert g.techs[tech_id].available(), tech_id
+        g.pl.techs[tech_id].finish(is_player=False, loading_savegame=True)
+    assert techtree.plan_to("Apotheosis") == ([], Cost())
+
+
+def test_plan_picks_smallest_or_branch():
+    class FakeTech(prerequisite.Prerequisite):
+        def __init__(self, prerequisites, tech_cash=1):
+            super(FakeTech, self).__init__(prerequisites)
+            self.cost = Cost(tech_cash, 0, 0)
+
+    specs = {
+        "A": FakeTech([]),
+        "B": FakeTech(["A"]),
+        "C": FakeTech([], tech_cash=5),
+        "D": FakeTech(["OR", "B", "C"]),
+        "E": FakeTech(["impossible"]),
+        "F": FakeTech(["OR", "E", "D"]),
+    }
+    try:
+        prerequisite.index_techs(specs)
+        tree = techtree.TechTree(specs)
+
+        pl = MockObject()
+        pl.researched_techs = 0
+        pl.techs = {tech_id: MockObject() for tech_id in specs}
+        for tech_id, spec in specs.items():
+            pl.techs[tech_id].cost_left = spec.cost
+
+        # C alone beats A and B
+        assert tree.plan_to("D", pl) == (["C", "D"], Cost(6, 0, 0))
+        assert tree.plan_to("F", pl) == (["C", "D", "F"], Cost(7, 0, 0))
+        assert tree.plan_to("E", pl) is None
+        assert tree.cost_to_reach[tree.index["B"]] == Cost(2, 0, 0)
+
+        # ... unless B is already researched
+        pl.researched_techs = prerequisite.tech_mask(["A", "B"])
+        assert tree.plan_to("F", pl) == (["D", "F"], Cost(2, 0, 0))
+        assert tree.ancestors[tree.index["F"]] == prerequisite.tech_mask("ABCDE")
+    finally:
+        prerequisite.index_techs(g.techs)